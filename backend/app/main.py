@@ -25,6 +25,7 @@ from .routers import naver_directions
 from .routers import course
 from .routers import meeting_must_visit_place
 from .routers import meeting_courses  # ✅ 코스 자동 생성 라우터 추가
+from .routers import travel_matrix
 
 
 app = FastAPI()
@@ -34,6 +35,47 @@ app = FastAPI()
 def on_startup():
     models.Base.metadata.create_all(bind=engine)
 
+    # DIJKSTRA_WORKERS > 0 이면 첫 요청 전에 워커를 띄워 그래프에 붙여 둔다
+    from .services.dijkstra_pool import get_dijkstra_pool
+
+    get_dijkstra_pool(meeting_point.get_csr_graph(meeting_point.G))
+
+    # 번화가 점수용 오프라인 POI 인덱스 (없으면 Google Nearby Search 로 계산)
+    from .services.poi_index import get_poi_index
+
+    get_poi_index()
+
+
+@app.on_event("startup")
+async def start_http_clients():
+    # 외부 API(Google/Naver/ORS) keep-alive 커넥션 풀을 서버 루프에서 미리 만든다
+    from .services.http_clients import HTTP_CLIENTS
+
+    await HTTP_CLIENTS.start()
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    from .services.http_clients import HTTP_CLIENTS
+
+    await HTTP_CLIENTS.aclose()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # Dijkstra 프로세스 풀(DIJKSTRA_WORKERS > 0 일 때만 생성됨) 정리
+    from .services.dijkstra_pool import shutdown_dijkstra_pool
+    from .services.compute_executor import compute_executor
+
+    from .services.speed_profile import flush_observations
+    from .services.travel_time_cache import TRAVEL_TIME_CACHE
+
+    shutdown_dijkstra_pool()
+    compute_executor.shutdown()
+    # 아직 파일에 안 쓴 교통 관측(시간대 속도 계수 보정용) 저장
+    flush_observations()
+    TRAVEL_TIME_CACHE.close()
+
 
 import os
 import re
@@ -183,6 +225,7 @@ app.include_router(naver_directions.router, prefix="")
 app.include_router(meeting_must_visit_place.router, prefix="")
 app.include_router(course.router, prefix="")          # 코스 단독용
 app.include_router(meeting_courses.router, prefix="")  # ✅ 약속별 코스 자동 생성
+app.include_router(travel_matrix.router, prefix="")    # 로컬 그래프 N×M 이동시간 행렬
 
 
 def get_db():
@@ -1,7 +1,7 @@
 # app/routers/calc_func.py
 # from ..services.place_hotspot import adjust_to_busy_station_area
 from fastapi import APIRouter, Query, HTTPException
-from typing import List, Tuple, Dict, Any, Literal, Optional
+from typing import List, Tuple, Dict, Any, Hashable, Literal, Optional
 import osmnx as ox
 import networkx as nx
 from .. import models
@@ -9,10 +9,13 @@ from datetime import datetime, date, time, timedelta
 from ..services.place_hotspot import adjust_to_busy_station_area
 from sqlalchemy.orm import Session, joinedload
 from ..database import get_db  # 이미 다른 곳에서 쓰고 있다면 생략
+import copy
 import math
 import asyncio
 import logging
 
+import numpy as np
+
 log = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["meeting"])
@@ -26,18 +29,321 @@ BACKEND_ROOT = (
     Path(__file__).resolve().parents[2]
 )  # app/routers/calc_func.py -> backend/
 GRAPH_PATH = BACKEND_ROOT / "seoul_graph_out" / "drive.graphml"
+# build_seoul_graph.py 가 GraphML 과 함께 만드는 바이너리 스냅샷 (.npy 묶음)
+GRAPH_SNAPSHOT_DIR = Path(
+    os.getenv("GRAPH_SNAPSHOT_DIR", str(BACKEND_ROOT / "seoul_graph_out" / "drive_csr"))
+)
+
+# === 최단거리 계산 백엔드 ===
+# - "csr"      : NumPy CSR 배열 + 힙 Dijkstra (기본값, 빠르고 메모리 적게 씀)
+# - "networkx" : 기존 nx.single_source_dijkstra_path_length
+# 서버 env 로 GRAPH_BACKEND=networkx 를 주면 기존 방식으로 되돌릴 수 있다.
+from ..services.road_graph import CSRGraph, load_snapshot, snapshot_exists
+from ..services.dijkstra_pool import get_dijkstra_pool
+from ..services.compute_executor import compute_executor, run_compute_sync
+from ..services.result_cache import TTLCache
+from ..services.travel_time_cache import TRAVEL_TIME_CACHE
+from ..services.places_cache import PLACES_CACHE
+from ..services.origin_cache import (
+    ORIGIN_CACHE_CUTOFF_SLACK,
+    ORIGIN_DISTANCE_CACHE,
+    SPT_DISK_STORE,
+    truncate as truncate_distances,
+)
+
+GRAPH_BACKENDS = {"csr", "networkx"}
+GRAPH_BACKEND = os.getenv("GRAPH_BACKEND", "csr").strip().lower()
+if GRAPH_BACKEND not in GRAPH_BACKENDS:
+    raise ValueError(
+        f"Unknown GRAPH_BACKEND={GRAPH_BACKEND!r} (choose one of {sorted(GRAPH_BACKENDS)})"
+    )
 
-if not GRAPH_PATH.exists():
-    raise FileNotFoundError(
-        f"Graph file not found: {GRAPH_PATH}\n"
-        f"Please ensure the graph file exists at: {GRAPH_PATH}"
+if GRAPH_BACKEND == "csr" and snapshot_exists(GRAPH_SNAPSHOT_DIR):
+    # 스냅샷이 있으면 GraphML 파싱 없이 mmap 으로 바로 연다.
+    # (워커 프로세스끼리 같은 페이지를 공유)
+    G = load_snapshot(GRAPH_SNAPSHOT_DIR, mmap=True)
+    log.info(
+        "[GRAPH] loaded snapshot %s (nodes=%d, edges=%d, version=%s)",
+        GRAPH_SNAPSHOT_DIR,
+        G.n_nodes,
+        G.n_edges,
+        G.graph_version,
     )
+else:
+    if not GRAPH_PATH.exists():
+        raise FileNotFoundError(
+            f"Graph file not found: {GRAPH_PATH}\n"
+            f"Please ensure the graph file exists at: {GRAPH_PATH}"
+        )
 
-G = ox.load_graphml(str(GRAPH_PATH))
+    G = ox.load_graphml(str(GRAPH_PATH))
+    G = G.to_undirected()  # 또는 nx.MultiGraph(G_directed)
 
-import networkx as nx
+# === 중간 지점 탐색 범위 제한 (find_road_center_node_multi_mode) ===
+# 참가자들이 가까이 모여 있으면 서울 전체를 탐색하지 않고 cutoff 안에서 끝낸다.
+CENTER_SEARCH_BOUNDED = os.getenv("CENTER_SEARCH_BOUNDED", "1").strip().lower() not in ("0", "false", "no")
+CENTER_SEARCH_MARGIN_M = float(os.getenv("CENTER_SEARCH_MARGIN_M", "3000"))
+CENTER_SEARCH_MAX_CUTOFF_M = float(os.getenv("CENTER_SEARCH_MAX_CUTOFF_M", "60000"))
+
+# 원본 networkx 그래프(id) → CSRGraph 캐시
+_CSR_GRAPHS: Dict[int, CSRGraph] = {}
+
+
+def get_csr_graph(G: Any) -> CSRGraph:
+    """
+    networkx 그래프를 CSRGraph 로 변환 (그래프 객체당 1회만 변환).
+    이미 CSRGraph(스냅샷)면 그대로 반환.
+    """
+    if isinstance(G, CSRGraph):
+        return G
+    csr = _CSR_GRAPHS.get(id(G))
+    if csr is None:
+        csr = CSRGraph.from_networkx(G, weights=("length", "travel_time"))
+        _CSR_GRAPHS[id(G)] = csr
+    return csr
+
+
+def _resolve_backend(backend: Optional[str]) -> str:
+    key = (backend or GRAPH_BACKEND).strip().lower()
+    if key not in GRAPH_BACKENDS:
+        raise ValueError(f"Unknown graph backend: {backend!r}")
+    return key
+
+
+def single_source_lengths(
+    G: Any,
+    source: int,
+    weight: str = "length",
+    backend: Optional[str] = None,
+) -> Dict[int, float]:
+    """
+    source 노드에서 도달 가능한 모든 노드까지의 최단거리 {node_id: cost}.
+    backend 에 따라 CSR 엔진 또는 networkx 를 사용한다 (결과는 동일).
+    """
+    if _resolve_backend(backend) == "csr" or isinstance(G, CSRGraph):
+        csr = get_csr_graph(G)
+        dist = csr.dijkstra(csr.index_of(source), weight=weight)
+        return csr.distances_to_dict(dist)
+    return nx.single_source_dijkstra_path_length(G, source, weight=weight)
+
+
+def single_source_array(
+    G: Any,
+    source: int,
+    weight: str = "length",
+    backend: Optional[str] = None,
+    cutoff: Optional[float] = None,
+) -> np.ndarray:
+    """
+    single_source_lengths 와 같은 값을 CSR 노드 인덱스 순서의 배열로 반환 (도달 불가 = inf).
+    여러 참가자의 결과를 노드 축으로 바로 쌓을 수 있다.
+    cutoff 가 있으면 그보다 먼 노드는 탐색하지 않는다 (inf).
+    """
+    csr = get_csr_graph(G)
+    if _resolve_backend(backend) == "csr" or isinstance(G, CSRGraph):
+        return csr.dijkstra(csr.index_of(source), weight=weight, cutoff=cutoff)
+
+    dist = np.full(csr.n_nodes, np.inf, dtype=np.float64)
+    lengths = nx.single_source_dijkstra_path_length(G, source, cutoff=cutoff, weight=weight)
+    dist[csr.indices_of(lengths.keys())] = list(lengths.values())
+    return dist
+
+
+def _run_source_searches(
+    G: Any,
+    sources: List[int],
+    weight: str,
+    backend: Optional[str],
+    cutoffs: List[Optional[float]],
+    parallel: Optional[bool],
+) -> List[np.ndarray]:
+    use_csr = _resolve_backend(backend) == "csr" or isinstance(G, CSRGraph)
+    if use_csr and len(sources) > 1 and parallel is not False:
+        csr = get_csr_graph(G)
+        pool = get_dijkstra_pool(csr)
+        if pool is not None:
+            return pool.dijkstra_many(csr.indices_of(sources), weight=weight, cutoffs=cutoffs)
+        if parallel:
+            log.warning("[DIJKSTRA] parallel=True 이지만 DIJKSTRA_WORKERS=0 이라 순차 실행합니다.")
+
+    return [
+        single_source_array(G, s, weight=weight, backend=backend, cutoff=c)
+        for s, c in zip(sources, cutoffs)
+    ]
+
+
+def _search_source_arrays(
+    G: Any,
+    sources: List[int],
+    weight: str,
+    backend: Optional[str],
+    cutoffs: List[Optional[float]],
+    parallel: Optional[bool],
+) -> List[np.ndarray]:
+    """
+    출발지별 거리 배열. 디스크 SPT 캐시(SPT_DISK_STORE)를 먼저 보고,
+    자주 요청되는 출발 노드는 전체 트리를 탐색해서 디스크에 저장해 둔다.
+    (디스크에서 읽은 값은 uint16 내림 양자화 값이라 length 기준 0~2 m 짧다)
+    """
+    use_csr = _resolve_backend(backend) == "csr" or isinstance(G, CSRGraph)
+    if not (use_csr and SPT_DISK_STORE.enabled):
+        return _run_source_searches(G, sources, weight, backend, cutoffs, parallel)
+
+    version = get_csr_graph(G).graph_version
+    results: List[Optional[np.ndarray]] = [None] * len(sources)
+    todo: List[int] = []
+    todo_cutoffs: List[Optional[float]] = []
+    to_store = set()
+
+    for i, (s, c) in enumerate(zip(sources, cutoffs)):
+        hit = SPT_DISK_STORE.get(version, s, weight, cutoff=c)
+        if hit is not None:
+            results[i] = hit
+            continue
+        todo.append(i)
+        if SPT_DISK_STORE.admit(version, s, weight):
+            # 인기 출발 노드: cutoff 없이 전체 트리를 계산해서 저장
+            to_store.add(i)
+            todo_cutoffs.append(None)
+        else:
+            todo_cutoffs.append(c)
+
+    if todo:
+        searched = _run_source_searches(
+            G, [sources[i] for i in todo], weight, backend, todo_cutoffs, parallel
+        )
+        for i, dist in zip(todo, searched):
+            if i in to_store:
+                SPT_DISK_STORE.put(version, sources[i], weight, dist)
+                dist = truncate_distances(dist, cutoffs[i])
+            results[i] = dist
+
+    return results  # type: ignore[return-value]
+
+
+def single_source_arrays(
+    G: Any,
+    sources: List[int],
+    weight: str = "length",
+    backend: Optional[str] = None,
+    cutoffs: Optional[List[Optional[float]]] = None,
+    parallel: Optional[bool] = None,
+    origin_keys: Optional[List[Hashable]] = None,
+) -> List[np.ndarray]:
+    """
+    여러 출발 노드에 대한 single_source_array 결과 목록 (sources 순서 그대로).
+    - parallel: True 면 dijkstra_pool 프로세스 풀로 출발지별 탐색을 나눠 돌린다.
+                None 이면 풀이 켜져 있고(DIJKSTRA_WORKERS > 0) 출발지가 2개 이상일 때 사용.
+    - origin_keys: 출발지별 캐시 키 앞부분 (예: (meeting_id, participant_id, mode)).
+                주어지면 ORIGIN_DISTANCE_CACHE 에 있는 출발지는 다시 탐색하지 않는다.
+    """
+    if cutoffs is None:
+        cutoffs = [None] * len(sources)
+
+    if origin_keys is None:
+        return _search_source_arrays(G, sources, weight, backend, cutoffs, parallel)
+
+    version = get_csr_graph(G).graph_version
+    keys = [
+        (*((ok,) if not isinstance(ok, tuple) else ok), int(s), weight, version)
+        for ok, s in zip(origin_keys, sources)
+    ]
+    results: List[Optional[np.ndarray]] = [
+        ORIGIN_DISTANCE_CACHE.get(key, cutoff=c) for key, c in zip(keys, cutoffs)
+    ]
 
-G = G.to_undirected()  # 또는 nx.MultiGraph(G_directed)
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        # 나중에 탐색 반경이 조금 커져도 재사용할 수 있게 여유 있게 탐색해서 저장
+        search_cutoffs = [
+            None if cutoffs[i] is None else cutoffs[i] * ORIGIN_CACHE_CUTOFF_SLACK
+            for i in missing
+        ]
+        searched = _search_source_arrays(
+            G, [sources[i] for i in missing], weight, backend, search_cutoffs, parallel
+        )
+        for i, c, dist in zip(missing, search_cutoffs, searched):
+            ORIGIN_DISTANCE_CACHE.set(keys[i], dist, c)
+            results[i] = truncate_distances(dist, cutoffs[i])
+
+    return results  # type: ignore[return-value]
+
+
+if GRAPH_BACKEND == "csr":
+    # 첫 요청이 변환 비용을 떠안지 않도록 서버 시작 시 미리 변환
+    get_csr_graph(G)
+
+# === 좌표 → 노드 스냅용 KD-tree (그래프 로드 시 1회 생성) ===
+# place_hotspot / course_builder 등에서는 node_snapper.get_snapper("drive") 로 재사용
+from ..services.node_snapper import NodeSnapper, register_snapper
+
+_SNAPPERS: Dict[int, NodeSnapper] = {id(G): register_snapper("drive", G)}
+
+# 두 지점 간 빠른 질의용 Contraction Hierarchy (build_seoul_graph.py 가 스냅샷 옆에 만든다)
+from ..services.contraction_hierarchy import get_hierarchy, load_hierarchy, register_hierarchy
+
+_DRIVE_CH = load_hierarchy(GRAPH_SNAPSHOT_DIR, "travel_time")
+if _DRIVE_CH is not None:
+    register_hierarchy("drive", _DRIVE_CH)
+
+# === 도보/자전거 그래프: drive 와 같은 스냅샷 경로(mmap)로 로드 ===
+# 코스 도보 구간 / 후보지 도보 시간을 외부 API 대신 로컬 그래프로 계산한다.
+# (자전거는 build_seoul_graph.py 의 CH_MODES 에 "bike" 를 넣고 LOCAL_GRAPH_MODES=walk,bike)
+from ..services.local_routing import load_local_graph, local_travel_time
+from ..services.transit_network import get_transit_network
+
+LOCAL_GRAPH_MODES = [
+    m.strip() for m in os.getenv("LOCAL_GRAPH_MODES", "walk").split(",") if m.strip()
+]
+for _mode in LOCAL_GRAPH_MODES:
+    load_local_graph(_mode, BACKEND_ROOT / "seoul_graph_out" / f"{_mode}_csr")
+
+# === drive 노드별 가까운 지하철역 테이블 (build_seoul_graph.py 가 스냅샷 옆에 만든다) ===
+# 대중교통 이탈 시간 / 역세권 보정 / 역 후보 생성이 Google 역 검색 대신 배열 조회를 쓴다.
+from ..services.station_access import (
+    load_station_access,
+    nearby_stations,
+    register_station_access,
+)
+
+_TRANSIT_NET = get_transit_network()
+if _TRANSIT_NET is not None:
+    _STATION_ACCESS = load_station_access(GRAPH_SNAPSHOT_DIR, _TRANSIT_NET)
+    if _STATION_ACCESS is not None:
+        register_station_access("drive", _STATION_ACCESS, _TRANSIT_NET)
+
+# === drive 노드별 번화가 점수 (build_seoul_graph.py 가 POI 인덱스로 스냅샷 옆에 만든다) ===
+# 있으면 중간 지점 후보를 공평성 점수와 번화가 점수로 한 번에 정렬하고,
+# 이미 번화한 역세권 후보는 adjust_to_busy_station_area 를 다시 돌리지 않는다.
+from ..services.busy_score import BusyScoreTable, get_busy_scores, load_busy_scores, register_busy_scores
+from ..services.place_hotspot import (
+    BUSY_AREA_MIN_POI_COUNT,
+    BUSY_AREA_MIN_SCORE,
+    BUSY_AREA_RADIUS_M,
+    PLACE_SCORE_LIVE,
+)
+from ..services.poi_index import POI_SAMPLE_SIZE, get_poi_index
+
+_POI_INDEX = get_poi_index()
+_BUSY_SCORES = load_busy_scores(
+    GRAPH_SNAPSHOT_DIR, _POI_INDEX.version if _POI_INDEX is not None else None
+)
+if _BUSY_SCORES is not None:
+    register_busy_scores("drive", _BUSY_SCORES)
+
+# 후보 점수(가중 이동시간, 초)에서 번화가 score 1점당 빼는 값. 0 이면 이동시간만으로 정렬.
+CENTER_BUSY_WEIGHT = float(os.getenv("CENTER_BUSY_WEIGHT", "30"))
+# 후보 보정(adjust_to_busy_station_area)에서 주변 역을 찾는 반경 (m)
+CENTER_STATION_SEARCH_RADIUS_M = 1500
+
+
+def get_node_snapper(G: Any) -> NodeSnapper:
+    """그래프 객체당 KD-tree 1개 (없으면 만들어서 캐시)."""
+    snapper = _SNAPPERS.get(id(G))
+    if snapper is None:
+        snapper = NodeSnapper.from_graph(G)
+        _SNAPPERS[id(G)] = snapper
+    return snapper
 
 MODE_SPEED_KMPH = {
     # 자동차: 시속 10km (도심 평균 서행 기준)
@@ -55,6 +361,59 @@ MODE_SPEED_KMPH = {
 }
 
 
+# === 중간 지점 결과 캐시 ===
+# 같은 모임에서 참가자 정보를 고치며 여러 번 다시 계산하는 경우가 많다.
+# 스냅된 노드가 그대로면 결과도 같으므로 (스냅 노드, 이동수단) 정렬 목록 + 옵션 + 그래프 버전으로 캐시한다.
+MEETING_POINT_CACHE = TTLCache(
+    maxsize=int(os.getenv("MEETING_POINT_CACHE_SIZE", "256")),
+    ttl_s=float(os.getenv("MEETING_POINT_CACHE_TTL_S", "600")),
+    name="meeting_point",
+)
+
+
+def center_cache_key(
+    kind: str,
+    G: Any,
+    sources: List[int],
+    modes: List[Optional[str]],
+    **options: Any,
+) -> Tuple[Any, ...]:
+    """참가자 순서와 무관한 캐시 키 (그래프가 바뀌면 graph_version 으로 자동 무효화)."""
+    pairs = tuple(sorted((int(s), m or "") for s, m in zip(sources, modes)))
+    return (kind, get_csr_graph(G).graph_version, pairs, tuple(sorted(options.items())))
+
+
+def restore_cached_center(
+    cached: Dict[str, Any],
+    sources: List[int],
+    modes: List[Optional[str]],
+) -> Dict[str, Any]:
+    """캐시된 결과를 복사하고 per_person 을 이번 요청의 참가자 순서로 다시 맞춘다."""
+    res = copy.deepcopy(cached)
+    if "per_person" in res:
+        by_pair = {
+            (p["source_node"], p.get("transportation")): p for p in res["per_person"]
+        }
+        res["per_person"] = [
+            {**by_pair[(int(s), m)], "index": idx}
+            for idx, (s, m) in enumerate(zip(sources, modes))
+        ]
+    return res
+
+
+@router.get("/meeting-point/cache-stats")
+def get_meeting_point_cache_stats():
+    """[API] 중간 지점 결과 / 이동시간 캐시 hit/miss 및 compute 실행기 상태"""
+    return {
+        "cache": MEETING_POINT_CACHE.stats(),
+        "origin_cache": ORIGIN_DISTANCE_CACHE.stats(),
+        "spt_disk_cache": SPT_DISK_STORE.stats(),
+        "travel_time_cache": TRAVEL_TIME_CACHE.stats(),
+        "places_cache": PLACES_CACHE.stats(),
+        "compute": compute_executor.stats(),
+    }
+
+
 def mode_to_speed_kph(mode: str) -> float:
     """
     교통수단 문자열을 속도(km/h)로 매핑.
@@ -74,6 +433,42 @@ def mode_to_speed_kph(mode: str) -> float:
     return MODE_SPEED_KMPH[key]
 
 
+# === 자동차 시간대 속도 계수 (data/speed_profile.json) ===
+# 있으면 자동차 참가자는 "최단거리 / 10km/h" 대신 모임 시간대의 도로 등급별 예상 속도로 탐색한다.
+from ..services.speed_profile import departure_slot, get_speed_profile
+
+# 시간대 weight 경로의 거리(m)를 CH 없이 추정할 때 직선거리 보정
+DRIVE_DETOUR_FACTOR = 1.3
+
+
+def driving_time_weight(
+    G: Any,
+    backend: Optional[str],
+    meeting_time: Optional[datetime],
+) -> Optional[str]:
+    """자동차 탐색에 쓸 시간대 weight 이름. 계수 표 / CSR 엔진 / travel_time 중 하나라도 없으면 None."""
+    profile = get_speed_profile()
+    if profile is None:
+        return None
+    if not (_resolve_backend(backend) == "csr" or isinstance(G, CSRGraph)):
+        return None
+    # GraphML 에서 변환한 그래프는 travel_time 이 비어 있을 수 있어 스냅샷(build_seoul_graph.py)만 쓴다
+    if "travel_time" not in get_csr_graph(G).meta.get("weights", ()):
+        return None
+    return profile.weight_name(*departure_slot(meeting_time))
+
+
+def driving_distance_m(csr: CSRGraph, source_idx: int, target_idx: int) -> float:
+    """자동차 경로 거리(m): CH 가 있으면 자유 흐름 최단시간 경로의 길이, 없으면 직선거리 보정."""
+    ch = get_hierarchy("drive")
+    if ch is not None and ch.aux_weight == "length" and ch.n_nodes == csr.n_nodes:
+        _, length = ch.query(source_idx, target_idx)
+        if math.isfinite(length):
+            return float(length)
+    straight = csr.haversine_from(float(csr.y[source_idx]), float(csr.x[source_idx]))[target_idx]
+    return float(straight) * DRIVE_DETOUR_FACTOR
+
+
 '''
 def snap_points_to_nodes(
     G: nx.MultiDiGraph,
@@ -124,17 +519,15 @@ def snap_points_to_nodes(
     coords: List[Tuple[float, float]],  # [(lon, lat), ...]
 ) -> List[int]:
     """
-    osmnx.distance.nearest_nodes 를 사용해서
     (lon, lat) → 가장 가까운 그래프 노드 id 로 변환.
+    - 예전에는 ox.distance.nearest_nodes 를 썼는데, 비투영 그래프라
+      호출할 때마다 BallTree 를 새로 만들었다.
+    - 지금은 그래프 로드 시 만든 KD-tree(node_snapper) 조회만 한다.
     """
     if not coords:
         return []
 
-    xs = [lon for lon, lat in coords]  # 경도 리스트
-    ys = [lat for lon, lat in coords]  # 위도 리스트
-
-    # OSMnx 1.9.x 기준
-    return ox.distance.nearest_nodes(G, X=xs, Y=ys)
+    return get_node_snapper(G).nearest_many(coords)
 
 
 """
@@ -214,13 +607,142 @@ from typing import List, Tuple, Dict, Any
 import networkx as nx
 
 
+def score_candidates_matrix(
+    times: np.ndarray,
+    reached: np.ndarray,
+    mode_weight: np.ndarray,
+    is_transit: np.ndarray,
+    has_transit_user: bool,
+    fairness_weight: float,
+    fallback_max: np.ndarray,
+    fallback_min: np.ndarray,
+) -> np.ndarray:
+    """
+    multi-mode 후보 점수 (낮을수록 좋음) 를 참가자 × 후보 행렬로 한 번에 계산.
+
+    - times      : (참가자, 후보) 이동 시간(초)
+    - reached    : (참가자, 후보) 도달 여부
+    - mode_weight: 참가자별 이동수단 가중치, is_transit: 참가자별 대중교통 여부
+    - 점수 규칙은 예전 calculate_score 와 동일하다:
+        * 대중교통 시간이 최댓값이면  max_transit * 2.0 + weighted_diff * F
+        * 대중교통이 있지만 최댓값이 아니면  weighted_max * 1.3 + weighted_diff * F
+        * 자동차만 있으면  weighted_max * 1.3 + max_driving * 0.5 + weighted_diff * F * 0.7
+        * 아무도 도달 못 한 후보는  max + (max - min) * F
+    """
+    ok = reached
+    ok_transit = ok & is_transit[:, None]
+    ok_driving = ok & ~is_transit[:, None]
+    weighted = times * mode_weight[:, None]
+
+    weighted_max = np.where(ok, weighted, -np.inf).max(axis=0)
+    weighted_diff = weighted_max - np.where(ok, weighted, np.inf).min(axis=0)
+    raw_max = np.where(ok, times, -np.inf).max(axis=0)
+    max_transit = np.where(ok_transit, times, -np.inf).max(axis=0)
+    max_driving = np.where(ok_driving, times, -np.inf).max(axis=0)
+
+    with np.errstate(invalid="ignore"):
+        transit_score = np.where(
+            max_transit == raw_max,
+            max_transit * 2.0 + (weighted_diff * fairness_weight),
+            weighted_max * 1.3 + (weighted_diff * fairness_weight),
+        )
+        driving_score = np.where(
+            ok_driving.any(axis=0),
+            weighted_max * 1.3 + max_driving * 0.5 + (weighted_diff * fairness_weight * 0.7),
+            weighted_max * 1.3 + (weighted_diff * fairness_weight * 0.7),
+        )
+        fallback = fallback_max + ((fallback_max - fallback_min) * fairness_weight)
+
+    use_transit = ok_transit.any(axis=0) if has_transit_user else np.zeros(times.shape[1], dtype=bool)
+    score = np.where(use_transit, transit_score, driving_score)
+    return np.where(ok.any(axis=0), score, fallback)
+
+
+def busy_scores_for(csr: CSRGraph) -> Optional[BusyScoreTable]:
+    """csr 노드 순서와 맞는 번화가 점수 테이블 (없거나 다른 그래프용이면 None)."""
+    table = get_busy_scores("drive")
+    if table is None or CENTER_BUSY_WEIGHT <= 0 or table.n_nodes != csr.n_nodes:
+        return None
+    if table.graph_version != csr.graph_version:
+        return None
+    return table
+
+
+def center_adjusted_point(
+    csr: CSRGraph,
+    v: int,
+    busy: Optional[BusyScoreTable],
+) -> Dict[str, Any]:
+    """
+    후보 노드 v 의 번화가/역세권 보정 좌표 (adjust_to_busy_station_area 결과).
+    테이블에 이미 번화한 역세권으로 나온 노드는 adjust 를 부르지 않고 같은 결과를 바로 만든다
+    (adjust 도 같은 POI 인덱스 / 반경으로 계산할 때만).
+    """
+    lat = float(csr.y[v])
+    lon = float(csr.x[v])
+    if (
+        busy is not None
+        and _POI_INDEX is not None
+        and not PLACE_SCORE_LIVE
+        and busy.radius_m == BUSY_AREA_RADIUS_M
+        and busy.meta.get("sample_size") == POI_SAMPLE_SIZE
+    ):
+        score, is_station, poi_count, cats = busy.area(v)
+        if is_station and score >= BUSY_AREA_MIN_SCORE and poi_count >= BUSY_AREA_MIN_POI_COUNT:
+            return {
+                "lat": lat,
+                "lng": lon,
+                "adjusted": False,
+                "reason": "original_point_is_already_busy",
+                "original": {
+                    "lat": lat,
+                    "lng": lon,
+                    "score": score,
+                    "is_station_area": is_station,
+                    "poi_count": poi_count,
+                    "category_counts": dict(cats),
+                },
+                "chosen_station": None,
+                "poi_name": None,
+            }
+
+    return adjust_to_busy_station_area(
+        lat=lat,
+        lng=lon,
+        base_radius=BUSY_AREA_RADIUS_M,
+        station_search_radius=CENTER_STATION_SEARCH_RADIUS_M,
+        min_score=BUSY_AREA_MIN_SCORE,
+        min_poi_count=BUSY_AREA_MIN_POI_COUNT,
+    )
+
+
 def find_road_center_node_multi_mode(
     G: nx.MultiGraph,
     coords_lonlat: List[Tuple[float, float]],
     modes: List[str],
     return_paths: bool = True,
     top_k: int = 3,
+    backend: Optional[str] = None,
+    bounded: Optional[bool] = None,
+    cutoff_m: Optional[float] = None,
+    parallel: Optional[bool] = None,
+    origin_keys: Optional[List[Hashable]] = None,
+    meeting_time: Optional[datetime] = None,
 ) -> Dict[str, Any]:
+    """
+    이동수단이 섞인 참가자들의 중간 지점 후보를 찾는다.
+    - bounded : 자동차 Dijkstra 를 cutoff 안으로 제한 (None 이면 CENTER_SEARCH_BOUNDED)
+                결과는 전체 탐색과 동일하다.
+    - cutoff_m: bounded 모드의 첫 탐색 반경(m). None 이면 참가자 위치 범위로 정한다.
+    - parallel: 참가자별 Dijkstra 를 프로세스 풀에서 병렬 실행 (single_source_arrays 참고)
+    - origin_keys: 참가자별 출발지 캐시 키 (예: (meeting_id, participant_id)).
+                   주어지면 참가자가 추가/삭제될 때 바뀐 출발지만 새로 탐색한다.
+    - meeting_time: 모임 시간. 시간대 속도 계수가 있으면 자동차 이동시간을
+                    이 시간대(출발 = 모임 시간 - SPEED_PROFILE_LEAD_MIN) 기준으로 계산한다.
+                    없으면 계수 표의 기본 시간대(평일 19시).
+    노드별 번화가 점수 테이블(busy_score)이 있으면 후보 점수에서
+    CENTER_BUSY_WEIGHT × busy score 를 빼서 공평성과 번화가를 함께 본다.
+    """
 
     if not coords_lonlat:
         raise ValueError("coords_lonlat is empty")
@@ -238,11 +760,29 @@ def find_road_center_node_multi_mode(
     sources = snap_points_to_nodes(G, coords_lonlat)
     k = len(sources)
 
+    # 지하철 데이터가 있으면 대중교통 시간은 로컬 RAPTOR 로 계산 (없으면 직선거리 추정)
+    transit_net = get_transit_network()
+    # 자동차 시간대 weight (None 이면 최단거리 / 고정 속도)
+    drive_weight = driving_time_weight(G, backend, meeting_time)
+    csr = get_csr_graph(G)
+    busy = busy_scores_for(csr)
+
+    # bounded / parallel / backend 는 결과에 영향을 주지 않으므로 키에 넣지 않는다
+    cache_key = center_cache_key(
+        "multi_mode", G, sources, modes, top_k=top_k, return_paths=return_paths,
+        transit=transit_net.version if transit_net is not None else "",
+        drive_weight=drive_weight or "",
+        busy=(busy.poi_version, CENTER_BUSY_WEIGHT) if busy is not None else "",
+    )
+    cached = MEETING_POINT_CACHE.get(cache_key)
+    if cached is not None:
+        return restore_cached_center(cached, sources, modes)
+
+    # 모든 참가자의 거리/시간을 CSR 노드 인덱스 축에 맞춘 배열로 다룬다.
+    # (dict 를 노드마다 채우던 방식보다 훨씬 빠르고, 대중교통/자동차 비용이 비슷해진다)
+    n_nodes = csr.n_nodes
+    source_idx = csr.indices_of(sources)
 
-    counts: Dict[int, int] = {}
-    node_stats: Dict[int, Dict[str, float]] = {}
-    dist_matrix: Dict[int, Dict[int, float]] = {}
-    
     # 도보는 직선거리 기반으로 계산 (도로 그래프 사용 안 함)
     import math
     
@@ -269,88 +809,7 @@ def find_road_center_node_multi_mode(
     
     # 대중교통 사용자 확인
     has_transit_user = len(transit_indices) > 0
-    
-    # 자동차: 그래프 기반 계산
-    for idx in driving_indices:
-        s = sources[idx]
-        mode = modes[idx]
-        speed_kph = mode_to_speed_kph(mode)
-        dists_m = nx.single_source_dijkstra_path_length(G, s, weight="length")
-        dist_matrix[idx] = dists_m
-
-        for v, dist_m in dists_m.items():
-            t_sec = (dist_m / 1000.0) / max(speed_kph, 0.1) * 3600.0
-
-            counts[v] = counts.get(v, 0) + 1
-
-            if v not in node_stats:
-                node_stats[v] = {"min": t_sec, "max": t_sec}
-            else:
-                if t_sec > node_stats[v]["max"]:
-                    node_stats[v]["max"] = t_sec
-                if t_sec < node_stats[v]["min"]:
-                    node_stats[v]["min"] = t_sec
-    
-    # 대중교통: 직선거리 기반 계산 (지하철 노선을 따라가므로 1.2배 보정, 환승 시간 포함)
-    TRANSIT_DETOUR_FACTOR = 1.2  # 대중교통은 직선거리보다 약 20% 더 걸림
-    TRANSIT_TRANSFER_TIME = 5 * 60  # 환승 대기 시간 5분 (초 단위)
-    for idx in transit_indices:
-        s = sources[idx]
-        mode = modes[idx]
-        speed_kph = mode_to_speed_kph(mode)
-        start_lat = G.nodes[s]["y"]
-        start_lon = G.nodes[s]["x"]
-        
-        # 모든 노드에 대해 직선거리 계산
-        transit_dists: Dict[int, float] = {}
-        for v in G.nodes():
-            v_lat = G.nodes[v]["y"]
-            v_lon = G.nodes[v]["x"]
-            # 직선거리 * 보정계수 = 실제 대중교통 거리
-            straight_dist = haversine_distance_m(start_lat, start_lon, v_lat, v_lon)
-            transit_dists[v] = straight_dist * TRANSIT_DETOUR_FACTOR
-        
-        dist_matrix[idx] = transit_dists
-        
-        for v, dist_m in transit_dists.items():
-            # 이동 시간 + 환승 시간
-            travel_time = (dist_m / 1000.0) / max(speed_kph, 0.1) * 3600.0
-            t_sec = travel_time + TRANSIT_TRANSFER_TIME
 
-            counts[v] = counts.get(v, 0) + 1
-
-            if v not in node_stats:
-                node_stats[v] = {"min": t_sec, "max": t_sec}
-            else:
-                if t_sec > node_stats[v]["max"]:
-                    node_stats[v]["max"] = t_sec
-                if t_sec < node_stats[v]["min"]:
-                    node_stats[v]["min"] = t_sec
-    
-    if not counts:
-        raise RuntimeError("No reachable nodes.")
-
-    max_reach = max(counts.values())
-    candidates = [v for v, c in counts.items() if c == k]
-    if not candidates:
-        candidates = [v for v, c in counts.items() if c == max_reach]
-    
-    # 대중교통 사용자가 있으면 후보군을 더 많이 확장 (더 넓은 범위 탐색)
-    if has_transit_user and len(candidates) < top_k * 2:
-        # 도달 가능한 노드 중 상위 더 많은 후보 추가
-        sorted_by_reach = sorted(
-            counts.items(), 
-            key=lambda x: (x[1], -node_stats.get(x[0], {}).get("max", float("inf"))),
-            reverse=True
-        )
-        # 상위 후보들을 추가 (이미 candidates에 있는 것은 제외)
-        additional = [
-            v for v, c in sorted_by_reach[:top_k * 3]
-            if v not in candidates and c >= max_reach - 1
-        ]
-        candidates.extend(additional[:top_k * 2])
-
-    # [DEBUG] 후보군 점수 계산 로그 (상위 3개만 출력)
     # 이동수단별 가중치: 대중교통 >> 자동차 순으로 우선순위 (자동차 불리하게)
     # 대중교통을 더 유리하게, 자동차에 더 강한 패널티 적용
     MODE_WEIGHTS = {
@@ -366,165 +825,225 @@ def find_road_center_node_multi_mode(
     }
     
     FAIRNESS_WEIGHT = 1.3  # 공평성 가중치 (대중교통 사용자 고려)
-    
-    def calculate_score(v_id):
-        stats = node_stats[v_id]
-        max_t = stats["max"]
-        min_t = stats["min"]
-        diff = max_t - min_t
-        
-        # 각 참가자별 시간을 가중치 적용하여 재계산
-        weighted_times = []
-        for idx, mode in enumerate(modes):
-            d_m = dist_matrix.get(idx, {}).get(v_id)
-            if d_m is not None:
-                speed_kph = mode_to_speed_kph(mode)
-                t_sec = (d_m / 1000.0) / max(speed_kph, 0.1) * 3600.0
-                # 대중교통은 환승 시간 추가
-                if speed_kph >= 20.0 and speed_kph < 50.0:
-                    t_sec += TRANSIT_TRANSFER_TIME
-                
-                weight = MODE_WEIGHTS.get(mode.lower(), 1.0)
-                weighted_times.append(t_sec * weight)
-        
-        if weighted_times:
-            # 원본 시간 (가중치 적용 전)도 추적
-            raw_times = []
-            for idx, mode in enumerate(modes):
-                d_m = dist_matrix.get(idx, {}).get(v_id)
-                if d_m is not None:
-                    speed_kph = mode_to_speed_kph(mode)
-                    t_sec = (d_m / 1000.0) / max(speed_kph, 0.1) * 3600.0
-                    if speed_kph >= 20.0 and speed_kph < 50.0:
-                        t_sec += TRANSIT_TRANSFER_TIME
-                    raw_times.append(t_sec)
-            
-            weighted_max = max(weighted_times)
-            weighted_min = min(weighted_times)
-            weighted_diff = weighted_max - weighted_min
-            raw_max = max(raw_times) if raw_times else weighted_max
-            
-            # 대중교통/자동차 사용자를 우선 고려한 점수 계산
-            # 대중교통 > 자동차 순으로 우선순위
-            transit_times = []
-            driving_times = []
-            
-            for idx, mode in enumerate(modes):
-                d_m = dist_matrix.get(idx, {}).get(v_id)
-                if d_m is not None:
-                    speed_kph = mode_to_speed_kph(mode)
-                    t_sec = (d_m / 1000.0) / max(speed_kph, 0.1) * 3600.0
-                    if speed_kph >= 20.0 and speed_kph < 50.0:
-                        t_sec += TRANSIT_TRANSFER_TIME
-                        transit_times.append(t_sec)
-                    else:
-                        driving_times.append(t_sec)
-            
-            # 대중교통 사용자가 있을 때
-            if has_transit_user and transit_times:
-                max_transit_time = max(transit_times)
-                # 대중교통 시간이 최댓값이면 강하게 반영
-                if max_transit_time == raw_max:
-                    score = max_transit_time * 2.0 + (weighted_diff * FAIRNESS_WEIGHT)
-                else:
-                    score = weighted_max * 1.3 + (weighted_diff * FAIRNESS_WEIGHT)
-            else:
-                # 자동차만 있거나 일반적인 경우 - 자동차에 강한 패널티
-                if driving_times:
-                    max_driving_time = max(driving_times)
-                    # 자동차 시간에 강한 패널티 적용
-                    score = weighted_max * 1.3 + max_driving_time * 0.5 + (weighted_diff * FAIRNESS_WEIGHT * 0.7)
-                else:
-                    score = weighted_max * 1.3 + (weighted_diff * FAIRNESS_WEIGHT * 0.7)
-        else:
-            # fallback: 기존 방식
-            score = max_t + (diff * FAIRNESS_WEIGHT)
-        
-        return score
-
-    # 대중교통 사용자가 있을 때 후보 품질 개선
-    if has_transit_user:
-        # 대중교통 시간이 너무 긴 후보는 제외 (90분 초과)
-        filtered_candidates = []
-        for v_id in candidates:
-            max_transit_time = 0.0
-            for idx in transit_indices:
-                d_m = dist_matrix.get(idx, {}).get(v_id)
-                if d_m is not None:
-                    speed_kph = mode_to_speed_kph(modes[idx])
-                    t_sec = (d_m / 1000.0) / max(speed_kph, 0.1) * 3600.0 + TRANSIT_TRANSFER_TIME
-                    if t_sec > max_transit_time:
-                        max_transit_time = t_sec
-            
-            # 대중교통 시간이 90분 이하인 후보만 포함
-            if max_transit_time <= 5400:  # 90분 = 5400초
-                filtered_candidates.append(v_id)
-        
-        if filtered_candidates:
-            candidates = filtered_candidates
-    
-    sorted_candidates = sorted(candidates, key=calculate_score)
-    
-    # 거리 기반 다양성 확보: 최소 거리(2km) 이상 떨어진 후보만 선택
-    MIN_DISTANCE_M = 2000  # 2km
-    top_nodes = []
-    
-    for candidate_node in sorted_candidates:
-        if len(top_nodes) >= top_k:
-            break
-        
-        candidate_lat = G.nodes[candidate_node]["y"]
-        candidate_lon = G.nodes[candidate_node]["x"]
-        
-        # 이미 선택된 후보들과의 거리 확인
-        is_far_enough = True
-        for selected_node in top_nodes:
-            selected_lat = G.nodes[selected_node]["y"]
-            selected_lon = G.nodes[selected_node]["x"]
-            
-            # Haversine 거리 계산
-            dist_m = haversine_distance_m(
-                candidate_lat, candidate_lon,
-                selected_lat, selected_lon
-            )
-            
-            if dist_m < MIN_DISTANCE_M:
-                is_far_enough = False
-                break
-        
-        if is_far_enough:
-            top_nodes.append(candidate_node)
-    
-    # 최소 거리 제약으로 후보가 부족하면 점수 순으로 추가 (거리 제약 완화)
-    if len(top_nodes) < top_k:
-        MIN_DISTANCE_M_RELAXED = 1000  # 1km로 완화
-        
-        for candidate_node in sorted_candidates:
-            if len(top_nodes) >= top_k:
+
+    mode_weight = np.array([MODE_WEIGHTS.get(m.lower(), 1.0) for m in modes], dtype=np.float64)
+    is_transit = np.zeros(k, dtype=bool)
+    is_transit[transit_indices] = True
+
+    # dist_mat[idx] : 참가자 idx 의 노드별 거리(m), time_s[idx] : 노드별 이동 시간(초)
+    # 도달 불가(또는 계산하지 않는 모드)는 inf
+    dist_mat = np.full((k, n_nodes), np.inf, dtype=np.float64)
+    time_s = np.full((k, n_nodes), np.inf, dtype=np.float64)
+
+    # 대중교통: 직선거리 기반 계산 (지하철 노선을 따라가므로 1.2배 보정, 환승 시간 포함)
+    # 지하철 데이터가 있으면 시간은 역 간 RAPTOR + 도보 접근/이탈로 계산한다.
+    TRANSIT_DETOUR_FACTOR = 1.2  # 대중교통은 직선거리보다 약 20% 더 걸림
+    TRANSIT_TRANSFER_TIME = 5 * 60  # 환승 대기 시간 5분 (초 단위)
+    for idx in transit_indices:
+        speed_kph = mode_to_speed_kph(modes[idx])
+        s_i = source_idx[idx]
+        # 모든 노드에 대해 직선거리 * 보정계수 = 실제 대중교통 거리
+        straight = csr.haversine_from(float(csr.y[s_i]), float(csr.x[s_i]))
+        dist_mat[idx] = straight * TRANSIT_DETOUR_FACTOR
+        if transit_net is not None:
+            time_s[idx] = transit_net.times_to_nodes(csr, float(csr.y[s_i]), float(csr.x[s_i]))
+            continue
+        # 이동 시간 + 환승 시간
+        time_s[idx] = (
+            (dist_mat[idx] / 1000.0) / max(speed_kph, 0.1) * 3600.0 + TRANSIT_TRANSFER_TIME
+        )
+
+    def pick_far_apart(ordered: List[int], chosen: List[int], min_distance_m: float) -> List[int]:
+        """점수 순 후보에서 이미 고른 후보들과 min_distance_m 이상 떨어진 것만 top_k 까지 추가."""
+        for candidate_node in ordered:
+            if len(chosen) >= top_k:
                 break
-            
-            if candidate_node in top_nodes:
+            if candidate_node in chosen:
                 continue
-            
-            candidate_lat = G.nodes[candidate_node]["y"]
-            candidate_lon = G.nodes[candidate_node]["x"]
-            
+
+            candidate_lat = float(csr.y[candidate_node])
+            candidate_lon = float(csr.x[candidate_node])
+
+            # 이미 선택된 후보들과의 거리 확인
             is_far_enough = True
-            for selected_node in top_nodes:
-                selected_lat = G.nodes[selected_node]["y"]
-                selected_lon = G.nodes[selected_node]["x"]
-                
+            for selected_node in chosen:
                 dist_m = haversine_distance_m(
                     candidate_lat, candidate_lon,
-                    selected_lat, selected_lon
+                    float(csr.y[selected_node]), float(csr.x[selected_node]),
                 )
-                
-                if dist_m < MIN_DISTANCE_M_RELAXED:
+                if dist_m < min_distance_m:
                     is_far_enough = False
                     break
-            
+
             if is_far_enough:
-                top_nodes.append(candidate_node)
+                chosen.append(candidate_node)
+        return chosen
+
+    # 거리 기반 다양성 확보: 최소 거리(2km) 이상 떨어진 후보만 선택
+    MIN_DISTANCE_M = 2000  # 2km
+
+    # === 자동차 Dijkstra 탐색 범위 ===
+    # bounded 모드에서는 자동차 참가자의 탐색을 시간 cutoff 안으로 제한한다.
+    # cutoff 밖 노드는 어떤 자동차 참가자의 시간이 cutoff 보다 크므로 점수가
+    #   score >= min(2.0, 1.3 * 자동차 가중치 최소값) * cutoff  (= score_floor)
+    # 이상이다. 제한된 결과로 뽑은 top_k (2km 간격) 후보의 점수가 모두 score_floor
+    # 미만이면 전체 탐색과 결과가 같다는 것이 보장되고, 아니면 cutoff 를 2배로
+    # 늘려 다시 계산한다 (CENTER_SEARCH_MAX_CUTOFF_M 을 넘으면 전체 탐색).
+    use_bounded = CENTER_SEARCH_BOUNDED if bounded is None else bounded
+    cutoff_time_s: Optional[float] = None
+    score_floor = 0.0
+    if use_bounded and driving_indices:
+        driver_speeds = [max(mode_to_speed_kph(modes[i]), 0.1) for i in driving_indices]
+        floor_factor = min(2.0, 1.3 * float(mode_weight[driving_indices].min()))
+        if floor_factor > 0:
+            if cutoff_m is None:
+                # 참가자 스냅 노드의 bounding box 대각선 기준으로 여유를 둔 반경
+                lats = [float(csr.y[i]) for i in source_idx]
+                lons = [float(csr.x[i]) for i in source_idx]
+                diag_m = haversine_distance_m(min(lats), min(lons), max(lats), max(lons))
+                cutoff_m = 1.5 * diag_m + CENTER_SEARCH_MARGIN_M
+            # 가장 느린 자동차 참가자도 cutoff_m 까지는 탐색하도록 시간으로 환산
+            cutoff_time_s = (float(cutoff_m) / 1000.0) / min(driver_speeds) * 3600.0
+            score_floor = floor_factor * cutoff_time_s * (1.0 - 1e-9)
+    # 번화가 보너스만큼 cutoff 밖 노드 점수도 낮아질 수 있으므로 보장 기준에서 뺀다
+    busy_bonus_max = CENTER_BUSY_WEIGHT * float(np.max(busy.score)) if busy is not None else 0.0
+
+    while True:
+        # 자동차: 그래프 기반 계산 (출발지별 탐색은 서로 독립 → parallel 이면 프로세스 풀)
+        # 시간대 weight 면 탐색 결과가 곧 초 단위 이동시간 (cutoff 도 초)
+        driver_speeds_kph = [max(mode_to_speed_kph(modes[i]), 0.1) for i in driving_indices]
+        if drive_weight is not None:
+            limits = [cutoff_time_s] * len(driving_indices)
+        else:
+            limits = [
+                None if cutoff_time_s is None else cutoff_time_s / 3600.0 * v * 1000.0
+                for v in driver_speeds_kph
+            ]
+        driver_dists = single_source_arrays(
+            G,
+            [sources[i] for i in driving_indices],
+            weight=drive_weight or "length",
+            backend=backend,
+            cutoffs=limits,
+            parallel=parallel,
+            origin_keys=(
+                None if origin_keys is None
+                else [(origin_keys[i], modes[i]) for i in driving_indices]
+            ),
+        )
+        for idx, speed_kph, dists in zip(driving_indices, driver_speeds_kph, driver_dists):
+            if drive_weight is not None:
+                # 거리는 결과 구성 때 최종 후보에 대해서만 구한다 (driving_distance_m)
+                time_s[idx] = dists
+                continue
+            dist_mat[idx] = dists
+            time_s[idx] = (dist_mat[idx] / 1000.0) / speed_kph * 3600.0
+
+        reached = np.isfinite(time_s)
+        counts = reached.sum(axis=0)
+        if not counts.any():
+            raise RuntimeError("No reachable nodes.")
+
+        # 노드별 도달한 참가자들의 최대/최소 시간 (아무도 도달 못 하면 -inf/inf)
+        stat_max = np.where(reached, time_s, -np.inf).max(axis=0)
+        stat_min = np.where(reached, time_s, np.inf).min(axis=0)
+
+        max_reach = int(counts.max())
+        cand_idx = np.flatnonzero(counts == k)
+        all_reached = cand_idx.size > 0
+        if not all_reached:
+            cand_idx = np.flatnonzero(counts == max_reach)
+        candidates = cand_idx.tolist()
+
+        # 대중교통 사용자가 있으면 후보군을 더 많이 확장 (더 넓은 범위 탐색)
+        extended = has_transit_user and len(candidates) < top_k * 2
+        if extended:
+            # 도달 가능한 노드 중 (도달 인원 많은 순, 최대 시간 짧은 순) 상위 후보 추가
+            reach_idx = np.flatnonzero(counts > 0)
+            order = np.lexsort((stat_max[reach_idx], -counts[reach_idx]))
+            top_reach = reach_idx[order[: top_k * 3]]
+            in_cand = set(candidates)
+            additional = [
+                int(v) for v in top_reach
+                if int(v) not in in_cand and counts[v] >= max_reach - 1
+            ]
+            candidates.extend(additional[:top_k * 2])
+
+        # 대중교통 사용자가 있을 때 후보 품질 개선
+        transit_filtered = False
+        if has_transit_user:
+            # 대중교통 시간이 너무 긴 후보는 제외 (90분 초과)
+            cand_arr = np.asarray(candidates, dtype=np.int64)
+            transit_t = np.where(reached[transit_indices][:, cand_arr], time_s[transit_indices][:, cand_arr], 0.0)
+            max_transit_time = transit_t.max(axis=0, initial=0.0)
+            # 대중교통 시간이 90분 이하인 후보만 포함
+            filtered_candidates = cand_arr[max_transit_time <= 5400].tolist()  # 90분 = 5400초
+            
+            if filtered_candidates:
+                candidates = filtered_candidates
+                transit_filtered = True
+
+        # 참가자 × 후보 시간 행렬로 한 번에 점수 계산 (점수 낮은 순, 동점이면 기존 순서 유지)
+        cand_arr = np.asarray(candidates, dtype=np.int64)
+        scores = score_candidates_matrix(
+            time_s[:, cand_arr],
+            reached[:, cand_arr],
+            mode_weight=mode_weight,
+            is_transit=is_transit,
+            has_transit_user=has_transit_user,
+            fairness_weight=FAIRNESS_WEIGHT,
+            fallback_max=stat_max[cand_arr],
+            fallback_min=stat_min[cand_arr],
+        )
+        if busy is not None:
+            # 공평성 + 번화가를 한 번에: busy score 1점 = CENTER_BUSY_WEIGHT 만큼 점수 감소
+            scores = scores - CENTER_BUSY_WEIGHT * np.asarray(busy.score[cand_arr], dtype=np.float64)
+        order = np.argsort(scores, kind="stable")
+        sorted_candidates = cand_arr[order].tolist()
+
+        top_nodes = pick_far_apart(sorted_candidates, [], MIN_DISTANCE_M)
+
+        if cutoff_time_s is None:
+            break
+
+        # 전체 탐색과 같은 결과가 보장되는지 확인
+        # (cutoff 안에서 이미 모든 노드에 도달했다면 전체 탐색과 같은 계산이다)
+        explored = float(reached[driving_indices].mean())
+        score_of = dict(zip(sorted_candidates, scores[order].tolist()))
+        certified = explored >= 1.0 or (
+            all_reached
+            and not extended
+            and (transit_filtered or not has_transit_user)
+            and len(top_nodes) >= top_k
+            and max(score_of[v] for v in top_nodes) < score_floor - busy_bonus_max
+        )
+        log.debug(
+            "[CENTER] bounded cutoff=%.0fs explored=%.1f%% certified=%s",
+            cutoff_time_s,
+            100.0 * explored,
+            certified,
+        )
+        if certified:
+            break
+        if explored > 0.5:
+            # 이미 그래프 절반 이상을 탐색했으면 넓혀가며 반복하기보다 전체 탐색 1번이 싸다
+            cutoff_time_s = None
+            continue
+
+        # top_k 는 채웠는데 점수가 floor 를 넘은 경우엔 필요한 cutoff 를 바로 계산
+        grow = 2.0
+        if len(top_nodes) >= top_k and all_reached and not extended:
+            needed = (max(score_of[v] for v in top_nodes) + busy_bonus_max) / score_floor
+            grow = min(2.0, max(1.25, needed * 1.05))
+        cutoff_time_s *= grow
+        score_floor *= grow
+        if cutoff_time_s / 3600.0 * min(driver_speeds) * 1000.0 > CENTER_SEARCH_MAX_CUTOFF_M:
+            cutoff_time_s = None  # 더 넓혀도 이득이 없으면 전체 탐색
+
+    # 최소 거리 제약으로 후보가 부족하면 점수 순으로 추가 (거리 제약 완화: 1km)
+    if len(top_nodes) < top_k:
+        MIN_DISTANCE_M_RELAXED = 1000  # 1km로 완화
+        pick_far_apart(sorted_candidates, top_nodes, MIN_DISTANCE_M_RELAXED)
     
     # 여전히 부족하면 점수 순으로 그냥 추가
     if len(top_nodes) < top_k:
@@ -534,57 +1053,51 @@ def find_road_center_node_multi_mode(
             if candidate_node not in top_nodes:
                 top_nodes.append(candidate_node)
     
-    best_node = top_nodes[0] if top_nodes else sorted_candidates[0]
+    best_idx = top_nodes[0] if top_nodes else sorted_candidates[0]
+    best_node = int(csr.node_ids[best_idx])
 
     # 결과 구성 (기존 코드와 동일)
-    worst_cost = node_stats[best_node]["max"]
+    worst_cost = stat_max[best_idx]
     res: Dict[str, Any] = {
-        "node": int(best_node),
-        "lon": float(G.nodes[best_node]["x"]),
-        "lat": float(G.nodes[best_node]["y"]),
+        "node": best_node,
+        "lon": float(csr.x[best_idx]),
+        "lat": float(csr.y[best_idx]),
         "max_travel_time_s": float(worst_cost),
-        "n_reached": int(counts[best_node]),
+        "n_reached": int(counts[best_idx]),
         "n_sources": int(k),
         "top_candidates": [],
     }
+    if busy is not None:
+        res["busy_score"] = float(busy.score[best_idx])
 
     # (이하 보정 로직 및 return_paths 처리 로직은 기존 코드 그대로 유지)
-    res["adjusted_point"] = adjust_to_busy_station_area(
-        lat=res["lat"],
-        lng=res["lon"],
-        base_radius=400,
-        station_search_radius=1500,
-        min_score=5.0,
-        min_poi_count=8,
-    )
+    res["adjusted_point"] = center_adjusted_point(csr, best_idx, busy)
 
-    for node in top_nodes:
-        lon = float(G.nodes[node]["x"])
-        lat = float(G.nodes[node]["y"])
-        cost = node_stats[node]["max"]
+    for v in top_nodes:
+        lon = float(csr.x[v])
+        lat = float(csr.y[v])
+        cost = stat_max[v]
         cand_obj = {
-            "node": int(node),
+            "node": int(csr.node_ids[v]),
             "lon": lon,
             "lat": lat,
             "max_travel_time_s": float(cost),
-            "n_reached": int(counts[node]),
+            "n_reached": int(counts[v]),
         }
-        cand_obj["adjusted_point"] = adjust_to_busy_station_area(
-            lat=lat,
-            lng=lon,
-            base_radius=400,
-            station_search_radius=1500,
-            min_score=5.0,
-            min_poi_count=8,
-        )
+        if busy is not None:
+            cand_obj["busy_score"] = float(busy.score[v])
+        cand_obj["adjusted_point"] = center_adjusted_point(csr, v, busy)
         res["top_candidates"].append(cand_obj)
 
     if return_paths:
         per: List[Dict[str, Any]] = []
         for idx, (s, mode) in enumerate(zip(sources, modes)):
             speed_kph = mode_to_speed_kph(mode)
-            d_m = dist_matrix.get(idx, {}).get(best_node)
-            if d_m is None:
+            d_m = dist_mat[idx, best_idx]
+            profiled = drive_weight is not None and idx in driving_indices
+            if profiled and np.isfinite(time_s[idx, best_idx]):
+                d_m = driving_distance_m(csr, source_idx[idx], best_idx)
+            if not np.isfinite(d_m):
                 per.append(
                     {
                         "index": idx,
@@ -594,7 +1107,11 @@ def find_road_center_node_multi_mode(
                     }
                 )
             else:
-                t_sec = (d_m / 1000.0) / max(speed_kph, 0.1) * 3600.0
+                # 후보 정렬/max_travel_time_s 와 같은 time_s 를 쓴다
+                # (대중교통은 RAPTOR 시간 또는 환승 시간 포함, 시간대 자동차는 프로파일 시간)
+                t_sec = time_s[idx, best_idx]
+                if not np.isfinite(t_sec):
+                    t_sec = (d_m / 1000.0) / max(speed_kph, 0.1) * 3600.0
                 per.append(
                     {
                         "index": idx,
@@ -606,6 +1123,8 @@ def find_road_center_node_multi_mode(
                     }
                 )
         res["per_person"] = per
+
+    MEETING_POINT_CACHE.set(cache_key, copy.deepcopy(res))
     return res
 
 
@@ -619,11 +1138,15 @@ def get_meeting_point(
         "time", description="내부적으로 multi-mode일 때는 무조건 time 기준입니다."
     ),
     mode: Literal["full", "point", "geojson"] = "full",
+    meeting_time: Optional[datetime] = Query(
+        None, description="모임 시간 (자동차 이동시간을 이 시간대 교통 기준으로 계산)"
+    ),
 ):
     """
     [API] 중간 지점 찾기
     - modes가 주어지지 않으면 모두 'drive'로 가정합니다.
     - 'public'이 입력되면 'drive'와 동일한 속도로 계산합니다.
+    - meeting_time 이 없으면 자동차는 평일 저녁 시간대 기준입니다.
     """
     if len(lons) != len(lats):
         raise HTTPException(status_code=400, detail="lons와 lats의 길이가 다릅니다.")
@@ -644,9 +1167,10 @@ def get_meeting_point(
 
     coords: List[Tuple[float, float]] = list(zip(lons, lats))
 
-    # 멀티 모드 계산 호출
-    result = find_road_center_node_multi_mode(
-        G, coords, modes=modes, return_paths=True, top_k=3
+    # 멀티 모드 계산 호출 (공용 compute 실행기에서 실행: 한도 초과 시 503, timeout 시 504)
+    result = run_compute_sync(
+        find_road_center_node_multi_mode,
+        G, coords, modes=modes, return_paths=True, top_k=3, meeting_time=meeting_time,
     )
 
     # 응답 형식 분기 (기존 유지)
@@ -779,13 +1303,16 @@ def generate_station_candidates(
         [{"lat": float, "lng": float, "name": str, "type": "station"}, ...]
     """
     try:
-        from ..services.google_places_services import fetch_nearby_stations
-        
-        stations = fetch_nearby_stations(
-            lat=center_lat,
-            lng=center_lng,
-            radius=radius
-        )
+        # 지하철 데이터가 있으면 로컬 역 목록에서 바로 찾는다 (HTTP 호출 없음)
+        stations = nearby_stations(center_lat, center_lng, radius, limit=max_stations)
+        if stations is None:
+            from ..services.google_places_services import fetch_nearby_stations
+
+            stations = fetch_nearby_stations(
+                lat=center_lat,
+                lng=center_lng,
+                radius=radius
+            )
         
         candidates = []
         for station in stations[:max_stations]:
@@ -835,8 +1362,23 @@ def calculate_max_travel_time_for_candidate(
         
         transportation = p.get("transportation", "").strip().lower()
         
-        # 도보는 Naver Walking API 사용
+        # 도보는 로컬 walk 그래프 우선, 없으면 Naver Walking API 사용
         if mode in ["walk", "walking", "도보"] or transportation in ["walk", "walking", "도보"]:
+            local = local_travel_time(
+                float(plat), float(plng), float(candidate_lat), float(candidate_lng),
+                mode="walking",
+            )
+            if local is not None:
+                max_time = max(max_time, float(local["duration_seconds"]))
+                has_valid_time = True
+                continue
+            cached = TRAVEL_TIME_CACHE.get(
+                "naver", "walking", float(plat), float(plng), float(candidate_lat), float(candidate_lng)
+            )
+            if cached is not None:
+                max_time = max(max_time, float(cached["duration_seconds"]))
+                has_valid_time = True
+                continue
             try:
                 from ..services.naver_directions import (
                     extract_travel_time_from_walking_response,
@@ -868,6 +1410,15 @@ def calculate_max_travel_time_for_candidate(
                 if walking_data:
                     duration_sec = extract_travel_time_from_walking_response(walking_data)
                     if duration_sec:
+                        TRAVEL_TIME_CACHE.put(
+                            "naver", "walking",
+                            float(plat), float(plng), float(candidate_lat), float(candidate_lng),
+                            {
+                                "duration_seconds": duration_sec,
+                                "success": True,
+                                "source": "naver_directions",
+                            },
+                        )
                         max_time = max(max_time, float(duration_sec))
                         has_valid_time = True
                         continue
@@ -999,6 +1550,8 @@ def find_road_center_node(
     weight: str = "length",
     return_paths: bool = True,
     top_k: int = 1,
+    backend: Optional[str] = None,
+    parallel: Optional[bool] = None,
 ) -> Dict[str, Any]:
     """
     모든 참가자가 같은 weight(예: length 또는 travel_time)를 쓴다고 가정하고
@@ -1007,6 +1560,8 @@ def find_road_center_node(
     - /api/meeting-point 에서 사용.
     - path_nodes(노드 시퀀스)는 계산/리턴하지 않고,
       v까지의 최단거리(또는 시간)만 사용.
+    - backend: "csr" | "networkx" (None 이면 GRAPH_BACKEND 설정값)
+    - parallel: 출발지별 Dijkstra 를 프로세스 풀에서 병렬 실행
     """
     if not coords_lonlat:
         raise ValueError("coords_lonlat is empty")
@@ -1026,6 +1581,19 @@ def find_road_center_node(
             f"node_lat={node.get('y')}, node_lon={node.get('x')}"
         )
 
+    cache_key = center_cache_key(
+        "single_mode",
+        G,
+        sources,
+        [None] * k,
+        weight=weight,
+        top_k=top_k,
+        return_paths=return_paths,
+    )
+    cached = MEETING_POINT_CACHE.get(cache_key)
+    if cached is not None:
+        return restore_cached_center(cached, sources, [None] * k)
+
     counts: Dict[int, int] = {}
     max_costs: Dict[int, float] = {}
     argmax_src: Dict[int, int] = {}
@@ -1033,9 +1601,19 @@ def find_road_center_node(
     dist_dicts: Dict[int, Dict[int, float]] = {}
 
     # 각 출발 노드 s에 대해 dijkstra (거리/시간만)
-    for s in sources:
+    if _resolve_backend(backend) == "csr" or isinstance(G, CSRGraph):
+        csr = get_csr_graph(G)
+        arrays = single_source_arrays(
+            G, sources, weight=weight, backend=backend, parallel=parallel
+        )
+        per_source = [csr.distances_to_dict(a) for a in arrays]
+    else:
+        per_source = [
+            single_source_lengths(G, s, weight=weight, backend=backend) for s in sources
+        ]
+
+    for s, dists in zip(sources, per_source):
         # distances only (path X)
-        dists = nx.single_source_dijkstra_path_length(G, s, weight=weight)
         dist_dicts[s] = dists
 
 
@@ -1087,10 +1665,10 @@ def find_road_center_node(
     adjusted_main = adjust_to_busy_station_area(
         lat=center_lat,
         lng=center_lon,
-        base_radius=400,
-        station_search_radius=1500,
-        min_score=5.0,
-        min_poi_count=8,
+        base_radius=BUSY_AREA_RADIUS_M,
+        station_search_radius=CENTER_STATION_SEARCH_RADIUS_M,
+        min_score=BUSY_AREA_MIN_SCORE,
+        min_poi_count=BUSY_AREA_MIN_POI_COUNT,
     )
     res["adjusted_point"] = adjusted_main
 
@@ -1114,10 +1692,10 @@ def find_road_center_node(
         adjusted = adjust_to_busy_station_area(
             lat=lat,
             lng=lon,
-            base_radius=400,
-            station_search_radius=1500,
-            min_score=5.0,
-            min_poi_count=8,
+            base_radius=BUSY_AREA_RADIUS_M,
+            station_search_radius=CENTER_STATION_SEARCH_RADIUS_M,
+            min_score=BUSY_AREA_MIN_SCORE,
+            min_poi_count=BUSY_AREA_MIN_POI_COUNT,
         )
         candidate["adjusted_point"] = adjusted
 
@@ -1162,6 +1740,7 @@ def find_road_center_node(
 
         res["per_person"] = per
 
+    MEETING_POINT_CACHE.set(cache_key, copy.deepcopy(res))
     return res
 
 
@@ -2,10 +2,11 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
 from typing import List
+import asyncio
 import math
 
 # ✅ 서비스 레벨 Google Places 호출 사용 (파일 이름에 s 붙음!)
-from ..services.google_places_services import fetch_nearby_places
+from ..services.google_places_services import fetch_nearby_places, fetch_nearby_places_async
 
 router = APIRouter(prefix="/courses", tags=["Courses"])
 
@@ -268,6 +269,72 @@ def score_course(
 
 # ---------- 내부 로직 함수 (서비스/다른 라우터에서 재사용용) ----------
 
+def _step_candidates(
+    req: CourseRequest,
+    step_index: int,
+    places_raw: List[dict],
+) -> List[PlaceCandidate]:
+    # 평점/개수 필터 (필요하면 여기서 min_rating, sorting 등 추가)
+    filtered = places_raw[: req.per_step_limit]
+    return to_candidates(filtered, step_index=step_index)
+
+
+def _no_candidates_error(
+    req: CourseRequest,
+    step_index: int,
+    step: StepInput,
+    raw_count: int,
+) -> HTTPException:
+    error_detail = (
+        f"No valid candidates (with lat/lng) for step {step_index}. "
+        f"Search params: keyword='{step.query}', type='{step.type}', "
+        f"location=({req.center_lat:.6f}, {req.center_lng:.6f}), radius={req.radius}. "
+        f"Raw results from API: {raw_count} places found. "
+        f"Tried fallback without keyword, still no results. "
+        f"Possible causes: 1) Google Places API not enabled/configured correctly, "
+        f"2) No places match the search criteria in the area, "
+        f"3) API key issues. Check server logs for [GGL] messages for details."
+    )
+    return HTTPException(
+        status_code=404,
+        detail=error_detail,
+    )
+
+
+def _rank_courses(
+    req: CourseRequest,
+    all_candidates: List[List[PlaceCandidate]],
+    participant_fav_activities: List[str],
+) -> CourseResponse:
+    best_courses: List[Course] = []
+
+    # 동적 길이 완전 탐색 (모든 조합 생성)
+    # 예: 2 steps면 candidates[0] × candidates[1], 3 steps면 candidates[0] × candidates[1] × candidates[2]
+    from itertools import product
+    
+    print(
+        f"[COURSE] Scoring courses with participant preferences: {participant_fav_activities}",
+        flush=True
+    )
+    
+    for place_combination in product(*all_candidates):
+        course = score_course(
+            list(place_combination),
+            steps=req.steps,
+            participant_fav_activities=participant_fav_activities,
+        )
+        best_courses.append(course)
+
+    if not best_courses:
+        raise HTTPException(status_code=404, detail="No course candidates generated")
+
+    best_courses.sort(key=lambda x: x.score, reverse=True)
+    top_k = best_courses[:5]
+    
+
+    return CourseResponse(courses=top_k)
+
+
 def plan_courses_internal(
     req: CourseRequest,
     participant_fav_activities: List[str] = None,
@@ -278,6 +345,7 @@ def plan_courses_internal(
       /courses/plan 이나 /meetings/{id}/courses/auto 에서 재사용 가능.
     - 유연한 개수의 steps 지원 (최소 1개 이상)
     - 참가자 선호도(fav_activity)를 고려한 휴리스틱 점수 계산
+    - 동기 버전 (sync 라우터용). async 코드에서는 plan_courses_internal_async 사용.
     """
     if len(req.steps) < 1:
         raise HTTPException(status_code=400, detail="steps must have at least 1 item")
@@ -295,10 +363,7 @@ def plan_courses_internal(
             keyword=step.query,
             type=step.type,
         )
-
-        # 평점/개수 필터 (필요하면 여기서 min_rating, sorting 등 추가)
-        filtered = places_raw[: req.per_step_limit]
-        step_candidates = to_candidates(filtered, step_index=idx)
+        step_candidates = _step_candidates(req, idx, places_raw)
 
         # 검색 결과가 없으면 더 단순한 검색어로 fallback 시도
         if not step_candidates:
@@ -311,55 +376,66 @@ def plan_courses_internal(
                     keyword=None,  # keyword 제거
                     type=step.type,
                 )
-                filtered_fallback = places_raw_fallback[: req.per_step_limit]
-                step_candidates = to_candidates(filtered_fallback, step_index=idx)
+                step_candidates = _step_candidates(req, idx, places_raw_fallback)
             
             # 여전히 결과가 없으면 에러
             if not step_candidates:
-                error_detail = (
-                    f"No valid candidates (with lat/lng) for step {idx}. "
-                    f"Search params: keyword='{step.query}', type='{step.type}', "
-                    f"location=({req.center_lat:.6f}, {req.center_lng:.6f}), radius={req.radius}. "
-                    f"Raw results from API: {len(places_raw)} places found. "
-                    f"Tried fallback without keyword, still no results. "
-                    f"Possible causes: 1) Google Places API not enabled/configured correctly, "
-                    f"2) No places match the search criteria in the area, "
-                    f"3) API key issues. Check server logs for [GGL] messages for details."
-                )
-                raise HTTPException(
-                    status_code=404,
-                    detail=error_detail,
-                )
+                raise _no_candidates_error(req, idx, step, len(places_raw))
 
         all_candidates.append(step_candidates)
 
-    best_courses: List[Course] = []
+    return _rank_courses(req, all_candidates, participant_fav_activities)
 
-    # 동적 길이 완전 탐색 (모든 조합 생성)
-    # 예: 2 steps면 candidates[0] × candidates[1], 3 steps면 candidates[0] × candidates[1] × candidates[2]
-    from itertools import product
-    
-    print(
-        f"[COURSE] Scoring courses with participant preferences: {participant_fav_activities}",
-        flush=True
-    )
-    
-    for place_combination in product(*all_candidates):
-        course = score_course(
-            list(place_combination),
-            steps=req.steps,
-            participant_fav_activities=participant_fav_activities,
+
+async def plan_courses_internal_async(
+    req: CourseRequest,
+    participant_fav_activities: List[str] = None,
+) -> CourseResponse:
+    """
+    plan_courses_internal 의 async 버전 (결과 동일).
+    - 단계별 Places 검색을 동시에 보내고, 이벤트 루프를 막지 않는다.
+    """
+    if len(req.steps) < 1:
+        raise HTTPException(status_code=400, detail="steps must have at least 1 item")
+
+    participant_fav_activities = participant_fav_activities or []
+
+    raw_per_step = await asyncio.gather(
+        *(
+            fetch_nearby_places_async(
+                lat=req.center_lat,
+                lng=req.center_lng,
+                radius=req.radius,
+                keyword=step.query,
+                type=step.type,
+            )
+            for step in req.steps
         )
-        best_courses.append(course)
+    )
 
-    if not best_courses:
-        raise HTTPException(status_code=404, detail="No course candidates generated")
+    all_candidates: List[List[PlaceCandidate]] = []
 
-    best_courses.sort(key=lambda x: x.score, reverse=True)
-    top_k = best_courses[:5]
-    
+    for idx, (step, places_raw) in enumerate(zip(req.steps, raw_per_step)):
+        step_candidates = _step_candidates(req, idx, places_raw)
 
-    return CourseResponse(courses=top_k)
+        # 검색 결과가 없으면 keyword 없이 type만으로 재시도
+        if not step_candidates:
+            if step.query:
+                places_raw_fallback = await fetch_nearby_places_async(
+                    lat=req.center_lat,
+                    lng=req.center_lng,
+                    radius=req.radius,
+                    keyword=None,  # keyword 제거
+                    type=step.type,
+                )
+                step_candidates = _step_candidates(req, idx, places_raw_fallback)
+
+            if not step_candidates:
+                raise _no_candidates_error(req, idx, step, len(places_raw))
+
+        all_candidates.append(step_candidates)
+
+    return _rank_courses(req, all_candidates, participant_fav_activities)
 
 
 # ---------- HTTP Endpoint (기존 기능 유지) ----------
@@ -1,6 +1,6 @@
 # backend/app/routers/google_api.py
 from fastapi import APIRouter, Query
-import requests
+from ..services.http_clients import get_session
 from core.config import GOOGLE_MAPS_API_KEY
 
 router = APIRouter(prefix="/maps", tags=["Google Maps"])
@@ -31,7 +31,7 @@ def get_nearby_places(
         "key": GOOGLE_MAPS_API_KEY
     }
 
-    res = requests.get(url, params=params).json()
+    res = get_session(url).get(url, params=params).json()
 
     filtered = [
         p for p in res.get("results", [])
@@ -13,9 +13,10 @@ from .. import models
 from .calc_func import *  # find_road_center_node, save_calculated_places 등
 from .calc_func import G  # 그래프 import
 from typing import Optional
-import requests
+from ..services.http_clients import get_session
 
 from ..services.google_distance_matrix import compute_minimax_travel_times
+from ..services.compute_executor import ComputeBusyError, ComputeTimeoutError, run_compute
 from core.config import GOOGLE_MAPS_API_KEY, NAVER_MAP_CLIENT_ID, NAVER_MAP_CLIENT_SECRET
 
 router = APIRouter(prefix="/meetings", tags=["Meeting-Plans"])
@@ -50,7 +51,7 @@ def _extract_location_name_from_coords(lon: float, lat: float) -> Optional[str]:
     }
     
     try:
-        resp = requests.get(url, params=params, headers=headers, timeout=3)
+        resp = get_session(url).get(url, params=params, headers=headers, timeout=3)
         resp.raise_for_status()
     except Exception:
         return None
@@ -122,7 +123,7 @@ def reverse_geocode_naver(lon: float, lat: float) -> Optional[str]:
     }
 
     try:
-        resp = requests.get(url, params=params, headers=headers, timeout=3)
+        resp = get_session(url).get(url, params=params, headers=headers, timeout=3)
         resp.raise_for_status()
     except Exception as e:
         # TODO: 필요하면 로그 찍기
@@ -375,12 +376,15 @@ async def create_auto_plan_for_meeting(
     coords: List[Tuple[float, float]] = []
     modes: List[str] = []  # 각 참가자의 이동 수단
     participant_for_matrix: List[dict] = []
+    # 참가자별 출발지 캐시 키 (참가자 추가/삭제 시 바뀐 사람만 다시 탐색)
+    origin_keys: List[Tuple[int, int]] = []
 
     for p in meeting.participants:
         if p.start_latitude is None or p.start_longitude is None:
             continue
 
         coords.append((p.start_longitude, p.start_latitude))  # (lon, lat)
+        origin_keys.append((meeting.id, p.id))
         
         # transportation을 mode로 변환 (자동차/대중교통 -> drive/public)
         # 도보는 지원하지 않음
@@ -430,13 +434,20 @@ async def create_auto_plan_for_meeting(
             has_transit = any(m in ["public", "transit", "대중교통", "bus", "subway"] for m in modes)
             top_k_value = 5  # 후보를 5개로 제한
             
-            center_result = find_road_center_node_multi_mode(
+            # CPU 를 오래 쓰는 그래프 탐색은 compute 실행기에서 (이벤트 루프를 막지 않음)
+            center_result = await run_compute(
+                find_road_center_node_multi_mode,
                 G,
                 coords_lonlat=coords,
                 modes=modes,
                 return_paths=True,
                 top_k=top_k_value,
+                origin_keys=origin_keys,
+                meeting_time=meeting_time,
             )
+        except (ComputeBusyError, ComputeTimeoutError):
+            # 서버가 바쁜 경우는 지리적 중심점으로 대충 때우지 않고 503/504 그대로 응답
+            raise
         except (RuntimeError, ValueError, Exception) as e:
             # 그래프 범위 밖이거나 경로를 찾을 수 없는 경우 지리적 중심점 사용
 
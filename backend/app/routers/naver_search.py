@@ -5,6 +5,8 @@ from pathlib import Path
 import os, re, logging
 import httpx
 
+from ..services.http_clients import get_async_client
+
 router = APIRouter(prefix="/api/search", tags=["search"])
 
 # ── .env 강제 로드 (backend 루트의 .env) ──
@@ -128,59 +130,59 @@ async def search_places(q: str = Query(..., min_length=1), display: int = 10):
     params = {"query": q, "display": min(max(display, 1), 30)}  # 1~30로 클램프
 
     try:
-        async with httpx.AsyncClient(timeout=8.0) as client:
-            # 1) 네이버 로컬 검색 먼저 호출
-            r = await client.get(NAVER_LOCAL_URL, headers=headers, params=params)
-            r.raise_for_status()
-            data = r.json()
-
-            items: list[Place] = []
-
-            for it in data.get("items", []):
-                title_raw = it.get("title") or ""
-                name = _strip_tags(it.get("title"))
-                address = it.get("address") or ""
-                road_addr = it.get("roadAddress") or None
-                category = it.get("category")
-                telephone = it.get("telephone")
-
-                # 🔹 지오코딩용 주소: 도로명/지번 둘 다 시도
-                # Maps API 키 사용
-                map_client_id, map_client_secret = _get_map_creds()
-                lat = lng = None
-                # 1순위: 도로명주소
-                coords = None
-                if road_addr and map_client_id and map_client_secret:
-                    coords = await _geocode_address(
-                        client,
-                        road_addr,
-                        map_client_id,
-                        map_client_secret,
-                    )
-                # 2순위: 도로명 실패 시 지번주소로 재시도
-                if not coords and address and map_client_id and map_client_secret:
-                    coords = await _geocode_address(
-                        client,
-                        address,
-                        map_client_id,
-                        map_client_secret,
-                    )
-
-                if coords:
-                    lat, lng = coords
-
-                items.append(
-                    Place(
-                        title=title_raw,
-                        name=name,
-                        address=address,
-                        roadAddress=road_addr,
-                        category=category,
-                        telephone=telephone,
-                        latitude=lat,
-                        longitude=lng,
-                    )
+        client = get_async_client(NAVER_LOCAL_URL)
+        # 1) 네이버 로컬 검색 먼저 호출
+        r = await client.get(NAVER_LOCAL_URL, headers=headers, params=params, timeout=8.0)
+        r.raise_for_status()
+        data = r.json()
+
+        items: list[Place] = []
+
+        for it in data.get("items", []):
+            title_raw = it.get("title") or ""
+            name = _strip_tags(it.get("title"))
+            address = it.get("address") or ""
+            road_addr = it.get("roadAddress") or None
+            category = it.get("category")
+            telephone = it.get("telephone")
+
+            # 🔹 지오코딩용 주소: 도로명/지번 둘 다 시도
+            # Maps API 키 사용
+            map_client_id, map_client_secret = _get_map_creds()
+            lat = lng = None
+            # 1순위: 도로명주소
+            coords = None
+            if road_addr and map_client_id and map_client_secret:
+                coords = await _geocode_address(
+                    get_async_client(GEOCODE_URL),
+                    road_addr,
+                    map_client_id,
+                    map_client_secret,
+                )
+            # 2순위: 도로명 실패 시 지번주소로 재시도
+            if not coords and address and map_client_id and map_client_secret:
+                coords = await _geocode_address(
+                    get_async_client(GEOCODE_URL),
+                    address,
+                    map_client_id,
+                    map_client_secret,
+                )
+
+            if coords:
+                lat, lng = coords
+
+            items.append(
+                Place(
+                    title=title_raw,
+                    name=name,
+                    address=address,
+                    roadAddress=road_addr,
+                    category=category,
+                    telephone=telephone,
+                    latitude=lat,
+                    longitude=lng,
                 )
+            )
 
     except httpx.HTTPStatusError as e:
         log.exception("NAVER API HTTP error: %s", e)
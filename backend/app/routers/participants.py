@@ -11,6 +11,7 @@ import requests
 from ..database import get_db
 from .. import schemas
 from .. import models
+from ..services.http_clients import get_session
 from core.config import NAVER_MAP_CLIENT_ID, NAVER_MAP_CLIENT_SECRET
 
 router = APIRouter(
@@ -50,7 +51,7 @@ def get_coords_from_address(address: str):
     print("-------------------------")
 
     try:
-        resp = requests.get(GEOCODE_URL, params=params, headers=headers, timeout=7)
+        resp = get_session(GEOCODE_URL).get(GEOCODE_URL, params=params, headers=headers, timeout=7)
         print("Final URL    :", resp.url)
         print("Status       :", resp.status_code)
     except requests.exceptions.RequestException as e:
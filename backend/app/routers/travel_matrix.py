@@ -0,0 +1,79 @@
+# app/routers/travel_matrix.py
+
+from fastapi import APIRouter, HTTPException
+from pydantic import BaseModel
+from typing import List, Literal, Optional
+import logging
+import os
+
+from ..services.compute_executor import run_compute
+from ..services.local_routing import local_travel_matrix
+
+router = APIRouter(prefix="/api", tags=["travel-matrix"])
+
+log = logging.getLogger(__name__)
+
+# 한 요청에서 계산할 수 있는 최대 (출발지 수 × 도착지 수)
+TRAVEL_MATRIX_MAX_ELEMENTS = int(os.getenv("TRAVEL_MATRIX_MAX_ELEMENTS", "10000"))
+
+
+class MatrixPoint(BaseModel):
+    lat: float
+    lng: float
+
+
+class TravelMatrixRequest(BaseModel):
+    """N개 출발지 × M개 도착지 이동시간 행렬 요청"""
+    origins: List[MatrixPoint]
+    destinations: List[MatrixPoint]
+    mode: Literal["driving", "walking"] = "driving"
+
+
+class TravelMatrixResponse(BaseModel):
+    """
+    durations_seconds[i][j] / distances_meters[i][j] = origins[i] → destinations[j]
+    (경로가 없거나 도로에서 너무 먼 지점이면 None)
+    """
+    durations_seconds: List[List[Optional[int]]]
+    distances_meters: List[List[Optional[int]]]
+    mode: str
+    is_estimated: bool = True
+    source: str = "local_graph"
+
+
+@router.post("/travel-matrix", response_model=TravelMatrixResponse)
+async def calculate_travel_matrix(request: TravelMatrixRequest):
+    """
+    로컬 도로 그래프(Contraction Hierarchy)로 N×M 이동시간/거리 행렬을 한 번에 계산.
+
+    - 외부 API 호출 없음 (제한속도 기준 추정치, 실시간 교통 미반영)
+    - N×M 번 개별 호출 대신 출발지/도착지마다 한 번씩만 탐색한다
+    """
+    if not request.origins or not request.destinations:
+        raise HTTPException(status_code=400, detail="출발지와 도착지가 각각 1개 이상 필요합니다.")
+
+    n_elements = len(request.origins) * len(request.destinations)
+    if n_elements > TRAVEL_MATRIX_MAX_ELEMENTS:
+        raise HTTPException(
+            status_code=400,
+            detail=(
+                f"행렬 크기가 너무 큽니다 ({n_elements}개). "
+                f"출발지 수 × 도착지 수는 최대 {TRAVEL_MATRIX_MAX_ELEMENTS}개입니다."
+            ),
+        )
+
+    # 그래프 탐색은 CPU 작업이라 compute 실행기에서 돌린다 (한도 초과 시 503/504)
+    result = await run_compute(
+        local_travel_matrix,
+        [(p.lat, p.lng) for p in request.origins],
+        [(p.lat, p.lng) for p in request.destinations],
+        mode=request.mode,
+    )
+    if result is None:
+        mode_name = {"driving": "자동차", "walking": "도보"}.get(request.mode, request.mode)
+        raise HTTPException(
+            status_code=503,
+            detail=f"{mode_name} 로컬 도로 그래프(전처리 데이터)가 로드되지 않았습니다.",
+        )
+
+    return TravelMatrixResponse(**result)
@@ -0,0 +1,201 @@
+# app/services/busy_score.py
+"""
+도로 그래프 노드별 번화가 점수(busy score) 사전 계산 테이블.
+
+- 중간 지점 탐색은 이동시간 기준으로 노드를 고른 뒤 후보마다 adjust_to_busy_station_area 로
+  번화가/역세권으로 옮겼다. 옮긴 곳은 공평성 점수를 다시 보지 않으므로 이득이 사라지기도 했다.
+- build_seoul_graph.py 에서 drive 그래프의 모든 노드에 대해 score_area_with_places 와 같은 식
+  (place_hotspot.busy_area_score)으로 오프라인 POI 인덱스(poi_index) 점수를 한 번만 계산해 두고,
+  find_road_center_node_multi_mode 가 (공평성 점수 - 가중치 × busy score) 로 후보를 한 번에 정렬한다.
+
+저장 위치: <drive 스냅샷 디렉토리>/busy_score/
+    meta.json   : 포맷 버전, radius_m, sample_size, graph_version, poi_version 등
+    score.npy   : float32 (n_nodes,)    번화가 score (score_area_with_places 의 score)
+    station.npy : bool    (n_nodes,)    역세권 여부
+    counts.npy  : int16   (n_nodes, C)  카테고리별 POI 수 (C = poi_index.POI_CATEGORIES)
+노드 인덱스는 같은 디렉토리의 스냅샷(node_ids.npy)과 같다.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .place_hotspot import BUSY_AREA_RADIUS_M, busy_area_score
+from .poi_index import POI_CATEGORIES, POI_SAMPLE_SIZE, POIIndex
+from .road_graph import CSRGraph, read_array_meta, save_array_directory, snapshot_graph_version
+
+log = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+BUSY_SCORE_FORMAT = 1
+BUSY_SCORE_DIR = "busy_score"
+# adjust_to_busy_station_area 의 base_radius 와 같은 값이어야 그 판정을 테이블로 대신할 수 있다
+BUSY_SCORE_RADIUS_M = float(os.getenv("BUSY_SCORE_RADIUS_M", str(BUSY_AREA_RADIUS_M)))
+
+
+def busy_score_directory(snapshot_dir: PathLike) -> Path:
+    return Path(snapshot_dir) / BUSY_SCORE_DIR
+
+
+class BusyScoreTable:
+    """노드 인덱스 → (번화가 score, 역세권 여부, 카테고리별 POI 수)."""
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        score: np.ndarray,
+        station: np.ndarray,
+        counts: np.ndarray,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.node_ids = node_ids
+        self.score = score
+        self.station = station
+        self.counts = counts
+        self.meta: Dict[str, Any] = dict(meta or {})
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.score.shape[0])
+
+    @property
+    def graph_version(self) -> Optional[str]:
+        return self.meta.get("graph_version")
+
+    @property
+    def poi_version(self) -> Optional[str]:
+        return self.meta.get("poi_version")
+
+    @property
+    def radius_m(self) -> float:
+        return float(self.meta.get("radius_m", BUSY_SCORE_RADIUS_M))
+
+    def area(self, node_index: int) -> Tuple[float, bool, int, Counter]:
+        """score_area_with_places(노드 좌표, radius_m) 와 같은 (score, 역세권, POI 수, Counter)."""
+        row = self.counts[node_index]
+        counter = Counter({POI_CATEGORIES[c]: int(n) for c, n in enumerate(row) if n})
+        is_station = bool(self.station[node_index])
+        if not is_station and not counter:
+            return 0.0, False, 0, Counter()
+        score, poi_count = busy_area_score(is_station, counter)
+        return score, is_station, poi_count, counter
+
+
+# ----------------------------------------------------------------------
+# 전처리 (build_seoul_graph.py)
+# ----------------------------------------------------------------------
+def build_busy_scores(
+    graph: CSRGraph,
+    poi_index: POIIndex,
+    radius_m: float = BUSY_SCORE_RADIUS_M,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> BusyScoreTable:
+    """그래프의 모든 노드 좌표에서 POI 인덱스로 번화가 점수를 계산."""
+    t0 = time.perf_counter()
+    n = graph.n_nodes
+    code_of = {c: i for i, c in enumerate(POI_CATEGORIES)}
+    score = np.zeros(n, dtype=np.float32)
+    station = np.zeros(n, dtype=bool)
+    counts = np.zeros((n, len(POI_CATEGORIES)), dtype=np.int16)
+
+    lat = np.asarray(graph.y, dtype=np.float64)
+    lng = np.asarray(graph.x, dtype=np.float64)
+    for i in range(n):
+        if progress is not None and i and i % 50000 == 0:
+            progress(i, n)
+        is_station, counter = poi_index.area_counts(float(lat[i]), float(lng[i]), radius_m)
+        if not is_station and not counter:
+            continue
+        station[i] = is_station
+        for cat, c in counter.items():
+            counts[i, code_of[cat]] = c
+        score[i] = busy_area_score(is_station, counter)[0]
+
+    meta = {
+        "format": BUSY_SCORE_FORMAT,
+        "radius_m": float(radius_m),
+        "sample_size": POI_SAMPLE_SIZE,
+        "categories": list(POI_CATEGORIES),
+        "graph_version": graph.graph_version,
+        "poi_version": poi_index.version,
+        "n_nodes": int(n),
+        "nodes_station_area": int(station.sum()),
+        "score_max": float(score.max()) if n else 0.0,
+        "build_seconds": round(time.perf_counter() - t0, 1),
+    }
+    return BusyScoreTable(np.asarray(graph.node_ids), score, station, counts, meta)
+
+
+def save_busy_scores(table: BusyScoreTable, snapshot_dir: PathLike) -> Path:
+    """스냅샷 디렉토리 아래 busy_score/ 에 저장하고 경로를 반환."""
+    out = busy_score_directory(snapshot_dir)
+    arrays = {
+        "score": np.ascontiguousarray(table.score, dtype=np.float32),
+        "station": np.ascontiguousarray(table.station, dtype=bool),
+        "counts": np.ascontiguousarray(table.counts, dtype=np.int16),
+    }
+    table.meta = save_array_directory(out, arrays, table.meta)
+    return out
+
+
+def load_busy_scores(
+    snapshot_dir: PathLike,
+    poi_version: Optional[str] = None,
+    mmap: bool = True,
+) -> Optional[BusyScoreTable]:
+    """
+    스냅샷 디렉토리의 busy_score/ 를 로드.
+    없거나, 스냅샷 graph_version / 카테고리 구성이 맞지 않으면 None.
+    poi_version 을 주면 (서버가 로드한 POI 인덱스) 그것과도 맞아야 한다.
+    """
+    src = Path(snapshot_dir)
+    bs_dir = busy_score_directory(src)
+    graph_version = snapshot_graph_version(src)
+    if graph_version is None:
+        return None
+    expected: Dict[str, Any] = {"graph_version": graph_version, "categories": list(POI_CATEGORIES)}
+    if poi_version is not None:
+        expected["poi_version"] = poi_version
+    meta = read_array_meta(bs_dir, BUSY_SCORE_FORMAT, "BUSY", expected)
+    if meta is None:
+        return None
+
+    mmap_mode = "r" if mmap else None
+    return BusyScoreTable(
+        node_ids=np.load(src / "node_ids.npy", mmap_mode=mmap_mode),
+        score=np.load(bs_dir / "score.npy", mmap_mode=mmap_mode),
+        station=np.load(bs_dir / "station.npy", mmap_mode=mmap_mode),
+        counts=np.load(bs_dir / "counts.npy", mmap_mode=mmap_mode),
+        meta=meta,
+    )
+
+
+# ----------------------------------------------------------------------
+# 등록 / 조회
+# ----------------------------------------------------------------------
+# 그래프 이름("drive") → BusyScoreTable
+_TABLES: Dict[str, BusyScoreTable] = {}
+
+
+def register_busy_scores(name: str, table: BusyScoreTable) -> BusyScoreTable:
+    """그래프를 로드한 쪽에서 1회 호출."""
+    _TABLES[name] = table
+    log.info(
+        "[BUSY] %s: %d nodes, radius=%.0fm (%s nodes in a station area)",
+        name,
+        table.n_nodes,
+        table.radius_m,
+        table.meta.get("nodes_station_area", "?"),
+    )
+    return table
+
+
+def get_busy_scores(name: str = "drive") -> Optional[BusyScoreTable]:
+    return _TABLES.get(name)
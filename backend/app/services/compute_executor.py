@@ -0,0 +1,168 @@
+# app/services/compute_executor.py
+"""
+그래프 탐색처럼 CPU 를 오래 쓰는 작업 전용 실행기.
+
+- async 라우트에서 find_road_center_node_multi_mode 를 직접 부르면
+  수 초짜리 Dijkstra 가 이벤트 루프 스레드에서 돌아서 같은 워커의 다른 요청이 모두 멈춘다.
+- 여기서는 크기가 정해진 스레드 풀에서 돌리고,
+    * 실행 중 + 대기 중 작업 수가 한도를 넘으면 바로 503 (백프레셔)
+    * 작업마다 timeout 을 넘기면 504
+  로 응답해서 무거운 계산 하나가 워커 전체를 잡아먹지 않게 한다.
+- async 라우트는 `await run_compute(...)`, sync 라우트는 `run_compute_sync(...)` 로
+  같은 실행기(같은 한도)를 공유한다.
+
+환경변수
+- COMPUTE_WORKERS      : 동시에 실행할 작업 수 (기본 2)
+- COMPUTE_QUEUE_DEPTH  : 실행 대기열 최대 길이 (기본 8)
+- COMPUTE_TIMEOUT_S    : 작업별 기본 timeout 초 (기본 30)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from fastapi import HTTPException
+
+log = logging.getLogger(__name__)
+
+COMPUTE_WORKERS = int(os.getenv("COMPUTE_WORKERS", "2"))
+COMPUTE_QUEUE_DEPTH = int(os.getenv("COMPUTE_QUEUE_DEPTH", "8"))
+COMPUTE_TIMEOUT_S = float(os.getenv("COMPUTE_TIMEOUT_S", "30"))
+
+T = TypeVar("T")
+
+
+class ComputeBusyError(HTTPException):
+    """실행기 한도 초과 → 503"""
+
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=503,
+            detail="경로 계산 요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": "5"},
+        )
+
+
+class ComputeTimeoutError(HTTPException):
+    """작업 timeout → 504"""
+
+    def __init__(self, timeout_s: float) -> None:
+        super().__init__(
+            status_code=504,
+            detail=f"경로 계산이 제한 시간({timeout_s:.0f}초)을 초과했습니다.",
+        )
+
+
+class ComputeExecutor:
+    def __init__(self, workers: int, queue_depth: int, timeout_s: float) -> None:
+        self.workers = max(1, int(workers))
+        self.queue_depth = max(0, int(queue_depth))
+        self.timeout_s = float(timeout_s)
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="compute"
+        )
+        # 실행 중 + 대기 중 작업 수 상한
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_depth)
+        self._lock = threading.Lock()
+        self._stats = {"submitted": 0, "completed": 0, "rejected": 0, "timeouts": 0, "failed": 0}
+        self._in_flight = 0
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        """한도를 넘으면 기다리지 않고 ComputeBusyError."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._stats["rejected"] += 1
+            log.warning("[COMPUTE] rejected: %d tasks in flight", self._in_flight)
+            raise ComputeBusyError()
+
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._in_flight += 1
+
+        try:
+            fut = self._pool.submit(fn, *args, **kwargs)
+        except BaseException:
+            self._release(None)
+            raise
+        # timeout 이 나도 스레드는 끝까지 돌므로, 실제로 끝났을 때 자리를 돌려준다
+        fut.add_done_callback(self._release)
+        return fut
+
+    def _release(self, fut: Optional[Future]) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if fut is not None and not fut.cancelled():
+                key = "failed" if fut.exception() is not None else "completed"
+                self._stats[key] += 1
+        self._slots.release()
+
+    def _timed_out(self, fut: Future, timeout_s: float) -> ComputeTimeoutError:
+        fut.cancel()  # 아직 대기열에 있으면 실행하지 않는다
+        with self._lock:
+            self._stats["timeouts"] += 1
+        log.warning("[COMPUTE] task timed out after %.1fs", timeout_s)
+        return ComputeTimeoutError(timeout_s)
+
+    async def run(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """async 라우트용: 이벤트 루프를 막지 않고 결과를 기다린다."""
+        timeout_s = self.timeout_s if timeout is None else float(timeout)
+        fut = self.submit(fn, *args, **kwargs)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(fut), timeout=timeout_s)
+        except asyncio.TimeoutError:
+            raise self._timed_out(fut, timeout_s) from None
+
+    def run_sync(
+        self,
+        fn: Callable[..., T],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any,
+    ) -> T:
+        """sync 라우트용 (FastAPI 스레드풀에서 호출됨): 같은 한도를 공유한다."""
+        timeout_s = self.timeout_s if timeout is None else float(timeout)
+        fut = self.submit(fn, *args, **kwargs)
+        try:
+            return fut.result(timeout=timeout_s)
+        except FutureTimeoutError:
+            raise self._timed_out(fut, timeout_s) from None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "in_flight": self._in_flight,
+                "workers": self.workers,
+                "queue_depth": self.queue_depth,
+                "timeout_s": self.timeout_s,
+            }
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+compute_executor = ComputeExecutor(
+    workers=COMPUTE_WORKERS,
+    queue_depth=COMPUTE_QUEUE_DEPTH,
+    timeout_s=COMPUTE_TIMEOUT_S,
+)
+
+
+async def run_compute(fn: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+    return await compute_executor.run(fn, *args, timeout=timeout, **kwargs)
+
+
+def run_compute_sync(fn: Callable[..., T], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> T:
+    return compute_executor.run_sync(fn, *args, timeout=timeout, **kwargs)
@@ -0,0 +1,503 @@
+# app/services/contraction_hierarchy.py
+"""
+도로 그래프 Contraction Hierarchy (CH) — 두 지점 간 최단 이동시간을 ms 이하로 계산.
+
+- 코스 구간 / 후보지 평가 / /travel-time 은 "A → B 한 쌍" 질의가 대부분인데,
+  그때마다 서울 전체 Dijkstra(수백 ms)를 돌리거나 외부 API 를 부를 수는 없다.
+- build_seoul_graph.py 에서 한 번만 전처리한다.
+    1) 덜 중요한 노드부터 하나씩 "수축(contract)" 한다.
+       노드 v 를 지울 때 이웃 u–w 사이 최단경로가 v 를 지나야만 하면
+       u–w 지름길(shortcut) 간선을 추가한다 (다른 경로가 있으면 추가하지 않음 = witness).
+    2) 수축 순서(rank)가 높은 쪽으로 가는 간선(원래 간선 + 지름길)만 CSR 로 저장한다.
+- 질의는 출발지/도착지 양쪽에서 "rank 가 올라가는 간선" 만 따라가는 양방향 Dijkstra.
+  탐색 공간이 수백 노드라 파이썬에서도 1 ms 안쪽에 끝난다.
+- 서버 그래프는 무방향이라 위쪽(upward) 그래프 하나로 정방향/역방향 탐색을 모두 한다.
+- 주 weight(예: travel_time) 최단경로를 따라 보조 weight(예: length) 합계도 같이 들고 있어서
+  한 번의 질의로 (이동시간, 거리) 를 같이 돌려준다.
+
+저장 위치: <스냅샷 디렉토리>/ch_<weight>/
+    meta.json   : 포맷 버전, weight, aux_weight, 원본 graph_version 등
+    rank.npy    : int32  (노드 인덱스 → 수축 순서)
+    indptr.npy  : int64  (upward 그래프 CSR)
+    indices.npy : int32
+    w.npy       : float64 (주 weight)
+    aux.npy     : float64 (보조 weight, aux_weight 가 있을 때만)
+노드 인덱스는 같은 디렉토리의 스냅샷(node_ids.npy)과 같다.
+"""
+from __future__ import annotations
+
+import heapq
+import logging
+import math
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .road_graph import CSRGraph, read_array_meta, save_array_directory, snapshot_graph_version
+
+log = logging.getLogger(__name__)
+
+CH_FORMAT = 1
+# witness 탐색에서 확정(settle)할 최대 노드 수.
+# 작을수록 전처리는 빠르지만 불필요한 지름길이 늘어 질의가 조금 느려진다.
+CH_WITNESS_SETTLE_LIMIT = 500
+
+PathLike = Union[str, Path]
+
+
+def ch_directory(snapshot_dir: PathLike, weight: str) -> Path:
+    return Path(snapshot_dir) / f"ch_{weight}"
+
+
+class ContractionHierarchy:
+    """
+    upward 그래프 + 양방향 질의.
+
+    - node_ids : 스냅샷 노드 id (오름차순, 인덱스 ↔ id 변환용)
+    - rank     : 노드별 수축 순서 (클수록 중요한 노드)
+    - indptr / indices / w / aux : rank 가 높은 이웃으로 가는 간선만 담은 CSR
+    """
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        rank: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        w: np.ndarray,
+        aux: Optional[np.ndarray] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.node_ids = node_ids
+        self.rank = rank
+        self.indptr = indptr
+        self.indices = indices
+        self.w = w
+        self.aux = aux
+        self.meta: Dict[str, Any] = dict(meta or {})
+        # 질의 루프용 파이썬 list (내부 루프는 numpy 스칼라보다 list 인덱싱이 훨씬 빠르다)
+        self._lists: Optional[Tuple[List[int], List[int], List[float], List[float]]] = None
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.node_ids.shape[0])
+
+    @property
+    def weight(self) -> Optional[str]:
+        return self.meta.get("weight")
+
+    @property
+    def aux_weight(self) -> Optional[str]:
+        return self.meta.get("aux_weight")
+
+    def index_of(self, node_id: int) -> int:
+        i = int(np.searchsorted(self.node_ids, node_id))
+        if i >= self.n_nodes or int(self.node_ids[i]) != int(node_id):
+            raise KeyError(node_id)
+        return i
+
+    def _adjacency(self) -> Tuple[List[int], List[int], List[float], List[float]]:
+        lists = self._lists
+        if lists is None:
+            aux = self.aux if self.aux is not None else np.zeros(len(self.w))
+            lists = self._lists = (
+                self.indptr.tolist(),
+                self.indices.tolist(),
+                self.w.tolist(),
+                aux.tolist(),
+            )
+        return lists
+
+    # ------------------------------------------------------------------
+    # 질의
+    # ------------------------------------------------------------------
+    def upward_search(self, source: int) -> Dict[int, Tuple[float, float]]:
+        """
+        source(내부 인덱스)에서 upward 간선만 따라간 탐색 공간 {노드: (cost, aux)}.
+        stall-on-demand: 더 높은 노드를 거쳐 더 짧게 올 수 있는 노드는 더 펼치지 않는다
+        (그 노드의 값은 최단거리가 아닐 수 있지만, 만나는 지점 후보로는 항상 손해라 무방).
+        """
+        indptr, indices, w, aux = self._adjacency()
+        dist: Dict[int, float] = {source: 0.0}
+        extra: Dict[int, float] = {source: 0.0}
+        out: Dict[int, Tuple[float, float]] = {}
+        heap: List[Tuple[float, int]] = [(0.0, source)]
+        pop = heapq.heappop
+        push = heapq.heappush
+        inf = math.inf
+
+        while heap:
+            d, u = pop(heap)
+            if u in out or d > dist[u]:
+                continue
+            lo, hi = indptr[u], indptr[u + 1]
+            stalled = False
+            for j in range(lo, hi):
+                dv = dist.get(indices[j])
+                if dv is not None and dv + w[j] < d:
+                    stalled = True
+                    break
+            out[u] = (d, extra[u])
+            if stalled:
+                continue
+            eu = extra[u]
+            for j in range(lo, hi):
+                v = indices[j]
+                nd = d + w[j]
+                if nd < dist.get(v, inf):
+                    dist[v] = nd
+                    extra[v] = eu + aux[j]
+                    push(heap, (nd, v))
+        return out
+
+    def query(self, source: int, target: int) -> Tuple[float, float]:
+        """
+        내부 인덱스 source → target 최단 (cost, aux). 도달 불가면 (inf, inf).
+        양쪽 탐색을 번갈아 진행하고, 양쪽 힙의 최소값이 현재 최선 이상이면 멈춘다.
+        """
+        if source == target:
+            return 0.0, 0.0
+
+        indptr, indices, w, aux = self._adjacency()
+        inf = math.inf
+        pop = heapq.heappop
+        push = heapq.heappush
+
+        dist = ({source: 0.0}, {target: 0.0})
+        extra = ({source: 0.0}, {target: 0.0})
+        heaps: Tuple[List[Tuple[float, int]], List[Tuple[float, int]]] = (
+            [(0.0, source)],
+            [(0.0, target)],
+        )
+        done = (set(), set())
+        best = inf
+        best_aux = inf
+        side = 0
+
+        while True:
+            f_open = bool(heaps[0]) and heaps[0][0][0] < best
+            b_open = bool(heaps[1]) and heaps[1][0][0] < best
+            if not (f_open or b_open):
+                break
+            # 양쪽을 번갈아 한 노드씩 (한쪽이 끝났으면 다른 쪽만)
+            if not (f_open if side == 0 else b_open):
+                side ^= 1
+
+            heap = heaps[side]
+            my_dist = dist[side]
+            my_extra = extra[side]
+            my_done = done[side]
+            other_dist = dist[side ^ 1]
+            side ^= 1
+
+            d, u = pop(heap)
+            if u in my_done or d > my_dist[u]:
+                continue
+            my_done.add(u)
+
+            od = other_dist.get(u)
+            if od is not None and d + od < best:
+                best = d + od
+                best_aux = my_extra[u] + extra[side][u]
+
+            lo, hi = indptr[u], indptr[u + 1]
+            stalled = False
+            for j in range(lo, hi):
+                dv = my_dist.get(indices[j])
+                if dv is not None and dv + w[j] < d:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+
+            eu = my_extra[u]
+            for j in range(lo, hi):
+                v = indices[j]
+                nd = d + w[j]
+                if nd < my_dist.get(v, inf):
+                    my_dist[v] = nd
+                    my_extra[v] = eu + aux[j]
+                    push(heap, (nd, v))
+
+        return best, best_aux
+
+    def query_nodes(self, source_id: int, target_id: int) -> Tuple[float, float]:
+        """원래 노드 id 기준 query()."""
+        return self.query(self.index_of(source_id), self.index_of(target_id))
+
+    def many_to_many(
+        self,
+        sources: Sequence[int],
+        targets: Sequence[int],
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        내부 인덱스 sources × targets 최단 (cost, aux) 행렬 (도달 불가 = inf).
+
+        bucket 방식: 도착지마다 upward 탐색을 한 번 해서 만난 노드에 (도착지, 값) 을 적어 두고,
+        출발지마다 upward 탐색을 한 번 하면서 지나는 노드의 bucket 만 훑는다.
+        → N×M 번의 query() 대신 N + M 번의 탐색.
+        """
+        n_src, n_dst = len(sources), len(targets)
+        cost = [[math.inf] * n_dst for _ in range(n_src)]
+        extra = [[math.inf] * n_dst for _ in range(n_src)]
+
+        buckets: Dict[int, List[Tuple[int, float, float]]] = {}
+        for j, t in enumerate(targets):
+            for v, (d, a) in self.upward_search(int(t)).items():
+                buckets.setdefault(v, []).append((j, d, a))
+
+        for i, s in enumerate(sources):
+            row = cost[i]
+            row_extra = extra[i]
+            for v, (d, a) in self.upward_search(int(s)).items():
+                entries = buckets.get(v)
+                if entries is None:
+                    continue
+                for j, dt, at in entries:
+                    if d + dt < row[j]:
+                        row[j] = d + dt
+                        row_extra[j] = a + at
+
+        return (
+            np.asarray(cost, dtype=np.float64).reshape(n_src, n_dst),
+            np.asarray(extra, dtype=np.float64).reshape(n_src, n_dst),
+        )
+
+
+# ----------------------------------------------------------------------
+# 전처리 (build_seoul_graph.py 에서 호출)
+# ----------------------------------------------------------------------
+def _witness_search(
+    adj: List[Dict[int, Tuple[float, float]]],
+    source: int,
+    skip: int,
+    max_cost: float,
+    settle_limit: int,
+) -> Dict[int, float]:
+    """skip 노드를 빼고 source 에서 max_cost 까지 (최대 settle_limit 노드) 탐색."""
+    dist: Dict[int, float] = {source: 0.0}
+    heap: List[Tuple[float, int]] = [(0.0, source)]
+    settled = 0
+    inf = math.inf
+    while heap:
+        d, x = heapq.heappop(heap)
+        if d > dist[x]:
+            continue
+        if d > max_cost or settled >= settle_limit:
+            break
+        settled += 1
+        for y, (wy, _) in adj[x].items():
+            if y == skip:
+                continue
+            nd = d + wy
+            if nd < dist.get(y, inf):
+                dist[y] = nd
+                heapq.heappush(heap, (nd, y))
+    return dist
+
+
+def _needed_shortcuts(
+    adj: List[Dict[int, Tuple[float, float]]],
+    v: int,
+    settle_limit: int,
+) -> List[Tuple[int, int, float, float]]:
+    """v 를 수축할 때 필요한 지름길 (u, t, cost, aux) 목록."""
+    nbrs = list(adj[v].items())
+    shortcuts: List[Tuple[int, int, float, float]] = []
+    for i in range(len(nbrs) - 1):
+        u, (wu, au) = nbrs[i]
+        rest = nbrs[i + 1:]
+        max_cost = wu + max(wt for _, (wt, _) in rest)
+        reach = _witness_search(adj, u, v, max_cost, settle_limit)
+        for t, (wt, at) in rest:
+            via = wu + wt
+            # 같은 비용의 다른 경로가 있으면 지름길이 필요 없다
+            if reach.get(t, math.inf) > via:
+                shortcuts.append((u, t, via, au + at))
+    return shortcuts
+
+
+def build_contraction_hierarchy(
+    graph: CSRGraph,
+    weight: str = "travel_time",
+    aux_weight: Optional[str] = "length",
+    *,
+    settle_limit: int = CH_WITNESS_SETTLE_LIMIT,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> ContractionHierarchy:
+    """
+    무방향 CSRGraph → ContractionHierarchy.
+
+    - 노드 순서: 2 × edge difference(추가될 지름길 수 - 현재 차수)
+      + 이미 수축된 이웃 수 + 계층 깊이.
+      lazy update (꺼낸 노드의 우선순위를 다시 계산해서 여전히 최소일 때만 수축).
+    - 서울 drive 그래프 기준 수 분, walk 그래프는 더 오래 걸린다 (오프라인 전용).
+    """
+    started = time.monotonic()
+    n = graph.n_nodes
+    indptr = graph.indptr.tolist()
+    indices = graph.indices.tolist()
+    w = graph.weights[weight].tolist()
+    a = graph.weights[aux_weight].tolist() if aux_weight else [0.0] * len(w)
+
+    # 현재 남아 있는 그래프 (무방향: 양쪽 dict 에 같은 값)
+    adj: List[Dict[int, Tuple[float, float]]] = [{} for _ in range(n)]
+    for u in range(n):
+        row = adj[u]
+        for j in range(indptr[u], indptr[u + 1]):
+            v = indices[j]
+            if v == u:
+                continue
+            cur = row.get(v)
+            if cur is None or w[j] < cur[0]:
+                row[v] = adj[v][u] = (float(w[j]), float(a[j]))
+
+    deleted = [0] * n
+    # 계층 깊이: 한쪽 지역만 먼저 다 수축되지 않게 골고루 퍼뜨린다
+    level = [0] * n
+
+    def priority(v: int) -> int:
+        shortcuts = len(_needed_shortcuts(adj, v, settle_limit))
+        return 2 * (shortcuts - len(adj[v])) + deleted[v] + level[v]
+
+    heap = [(priority(v), v) for v in range(n)]
+    heapq.heapify(heap)
+
+    rank = np.full(n, -1, dtype=np.int32)
+    up: List[List[Tuple[int, float, float]]] = [[] for _ in range(n)]
+    n_shortcuts = 0
+    order = 0
+
+    while heap:
+        _, v = heapq.heappop(heap)
+        if rank[v] >= 0:
+            continue
+        p = priority(v)
+        if heap and p > heap[0][0]:
+            heapq.heappush(heap, (p, v))
+            continue
+
+        for u, t, cost, extra in _needed_shortcuts(adj, v, settle_limit):
+            cur = adj[u].get(t)
+            if cur is None or cost < cur[0]:
+                adj[u][t] = adj[t][u] = (cost, extra)
+                n_shortcuts += 1
+
+        # 남아 있는 이웃은 모두 v 보다 나중에 수축된다 → v 의 upward 간선
+        up[v] = [(u, wu, au) for u, (wu, au) in adj[v].items()]
+        for u in adj[v]:
+            del adj[u][v]
+            deleted[u] += 1
+            level[u] = max(level[u], level[v] + 1)
+        adj[v] = {}
+        rank[v] = order
+        order += 1
+        if progress is not None and order % 10000 == 0:
+            progress(order, n)
+
+    counts = np.fromiter((len(e) for e in up), dtype=np.int64, count=n)
+    up_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=up_indptr[1:])
+    flat = [e for edges in up for e in edges]
+    up_indices = np.fromiter((e[0] for e in flat), dtype=np.int32, count=len(flat))
+    up_w = np.fromiter((e[1] for e in flat), dtype=np.float64, count=len(flat))
+    up_aux = (
+        np.fromiter((e[2] for e in flat), dtype=np.float64, count=len(flat))
+        if aux_weight
+        else None
+    )
+
+    meta = {
+        "format": CH_FORMAT,
+        "weight": weight,
+        "aux_weight": aux_weight,
+        "graph_version": graph.graph_version,
+        "n_nodes": n,
+        "n_up_edges": len(flat),
+        "n_shortcuts": n_shortcuts,
+        "settle_limit": settle_limit,
+        "build_seconds": round(time.monotonic() - started, 1),
+    }
+    return ContractionHierarchy(
+        node_ids=graph.node_ids,
+        rank=rank,
+        indptr=up_indptr,
+        indices=up_indices,
+        w=up_w,
+        aux=up_aux,
+        meta=meta,
+    )
+
+
+def save_hierarchy(ch: ContractionHierarchy, snapshot_dir: PathLike) -> Path:
+    """스냅샷 디렉토리 아래 ch_<weight>/ 에 저장하고 경로를 반환."""
+    out = ch_directory(snapshot_dir, ch.meta["weight"])
+    arrays = {
+        "rank": np.ascontiguousarray(ch.rank, dtype=np.int32),
+        "indptr": np.ascontiguousarray(ch.indptr, dtype=np.int64),
+        "indices": np.ascontiguousarray(ch.indices, dtype=np.int32),
+        "w": np.ascontiguousarray(ch.w, dtype=np.float64),
+    }
+    if ch.aux is not None:
+        arrays["aux"] = np.ascontiguousarray(ch.aux, dtype=np.float64)
+    ch.meta = save_array_directory(out, arrays, ch.meta)
+    return out
+
+
+def load_hierarchy(
+    snapshot_dir: PathLike,
+    weight: str = "travel_time",
+    mmap: bool = True,
+) -> Optional[ContractionHierarchy]:
+    """
+    스냅샷 디렉토리의 ch_<weight>/ 를 로드.
+    없거나, 스냅샷 graph_version 과 맞지 않으면(그래프만 다시 만든 경우) None.
+    """
+    src = Path(snapshot_dir)
+    ch_dir = ch_directory(src, weight)
+    graph_version = snapshot_graph_version(src)
+    if graph_version is None:
+        return None
+    meta = read_array_meta(ch_dir, CH_FORMAT, "CH", {"graph_version": graph_version})
+    if meta is None:
+        return None
+
+    mmap_mode = "r" if mmap else None
+
+    def _load(path: Path) -> np.ndarray:
+        return np.load(path, mmap_mode=mmap_mode)
+
+    return ContractionHierarchy(
+        node_ids=_load(src / "node_ids.npy"),
+        rank=_load(ch_dir / "rank.npy"),
+        indptr=_load(ch_dir / "indptr.npy"),
+        indices=_load(ch_dir / "indices.npy"),
+        w=_load(ch_dir / "w.npy"),
+        aux=_load(ch_dir / "aux.npy") if (ch_dir / "aux.npy").exists() else None,
+        meta=meta,
+    )
+
+
+# 그래프 이름("drive", "walk", ...) → ContractionHierarchy
+_HIERARCHIES: Dict[str, ContractionHierarchy] = {}
+
+
+def register_hierarchy(name: str, ch: ContractionHierarchy) -> ContractionHierarchy:
+    """그래프를 로드한 쪽에서 1회 호출. 질의용 list 변환도 여기서 미리 한다."""
+    ch._adjacency()
+    _HIERARCHIES[name] = ch
+    log.info(
+        "[CH] %s: %d nodes, %d upward edges (weight=%s)",
+        name,
+        ch.n_nodes,
+        int(ch.indices.shape[0]),
+        ch.weight,
+    )
+    return ch
+
+
+def get_hierarchy(name: str = "drive") -> Optional[ContractionHierarchy]:
+    """등록된 CH 반환 (전처리 파일이 없으면 None)."""
+    return _HIERARCHIES.get(name)
@@ -17,9 +17,10 @@ from ..routers.course import (
     StepInput,
     CourseRequest,
     CourseResponse,
-    plan_courses_internal,
+    plan_courses_internal_async,
 )
 from ..services.naver_directions import get_travel_time
+from ..services.local_routing import local_travel_time
 
 
 @dataclass
@@ -1092,7 +1093,7 @@ async def build_and_save_courses_for_meeting(
 
     # Google Places API types를 내부 category로 매핑하는 함수 import
     from core.place_category import map_google_types_to_category
-    from ..services.google_places_services import fetch_nearby_places
+    from ..services.google_places_services import fetch_nearby_places_async
 
     # must_visit의 카테고리(특히 restaurant 여부)를 추정해서,
     # meeting_duration 기준 "식당(바 제외)" 방문 횟수 상한에서 차감한다.
@@ -1110,7 +1111,7 @@ async def build_and_save_courses_for_meeting(
 
         try:
             # must_visit 좌표 주변에서 이름으로 검색해 types 추정
-            results = fetch_nearby_places(
+            results = await fetch_nearby_places_async(
                 lat=float(mv.latitude),
                 lng=float(mv.longitude),
                 radius=800,
@@ -1177,7 +1178,7 @@ async def build_and_save_courses_for_meeting(
         per_step_limit=5,
     )
 
-    course_response = plan_courses_internal(
+    course_response = await plan_courses_internal_async(
         req,
         participant_fav_activities=participant_fav_activities,
     )
@@ -1395,7 +1396,7 @@ async def build_and_save_courses_for_meeting(
                     steps=additional_steps,
                     per_step_limit=3,  # 추가 장소는 적게
                 )
-                additional_response = plan_courses_internal(
+                additional_response = await plan_courses_internal_async(
                     additional_req,
                     participant_fav_activities=participant_fav_activities,
                 )
@@ -1815,12 +1816,20 @@ async def build_and_save_courses_for_meeting(
             final_candidates[idx]["travel_mode_from_prev"] = "walking"
             continue
         
-        # 도보 시간 계산 (항상 계산)
-        distance_m = haversine_distance(
+        # 도보 시간 계산 (항상 계산): 로컬 walk 그래프 경로, 없으면 직선거리 / 보행 속도
+        walking_local = local_travel_time(
             prev_candidate["lat"], prev_candidate["lng"],
-            current_candidate["lat"], current_candidate["lng"]
+            current_candidate["lat"], current_candidate["lng"],
+            mode="walking",
         )
-        walking_minutes = calculate_walking_time_minutes(distance_m)
+        if walking_local is not None:
+            walking_minutes = walking_local["duration_seconds"] / 60.0
+        else:
+            distance_m = haversine_distance(
+                prev_candidate["lat"], prev_candidate["lng"],
+                current_candidate["lat"], current_candidate["lng"]
+            )
+            walking_minutes = calculate_walking_time_minutes(distance_m)
         
         # 대중교통, 자동차 시간 계산 (선호도가 있으면 계산)
         transit_minutes = None
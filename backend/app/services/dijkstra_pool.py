@@ -0,0 +1,188 @@
+# app/services/dijkstra_pool.py
+"""
+참가자별 Dijkstra 를 여러 프로세스에 나눠 돌리는 프로세스 풀.
+
+- 한 요청 안의 출발지별 최단거리 계산은 서로 독립이라 코어 수만큼 병렬화할 수 있다.
+  (파이썬 힙 Dijkstra 는 GIL 때문에 스레드로는 빨라지지 않는다)
+- 그래프를 pickle 해서 워커에 넘기지 않는다.
+    * 스냅샷(.npy)에서 로드한 그래프 → 워커가 같은 파일을 mmap 으로 연다
+    * 그 외(GraphML 에서 변환한 그래프) → 배열을 shared_memory 에 한 번 복사하고
+      워커는 이름으로 붙기만 한다
+- 워커에는 출발 노드 인덱스만 보내고, 거리 배열(float64)만 돌려받는다.
+
+DIJKSTRA_WORKERS 환경변수로 워커 수를 정한다 (0 = 사용 안 함, 기본값).
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import multiprocessing as mp
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .road_graph import CSRGraph, load_snapshot
+
+log = logging.getLogger(__name__)
+
+DIJKSTRA_WORKERS = int(os.getenv("DIJKSTRA_WORKERS", "0"))
+
+# 워커 프로세스 안에서 붙은 그래프
+_WORKER_GRAPH: Optional[CSRGraph] = None
+# shared_memory 핸들 (워커가 살아 있는 동안 닫히지 않게 들고 있는다)
+_WORKER_SHM: List[shared_memory.SharedMemory] = []
+
+_ARRAY_FIELDS = ("node_ids", "x", "y", "indptr", "indices")
+
+
+# ----------------------------------------------------------------------
+# 워커 쪽
+# ----------------------------------------------------------------------
+def _init_worker(spec: Tuple[str, Any]) -> None:
+    global _WORKER_GRAPH
+    kind, payload = spec
+
+    if kind == "mmap":
+        _WORKER_GRAPH = load_snapshot(payload, mmap=True)
+    else:
+        _WORKER_GRAPH = _attach_shared(payload)
+
+    # 첫 요청이 weight 변환 비용을 떠안지 않도록 미리 준비
+    if "length" in _WORKER_GRAPH.weights:
+        _WORKER_GRAPH.prepare("length")
+
+
+def _attach_shared(payload: Dict[str, Tuple[str, Tuple[int, ...], str]]) -> CSRGraph:
+    """부모가 만든 shared_memory 블록들에 붙어서 복사 없이 CSRGraph 를 구성."""
+    arrays: Dict[str, np.ndarray] = {}
+    for name, (shm_name, shape, dtype) in payload.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _WORKER_SHM.append(shm)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+    weights = {
+        name[len("w_"):]: arr for name, arr in arrays.items() if name.startswith("w_")
+    }
+    return CSRGraph(
+        node_ids=arrays["node_ids"],
+        x=arrays["x"],
+        y=arrays["y"],
+        indptr=arrays["indptr"],
+        indices=arrays["indices"],
+        weights=weights,
+    )
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+def _run_dijkstra(source_idx: int, weight: str, cutoff: Optional[float]) -> np.ndarray:
+    assert _WORKER_GRAPH is not None, "worker graph is not attached"
+    return _WORKER_GRAPH.dijkstra(source_idx, weight=weight, cutoff=cutoff)
+
+
+# ----------------------------------------------------------------------
+# 부모(서버) 쪽
+# ----------------------------------------------------------------------
+class DijkstraPool:
+    """CSRGraph 하나에 묶인 Dijkstra 프로세스 풀."""
+
+    def __init__(self, graph: CSRGraph, workers: int) -> None:
+        self.graph = graph
+        self.workers = max(1, int(workers))
+        self._shm: List[shared_memory.SharedMemory] = []
+
+        snapshot_dir = graph.meta.get("snapshot_dir")
+        if snapshot_dir:
+            spec: Tuple[str, Any] = ("mmap", snapshot_dir)
+        else:
+            spec = ("shm", self._export_shared(graph))
+
+        # fork 는 스레드가 도는 서버 프로세스에서 안전하지 않으므로 spawn 사용
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(spec,),
+        )
+        # 워커는 요청이 들어올 때 뜨므로 미리 다 띄워 둔다 (spawn + 그래프 attach 비용)
+        for f in [self._executor.submit(_ping) for _ in range(self.workers)]:
+            f.result()
+        log.info("[DIJKSTRA] process pool started (workers=%d, attach=%s)", self.workers, spec[0])
+
+    def _export_shared(self, graph: CSRGraph) -> Dict[str, Tuple[str, Tuple[int, ...], str]]:
+        arrays = {name: getattr(graph, name) for name in _ARRAY_FIELDS}
+        arrays.update({f"w_{w}": arr for w, arr in graph.weights.items()})
+
+        payload: Dict[str, Tuple[str, Tuple[int, ...], str]] = {}
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(int(arr.nbytes), 1))
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            self._shm.append(shm)
+            payload[name] = (shm.name, tuple(arr.shape), arr.dtype.str)
+        return payload
+
+    def dijkstra_many(
+        self,
+        sources: Sequence[int],
+        weight: str = "length",
+        cutoffs: Optional[Sequence[Optional[float]]] = None,
+    ) -> List[np.ndarray]:
+        """
+        sources(내부 인덱스) 각각의 dijkstra() 결과를 같은 순서로 반환.
+        cutoffs 는 출발지별 cutoff (None 이면 제한 없음).
+        """
+        if cutoffs is None:
+            cutoffs = [None] * len(sources)
+        futures = [
+            self._executor.submit(_run_dijkstra, int(s), weight, c)
+            for s, c in zip(sources, cutoffs)
+        ]
+        return [f.result() for f in futures]
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for shm in self._shm:
+            try:
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+        self._shm.clear()
+
+
+_POOL: Optional[DijkstraPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_dijkstra_pool(graph: CSRGraph) -> Optional[DijkstraPool]:
+    """
+    DIJKSTRA_WORKERS > 0 이면 graph 에 묶인 풀을 (처음 호출 시) 만들어 반환.
+    꺼져 있으면 None.
+    """
+    global _POOL
+    if DIJKSTRA_WORKERS <= 0:
+        return None
+    with _POOL_LOCK:
+        if _POOL is None or _POOL.graph is not graph:
+            if _POOL is not None:
+                _POOL.shutdown()
+            _POOL = DijkstraPool(graph, DIJKSTRA_WORKERS)
+        return _POOL
+
+
+def shutdown_dijkstra_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is not None:
+            _POOL.shutdown()
+            _POOL = None
+
+
+atexit.register(shutdown_dijkstra_pool)
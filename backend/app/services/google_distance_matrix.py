@@ -2,15 +2,41 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import httpx
 import requests
 import logging
+import math
+import os
+import time
 from datetime import datetime, timezone, timedelta
 
 from core.config import GOOGLE_MAPS_API_KEY
+from .compute_executor import ComputeBusyError, ComputeTimeoutError, run_compute
+from .http_clients import get_async_client, get_session
+from .rate_limiter import get_limiter
+from .travel_time_cache import TRAVEL_TIME_CACHE
 
 log = logging.getLogger(__name__)
 
+GOOGLE_DIRECTIONS_URL = "https://maps.googleapis.com/maps/api/directions/json"
+GOOGLE_ROUTES_URL = "https://routes.googleapis.com/directions/v2:computeRoutes"
+GOOGLE_TIMEOUT_S = 10.0
+
+# minimax 평가에서 분기 한정(branch and bound)으로 외부 API 호출을 줄일지 여부
+# - 로컬 추정치로 "가장 오래 걸릴 것 같은" 참가자부터 호출하고,
+#   부분 최대값이 이미 최선 후보보다 나쁜 후보는 남은 호출을 건너뛴다 (best_index 는 동일)
+MINIMAX_PRUNE = os.getenv("MINIMAX_PRUNE", "1").strip().lower() not in ("0", "false", "no")
+# 가지치기할 때 한 후보에서 동시에 보내는 참가자 호출 수 (추정상 오래 걸리는 순서로 묶음)
+# 후보 하나의 왕복 횟수는 최대 ceil(참가자 수 / 이 값) — 1 이면 한 명씩, 참가자 수 이상이면 가지치기 없음
+MINIMAX_PRUNE_WAVE = max(1, int(os.getenv("MINIMAX_PRUNE_WAVE", "2")))
+# 로컬 그래프 추정이 없을 때 쓰는 직선거리 기준 속도 (호출 순서 결정용)
+MINIMAX_ESTIMATE_SPEED_KMH = 30.0
+
+TRANSIT_KEYS = {"대중교통", "지하철", "버스", "subway", "train", "transit", "public", "t"}
+DRIVE_KEYS = {"자동차", "차", "car", "drive", "driving", "d"}
+
 
 def _transportation_to_google_mode(transportation: Optional[str]) -> str:
     """
@@ -68,23 +94,21 @@ def _parse_duration_seconds(duration: Any) -> Optional[int]:
     return None
 
 
-def _call_google_directions_api(
+# ---------------------------------------------------------------------------
+# 요청 구성 / 응답 해석 (동기 requests · 비동기 httpx 버전이 같이 사용)
+#   requests.Response 와 httpx.Response 는 status_code / headers / text / json()
+#   이 같아서 해석 코드는 하나로 둔다.
+# ---------------------------------------------------------------------------
+
+
+def _directions_params(
     *,
     start_lat: float,
     start_lng: float,
     goal_lat: float,
     goal_lng: float,
     mode: str,
-) -> Optional[Dict[str, Any]]:
-    """
-    Google Directions API(legacy JSON) fallback.
-    - driving: departure_time=now + duration_in_traffic 사용
-    - walking/transit: duration 사용
-    """
-    if not GOOGLE_MAPS_API_KEY:
-        return None
-
-    url = "https://maps.googleapis.com/maps/api/directions/json"
+) -> Dict[str, Any]:
     params: Dict[str, Any] = {
         "origin": f"{start_lat},{start_lng}",
         "destination": f"{goal_lat},{goal_lng}",
@@ -96,13 +120,18 @@ def _call_google_directions_api(
         params["departure_time"] = "now"
     if mode == "driving":
         params["traffic_model"] = "best_guess"
+    return params
 
-    try:
-        res = requests.get(url, params=params, timeout=10)
-    except requests.RequestException as e:
-        log.warning("[GDIRECTIONS] request error: %s", e)
-        return None
 
+def _parse_directions_response(
+    res: Any,
+    *,
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str,
+) -> Optional[Dict[str, Any]]:
     if res.status_code != 200:
         log.warning(
             "[GDIRECTIONS] non-200 status=%s, body=%s", res.status_code, res.text[:400]
@@ -162,24 +191,15 @@ def _call_google_directions_api(
     }
 
 
-def _call_routes_compute_routes(
+def _routes_request(
     *,
     start_lat: float,
     start_lng: float,
     goal_lat: float,
     goal_lng: float,
     mode: str,
-) -> Optional[Dict[str, Any]]:
-    """
-    Google Routes API(신규) 호출 래퍼.
-    - 기존 Distance Matrix(legacy)가 막힌 프로젝트에서도 사용 가능(단, Routes API 활성화 필요).
-    - driving일 때 TRAFFIC_AWARE_OPTIMAL + departureTime(now)로 실시간 교통 반영.
-    """
-    if not GOOGLE_MAPS_API_KEY:
-        log.warning("[GROUTES] GOOGLE_MAPS_API_KEY not configured")
-        return None
-
-    url = "https://routes.googleapis.com/directions/v2:computeRoutes"
+) -> Tuple[str, Dict[str, str], List[Dict[str, Any]]]:
+    """Routes API 요청 (travel_mode, headers, 차례로 시도할 body 목록)."""
     travel_mode = _to_routes_travel_mode(mode)
 
     # Routes API는 departureTime이 필수일 수 있음 (특히 TRAFFIC_AWARE 사용 시)
@@ -225,13 +245,6 @@ def _call_routes_compute_routes(
         "X-Goog-FieldMask": field_mask,
     }
 
-    def _post(body: Dict[str, Any]) -> Optional[requests.Response]:
-        try:
-            return requests.post(url, headers=headers, json=body, timeout=10)
-        except requests.RequestException as e:
-            log.warning("[GROUTES] request error: %s", e)
-            return None
-
     # 1) driving이면 교통 반영 옵션으로 먼저 시도 → routes가 없으면 옵션 제거 후 재시도
     bodies: List[Dict[str, Any]] = []
     if travel_mode == "DRIVE":
@@ -241,132 +254,101 @@ def _call_routes_compute_routes(
     else:
         bodies.append(dict(base_body))
 
-    last_non200: Optional[requests.Response] = None
-    for attempt_idx, body in enumerate(bodies):
-        res = _post(body)
-        if res is None:
-            return None
-        if res.status_code != 200:
-            last_non200 = res
-            continue
+    return travel_mode, headers, bodies
 
-        try:
-            data = res.json()
-        except ValueError:
+
+def _parse_routes_response(
+    res: Any,
+    *,
+    travel_mode: str,
+    attempt_idx: int,
+    body: Dict[str, Any],
+) -> Tuple[Optional[Dict[str, Any]], bool]:
+    """
+    200 응답 해석 → (routes 가 있는 응답, 다음 body 로 재시도할지).
+    JSON 오류 / API 에러면 (None, False).
+    """
+    try:
+        data = res.json()
+    except ValueError:
+        log.warning(
+            "[GROUTES] invalid JSON | content_type=%s, body=%s",
+            res.headers.get("content-type"),
+            res.text[:800],
+        )
+        return None, False
+
+    # 에러 필드 확인
+    if isinstance(data, dict):
+        error = data.get("error")
+        if error:
+            error_code = error.get("code")
+            error_message = error.get("message")
+            error_status = error.get("status")
             log.warning(
-                "[GROUTES] invalid JSON | content_type=%s, body=%s",
-                res.headers.get("content-type"),
-                res.text[:800],
+                "[GROUTES] API error | code=%s, status=%s, message=%s",
+                error_code,
+                error_status,
+                error_message,
             )
-            return None
+            return None, False
 
-        # 에러 필드 확인
-        if isinstance(data, dict):
-            error = data.get("error")
-            if error:
-                error_code = error.get("code")
-                error_message = error.get("message")
-                error_status = error.get("status")
+    if isinstance(data, dict) and data.get("routes"):
+        routes = data.get("routes", [])
+        if routes:
+            if travel_mode == "DRIVE" and attempt_idx == 1:
                 log.warning(
-                    "[GROUTES] API error | code=%s, status=%s, message=%s",
-                    error_code,
-                    error_status,
-                    error_message,
+                    "[GROUTES] traffic-aware returned no routes; fell back to non-traffic route"
                 )
-                return None
+            return data, False
 
-        if isinstance(data, dict) and data.get("routes"):
-            routes = data.get("routes", [])
-            if routes:
-                if travel_mode == "DRIVE" and attempt_idx == 1:
-                    log.warning(
-                        "[GROUTES] traffic-aware returned no routes; fell back to non-traffic route"
-                    )
-                return data
+    # 200인데 routes가 아예 없으면 비정상 케이스라, 디버깅을 위해 응답/헤더/URL을 함께 남김
+    log.warning(
+        "[GROUTES] no routes | status=%s, content_type=%s, request_id=%s, url=%s, headers=%s, payload=%s, raw=%s | req=%s",
+        res.status_code,
+        res.headers.get("content-type"),
+        res.headers.get("x-goog-request-id") or res.headers.get("x-goog-requestid"),
+        str(getattr(res, "url", "")),
+        dict(res.headers),
+        str(data)[:800],
+        res.text[:800],
+        {
+            "travelMode": travel_mode,
+            "has_routingPreference": "routingPreference" in body,
+            "has_departureTime": "departureTime" in body,
+        },
+    )
+    return None, True
 
-        # 200인데 routes가 아예 없으면 비정상 케이스라, 디버깅을 위해 응답/헤더/URL을 함께 남김
-        log.warning(
-            "[GROUTES] no routes | status=%s, content_type=%s, request_id=%s, url=%s, headers=%s, payload=%s, raw=%s | req=%s",
-            res.status_code,
-            res.headers.get("content-type"),
-            res.headers.get("x-goog-request-id") or res.headers.get("x-goog-requestid"),
-            str(getattr(res, "url", "")),
-            dict(res.headers),
-            str(data)[:800],
-            res.text[:800],
-            {
-                "travelMode": travel_mode,
-                "has_routingPreference": "routingPreference" in body,
-                "has_departureTime": "departureTime" in body,
-            },
-        )
 
-    if last_non200 is not None:
-        log.warning(
-            "[GROUTES] non-200 status=%s, content_type=%s, request_id=%s, body=%s",
-            last_non200.status_code,
-            last_non200.headers.get("content-type"),
-            last_non200.headers.get("x-goog-request-id"),
-            last_non200.text[:800],
-        )
-    return None
+def _log_routes_non200(res: Any) -> None:
+    log.warning(
+        "[GROUTES] non-200 status=%s, content_type=%s, request_id=%s, body=%s",
+        res.status_code,
+        res.headers.get("content-type"),
+        res.headers.get("x-goog-request-id"),
+        res.text[:800],
+    )
 
 
-def get_travel_time_single(
-    *,
-    start_lat: float,
-    start_lng: float,
-    goal_lat: float,
-    goal_lng: float,
-    mode: str,
+def _travel_time_from_routes(
+    data: Optional[Dict[str, Any]], mode: str
 ) -> Optional[Dict[str, Any]]:
-    """
-    단일 출발지→도착지에 대한 이동 시간/거리 반환.
-    - driving: departure_time=now가 적용되므로 duration_in_traffic 우선 사용 가능
-    """
-    data = _call_routes_compute_routes(
-        start_lat=start_lat,
-        start_lng=start_lng,
-        goal_lat=goal_lat,
-        goal_lng=goal_lng,
-        mode=mode,
-    )
+    """Routes API 응답 → 결과 dict. None 이면 Directions API 로 fallback."""
     if not data:
-        # Routes API가 None을 반환하면 Directions API로 fallback
-        result = _call_google_directions_api(
-            start_lat=start_lat,
-            start_lng=start_lng,
-            goal_lat=goal_lat,
-            goal_lng=goal_lng,
-            mode=mode,
-        )
-        return result
+        return None
 
     routes = data.get("routes") or []
     first = routes[0] if routes else None
     
     # routes가 없거나 geocodingResults만 있는 경우 Directions API로 fallback
     if not isinstance(first, dict) or not routes:
-        result = _call_google_directions_api(
-            start_lat=start_lat,
-            start_lng=start_lng,
-            goal_lat=goal_lat,
-            goal_lng=goal_lng,
-            mode=mode,
-        )
-        return result
+        return None
 
     distance_m = first.get("distanceMeters")
     duration_s = _parse_duration_seconds(first.get("duration"))
     if duration_s is None:
-        result = _call_google_directions_api(
-            start_lat=start_lat,
-            start_lng=start_lng,
-            goal_lat=goal_lat,
-            goal_lng=goal_lng,
-            mode=mode,
-        )
-        return result
+        return None
 
     return {
         "duration_seconds": int(duration_s),
@@ -379,6 +361,305 @@ def get_travel_time_single(
     }
 
 
+# ---------------------------------------------------------------------------
+# 동기 버전 (sync 라우터 / compute 실행기 스레드에서 사용)
+# ---------------------------------------------------------------------------
+
+
+def _call_google_directions_api(
+    *,
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Google Directions API(legacy JSON) fallback.
+    - driving: departure_time=now + duration_in_traffic 사용
+    - walking/transit: duration 사용
+    """
+    if not GOOGLE_MAPS_API_KEY:
+        return None
+
+    url = GOOGLE_DIRECTIONS_URL
+    coords = dict(start_lat=start_lat, start_lng=start_lng, goal_lat=goal_lat, goal_lng=goal_lng)
+    params = _directions_params(mode=mode, **coords)
+
+    try:
+        res = get_session(url).get(url, params=params, timeout=GOOGLE_TIMEOUT_S)
+    except requests.RequestException as e:
+        log.warning("[GDIRECTIONS] request error: %s", e)
+        return None
+
+    return _parse_directions_response(res, mode=mode, **coords)
+
+
+def _call_routes_compute_routes(
+    *,
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    Google Routes API(신규) 호출 래퍼.
+    - 기존 Distance Matrix(legacy)가 막힌 프로젝트에서도 사용 가능(단, Routes API 활성화 필요).
+    - driving일 때 TRAFFIC_AWARE_OPTIMAL + departureTime(now)로 실시간 교통 반영.
+    """
+    if not GOOGLE_MAPS_API_KEY:
+        log.warning("[GROUTES] GOOGLE_MAPS_API_KEY not configured")
+        return None
+
+    url = GOOGLE_ROUTES_URL
+    travel_mode, headers, bodies = _routes_request(
+        start_lat=start_lat, start_lng=start_lng, goal_lat=goal_lat, goal_lng=goal_lng, mode=mode
+    )
+
+    last_non200: Optional[requests.Response] = None
+    for attempt_idx, body in enumerate(bodies):
+        try:
+            res = get_session(url).post(url, headers=headers, json=body, timeout=GOOGLE_TIMEOUT_S)
+        except requests.RequestException as e:
+            log.warning("[GROUTES] request error: %s", e)
+            return None
+        if res.status_code != 200:
+            last_non200 = res
+            continue
+
+        data, retry = _parse_routes_response(
+            res, travel_mode=travel_mode, attempt_idx=attempt_idx, body=body
+        )
+        if data is not None or not retry:
+            return data
+
+    if last_non200 is not None:
+        _log_routes_non200(last_non200)
+    return None
+
+
+def get_travel_time_single(
+    *,
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    단일 출발지→도착지에 대한 이동 시간/거리 반환.
+    - driving: departure_time=now가 적용되므로 duration_in_traffic 우선 사용 가능
+    - 결과는 travel_time_cache 에 저장되고, 같은 셀/시간대 요청은 API 를 부르지 않는다
+    - 이벤트 루프 안(async 함수)에서는 get_travel_time_single_async 를 쓸 것
+    """
+    coords = dict(start_lat=start_lat, start_lng=start_lng, goal_lat=goal_lat, goal_lng=goal_lng)
+    cached = TRAVEL_TIME_CACHE.get("google", mode, **coords)
+    if cached is not None:
+        return cached
+    data = _call_routes_compute_routes(mode=mode, **coords)
+    result = _travel_time_from_routes(data, mode)
+    if result is None:
+        # Routes API 결과가 없으면 Directions API로 fallback
+        result = _call_google_directions_api(mode=mode, **coords)
+    TRAVEL_TIME_CACHE.put("google", mode, result=result, **coords)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# 비동기 버전 (async 라우터 / 서비스에서 사용, 이벤트 루프를 막지 않음)
+# ---------------------------------------------------------------------------
+
+
+async def _call_google_directions_api_async(
+    *,
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str,
+) -> Optional[Dict[str, Any]]:
+    """_call_google_directions_api 의 httpx 버전."""
+    if not GOOGLE_MAPS_API_KEY:
+        return None
+
+    url = GOOGLE_DIRECTIONS_URL
+    coords = dict(start_lat=start_lat, start_lng=start_lng, goal_lat=goal_lat, goal_lng=goal_lng)
+    params = _directions_params(mode=mode, **coords)
+
+    try:
+        res = await get_async_client(url).get(url, params=params, timeout=GOOGLE_TIMEOUT_S)
+    except httpx.HTTPError as e:
+        log.warning("[GDIRECTIONS] request error: %s", e)
+        return None
+
+    return _parse_directions_response(res, mode=mode, **coords)
+
+
+async def _call_routes_compute_routes_async(
+    *,
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str,
+) -> Optional[Dict[str, Any]]:
+    """_call_routes_compute_routes 의 httpx 버전."""
+    if not GOOGLE_MAPS_API_KEY:
+        log.warning("[GROUTES] GOOGLE_MAPS_API_KEY not configured")
+        return None
+
+    url = GOOGLE_ROUTES_URL
+    travel_mode, headers, bodies = _routes_request(
+        start_lat=start_lat, start_lng=start_lng, goal_lat=goal_lat, goal_lng=goal_lng, mode=mode
+    )
+
+    last_non200: Optional[httpx.Response] = None
+    for attempt_idx, body in enumerate(bodies):
+        try:
+            res = await get_async_client(url).post(
+                url, headers=headers, json=body, timeout=GOOGLE_TIMEOUT_S
+            )
+        except httpx.HTTPError as e:
+            log.warning("[GROUTES] request error: %s", e)
+            return None
+        if res.status_code != 200:
+            last_non200 = res
+            continue
+
+        data, retry = _parse_routes_response(
+            res, travel_mode=travel_mode, attempt_idx=attempt_idx, body=body
+        )
+        if data is not None or not retry:
+            return data
+
+    if last_non200 is not None:
+        _log_routes_non200(last_non200)
+    return None
+
+
+async def get_travel_time_single_async(
+    *,
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str,
+    check_cache: bool = True,
+) -> Optional[Dict[str, Any]]:
+    """
+    get_travel_time_single 의 async 버전 (결과 형식 동일).
+    check_cache=False 면 호출하는 쪽이 TRAVEL_TIME_CACHE 를 이미 확인한 것으로 보고 바로 API 를 부른다.
+    """
+    coords = dict(start_lat=start_lat, start_lng=start_lng, goal_lat=goal_lat, goal_lng=goal_lng)
+    if check_cache:
+        cached = await TRAVEL_TIME_CACHE.aget("google", mode, **coords)
+        if cached is not None:
+            return cached
+    data = await _call_routes_compute_routes_async(mode=mode, **coords)
+    result = _travel_time_from_routes(data, mode)
+    if result is None:
+        # Routes API 결과가 없으면 Directions API로 fallback
+        result = await _call_google_directions_api_async(mode=mode, **coords)
+    TRAVEL_TIME_CACHE.put("google", mode, result=result, **coords)
+    return result
+
+
+def _haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    r = 6371000.0
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return r * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def _minimax_estimates(
+    participants: List[Dict[str, Any]],
+    candidates: List[Dict[str, float]],
+    drive_matrix: Dict[int, List[Optional[int]]],
+) -> List[List[Optional[float]]]:
+    """
+    참가자 × 후보 로컬 추정 이동시간(sec). 외부 API 호출 순서를 정하는 데만 쓴다.
+    - 자동차: 로컬 도로 그래프 행렬 (drive_matrix)
+    - 대중교통: 지하철 네트워크 (참가자당 RAPTOR 1번)
+    - 둘 다 없으면 직선거리 / MINIMAX_ESTIMATE_SPEED_KMH
+    좌표가 없는 참가자/후보는 None.
+    """
+    try:
+        from .transit_network import get_transit_network
+
+        net = get_transit_network()
+    except ImportError:
+        net = None
+
+    goals = [
+        (float(c["lat"]), float(c["lng"]))
+        if c.get("lat") is not None and c.get("lng") is not None
+        else None
+        for c in candidates
+    ]
+    cols = [j for j, goal in enumerate(goals) if goal is not None]
+    speed_mps = MINIMAX_ESTIMATE_SPEED_KMH / 3.6
+
+    est: List[List[Optional[float]]] = []
+    for pi, p in enumerate(participants):
+        row: List[Optional[float]] = [None] * len(candidates)
+        if p.get("lat") is None or p.get("lng") is None:
+            est.append(row)
+            continue
+        plat, plng = float(p["lat"]), float(p["lng"])
+        transportation = p.get("transportation", "").strip().lower()
+
+        if transportation in DRIVE_KEYS and pi in drive_matrix:
+            row = [None if v is None else float(v) for v in drive_matrix[pi]]
+        elif transportation in TRANSIT_KEYS and net is not None and cols:
+            times = net.travel_times_from(plat, plng, [goals[j] for j in cols])
+            for j, t in zip(cols, times):
+                row[j] = t if math.isfinite(t) else None
+
+        for j in cols:
+            if row[j] is None:
+                row[j] = _haversine_m(plat, plng, *goals[j]) / speed_mps
+        est.append(row)
+    return est
+
+
+def _local_drive_matrix(
+    participants: List[Dict[str, Any]],
+    candidates: List[Dict[str, float]],
+    local_travel_matrix: Any,
+) -> Dict[int, List[Optional[int]]]:
+    """자동차 참가자 인덱스 → 후보별 로컬 도로 그래프 이동시간(sec, 도달 불가/좌표 없음은 None)."""
+    drivers = [
+        i
+        for i, p in enumerate(participants)
+        if p.get("lat") is not None
+        and p.get("lng") is not None
+        and p.get("transportation", "").strip().lower() in DRIVE_KEYS
+    ]
+    cand_cols = [
+        j for j, c in enumerate(candidates)
+        if c.get("lat") is not None and c.get("lng") is not None
+    ]
+    drive_matrix: Dict[int, List[Optional[int]]] = {}
+    if not drivers or not cand_cols:
+        return drive_matrix
+    m = local_travel_matrix(
+        [(float(participants[i]["lat"]), float(participants[i]["lng"])) for i in drivers],
+        [(float(candidates[j]["lat"]), float(candidates[j]["lng"])) for j in cand_cols],
+        mode="driving",
+    )
+    if m is not None:
+        for row_i, i in enumerate(drivers):
+            row: List[Optional[int]] = [None] * len(candidates)
+            for col, j in enumerate(cand_cols):
+                row[j] = m["durations_seconds"][row_i][col]
+            drive_matrix[i] = row
+    return drive_matrix
+
+
 async def compute_minimax_travel_times(
     participants: List[Dict[str, Any]],
     candidates: List[Dict[str, float]],
@@ -398,13 +679,18 @@ async def compute_minimax_travel_times(
 
     반환:
     {
-        "max_times": [float, ...],   # 각 후보별 참가자 최대 소요시간(sec)
+        "max_times": [float | None, ...],   # 각 후보별 참가자 최대 소요시간(sec), pruned 후보는 None
         "best_index": int,           # minimax 기준 최적 후보 인덱스
     }
 
     이동수단별 API 사용:
     - 대중교통: Google API (Routes/Directions API)
     - 자동차: Naver API (Directions API)
+
+    후보들은 동시에 호출한다 (공급자별 동시성/초당 한도는 rate_limiter).
+    한 후보에서 참가자 한 명이라도 실패하면 그 후보는 제외하고, 남은 호출은 취소한다.
+    MINIMAX_PRUNE 이면 분기 한정으로 최선 후보보다 나빠진 후보의 남은 호출을 건너뛴다
+    (best_index 는 전부 호출했을 때와 같고, 건너뛴 후보는 pruned_indices).
     """
     if not participants or not candidates:
         return None
@@ -412,8 +698,10 @@ async def compute_minimax_travel_times(
     # Naver API import (자동차용)
     try:
         from ..services.naver_directions import get_travel_time as get_travel_time_naver
+        from ..services.naver_directions import travel_time_without_api_async as naver_without_api
     except ImportError:
         get_travel_time_naver = None
+        naver_without_api = None
         log.warning("[GDM] Naver Directions API import failed, will use Google API for all modes")
 
     # 이동수단별 가중치 (공평성 조정: 대중교통 유리, 자동차 불리)
@@ -434,119 +722,272 @@ async def compute_minimax_travel_times(
         "d": 0.5,
     }
     
+    # 자동차 참가자 × 후보 이동시간은 로컬 도로 그래프 행렬 한 번으로 계산
+    # - LOCAL_TRAVEL_TIME_FIRST 면 그 값을 그대로 쓰고 (col 값이 None 이면 아래에서 API 호출)
+    # - MINIMAX_PRUNE 이면 API 호출 순서를 정하는 추정치로만 쓴다
+    # (로컬 그래프 탐색은 CPU 를 쓰므로 compute 실행기에서 — 이벤트 루프를 막지 않음)
+    drive_matrix: Dict[int, List[Optional[int]]] = {}
+    try:
+        from ..services.naver_directions import LOCAL_TRAVEL_TIME_FIRST
+        from ..services.local_routing import local_travel_matrix
+    except ImportError:
+        LOCAL_TRAVEL_TIME_FIRST = False
+        local_travel_matrix = None
+    if local_travel_matrix is not None and (LOCAL_TRAVEL_TIME_FIRST or MINIMAX_PRUNE):
+        # 실행기가 꽉 차 있으면 로컬 행렬 없이 진행한다 (후보는 이미 계산됐으므로 요청을 실패시키지 않음)
+        try:
+            drive_matrix = await run_compute(
+                _local_drive_matrix, participants, candidates, local_travel_matrix
+            )
+        except (ComputeBusyError, ComputeTimeoutError) as e:
+            log.warning("[GDM] local drive matrix skipped (%s), using APIs only", e.detail)
+    local_drive = drive_matrix if LOCAL_TRAVEL_TIME_FIRST else {}
+
     # 후보별 가중치 적용된 최대 소요시간 초기화
     n_candidates = len(candidates)
-    max_times: List[float] = [0.0 for _ in range(n_candidates)]
-    weighted_max_times: List[float] = [0.0 for _ in range(n_candidates)]  # 가중치 적용된 시간
+    max_times: List[Optional[float]] = [0.0 for _ in range(n_candidates)]
+    weighted_max_times: List[Optional[float]] = [0.0 for _ in range(n_candidates)]  # 가중치 적용된 시간
+
+    def _weighted(transportation: str, t: float) -> float:
+        # 대중교통에 추가 보정: 실제 시간을 약간 줄여서 더 유리하게 평가
+        # (대중교통 시간이 상대적으로 더 짧게 느껴지도록)
+        if transportation in TRANSIT_KEYS:
+            t_adjusted = t * 0.9  # 대중교통 시간을 10% 줄여서 보정
+        else:
+            t_adjusted = t
+        # 가중치 적용
+        return t_adjusted * MODE_WEIGHTS.get(transportation, 1.0)
+
+    api_calls = 0
+
+    async def _pair_time(pi: int, p: Dict[str, Any], j: int, c: Dict[str, Any]) -> Optional[float]:
+        """(참가자 pi → 후보 j) 이동 시간(sec). 실패하면 None."""
+        nonlocal api_calls
+        transportation = p.get("transportation", "").strip().lower()
+        kw = dict(
+            start_lat=float(p["lat"]),
+            start_lng=float(p["lng"]),
+            goal_lat=float(c["lat"]),
+            goal_lng=float(c["lng"]),
+        )
+
+        # 이동수단별로 다른 API 사용
+        # 로컬 추정 / travel_time_cache 는 호출 한도(get_limiter) 밖에서 먼저 확인한다
+        # (캐시 hit 이 동시 요청 슬롯 / 초당 토큰을 쓰지 않게)
+        if transportation in DRIVE_KEYS and get_travel_time_naver:
+            # 자동차: 로컬 그래프 행렬 값이 있으면 사용 (API 호출 없음), 없으면 Naver API 사용
+            local_t = local_drive.get(pi, [None] * n_candidates)[j]
+            if local_t is not None:
+                return float(local_t)
+            r = await naver_without_api(mode="driving", **kw)
+            if r is None:
+                api_calls += 1
+                async with get_limiter("naver"):
+                    r = await get_travel_time_naver(mode="driving", check_cache=False, **kw)
+        else:
+            if transportation in DRIVE_KEYS:
+                local_t = local_drive.get(pi, [None] * n_candidates)[j]
+                if local_t is not None:
+                    return float(local_t)
+                # Naver API 사용 불가 시 Google API로 fallback
+                log.warning("[GDM] Naver API unavailable, falling back to Google API for driving")
+            # 대중교통 / 기본값: Google API 사용 (기존 동작 유지)
+            g_mode = _transportation_to_google_mode(transportation)
+            r = await TRAVEL_TIME_CACHE.aget("google", g_mode, **kw)
+            if r is None:
+                api_calls += 1
+                async with get_limiter("google"):
+                    r = await get_travel_time_single_async(mode=g_mode, check_cache=False, **kw)
+
+        if not r or not r.get("success"):
+            return None
+        return float(r["duration_seconds"])
+
+    async def _guarded_pair_time(pi: int, p: Dict[str, Any], j: int, c: Dict[str, Any]) -> Optional[float]:
+        try:
+            return await _pair_time(pi, p, j, c)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.warning("[GDM] travel time failed | participant=%d candidate=%d: %s", pi, j, e)
+            return None
+
+    def _pairs(c: Dict[str, Any]) -> List[Tuple[int, Dict[str, Any]]]:
+        if c.get("lat") is None or c.get("lng") is None:
+            return []
+        return [
+            (pi, p)
+            for pi, p in enumerate(participants)
+            if p.get("lat") is not None and p.get("lng") is not None
+        ]
+
+    async def _candidate_times(j: int, c: Dict[str, Any]) -> Optional[List[Tuple[str, float]]]:
+        """
+        후보 j 에 대한 (이동수단, 소요시간) 목록.
+        참가자 중 한 명이라도 실패하면 None — 나머지 진행 중인 호출은 바로 취소한다.
+        """
+        pairs = _pairs(c)
+        if not pairs:
+            return None
+
+        tasks = [asyncio.ensure_future(_guarded_pair_time(pi, p, j, c)) for pi, p in pairs]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                if await fut is None:
+                    return None
+        finally:
+            pending = [t for t in tasks if not t.done()]
+            for t in pending:
+                t.cancel()
+            if pending:
+                # 취소된 호출이 limiter 슬롯을 돌려줄 때까지 기다린다
+                await asyncio.gather(*pending, return_exceptions=True)
+
+        return [
+            (p.get("transportation", "").strip().lower(), t.result())
+            for (_, p), t in zip(pairs, tasks)
+        ]
+
+    # 분기 한정(branch and bound): 지금까지 끝까지 계산된 후보 중 최소 가중 최대시간
+    best_bound = math.inf
+    pruned: set[int] = set()
+
+    async def _candidate_times_pruned(
+        j: int, c: Dict[str, Any], est_row: List[float]
+    ) -> Optional[List[Tuple[str, float]]]:
+        """
+        _candidate_times 와 같지만 참가자를 "가장 오래 걸릴 것 같은" 순서로 MINIMAX_PRUNE_WAVE 명씩
+        동시에 호출하고, 부분 최대값이 best_bound 를 넘으면 (이 후보는 최적이 될 수 없으므로)
+        남은 호출을 건너뛴다. 로컬 행렬 값으로 끝나는 참가자(API 호출 없음)는 첫 묶음에 함께 넣는다.
+        """
+        nonlocal best_bound
+        pairs = _pairs(c)
+        if not pairs:
+            return None
+        local = [pp for pp in pairs if local_drive.get(pp[0], [None] * n_candidates)[j] is not None]
+        remote = [pp for pp in pairs if local_drive.get(pp[0], [None] * n_candidates)[j] is None]
+        remote.sort(key=lambda pp: -est_row[pp[0]])
+        waves = [local + remote[:MINIMAX_PRUNE_WAVE]] + [
+            remote[k:k + MINIMAX_PRUNE_WAVE]
+            for k in range(MINIMAX_PRUNE_WAVE, len(remote), MINIMAX_PRUNE_WAVE)
+        ]
+
+        times: List[Tuple[str, float]] = []
+        partial = 0.0
+        for wave in waves:
+            if partial > best_bound:
+                pruned.add(j)
+                return times
+            results = await asyncio.gather(*(_guarded_pair_time(pi, p, j, c) for pi, p in wave))
+            if any(t is None for t in results):
+                return None
+            for (_, p), t in zip(wave, results):
+                transportation = p.get("transportation", "").strip().lower()
+                times.append((transportation, t))
+                partial = max(partial, _weighted(transportation, t))
+
+        best_bound = min(best_bound, partial)
+        return times
+
+    t0 = time.perf_counter()
+    est: Optional[List[List[Optional[float]]]] = None
+    if MINIMAX_PRUNE and n_candidates > 1:
+        # 참가자 × 후보 추정 시간 (호출 순서 결정용, 결과 값에는 쓰지 않음)
+        # (참가자별 RAPTOR 탐색이라 compute 실행기에서, 꽉 차 있으면 가지치기 없이 전부 호출)
+        try:
+            est = await run_compute(_minimax_estimates, participants, candidates, drive_matrix)
+        except (ComputeBusyError, ComputeTimeoutError) as e:
+            log.warning("[GDM] minimax estimates skipped (%s), evaluating without pruning", e.detail)
+    if est is not None:
+        est_weighted: List[List[float]] = [
+            [
+                _weighted(p.get("transportation", "").strip().lower(), est[pi][j])
+                if est[pi][j] is not None
+                else 0.0
+                for j in range(n_candidates)
+            ]
+            for pi, p in enumerate(participants)
+        ]
+        est_cols = [
+            [est_weighted[pi][j] for pi in range(len(participants))] for j in range(n_candidates)
+        ]
+
+        # 1) 추정상 가장 유망한 후보를 전부 동시에 계산해서 상한(best_bound)을 먼저 잡는다
+        order = sorted(range(n_candidates), key=lambda j: max(est_cols[j], default=0.0))
+        per_candidate: List[Optional[List[Tuple[str, float]]]] = [None] * n_candidates
+        first = order[0]
+        per_candidate[first] = await _candidate_times(first, candidates[first])
+        if per_candidate[first]:
+            best_bound = max(_weighted(tr, t) for tr, t in per_candidate[first])
+
+        # 2) 나머지 후보는 동시에, 후보 안에서는 오래 걸릴 것 같은 참가자부터 MINIMAX_PRUNE_WAVE 명씩
+        #    (전체 왕복 횟수: 1 + ceil(참가자 수 / MINIMAX_PRUNE_WAVE), 가지치기 없으면 1)
+        rest = order[1:]
+        results = await asyncio.gather(
+            *(_candidate_times_pruned(j, candidates[j], est_cols[j]) for j in rest)
+        )
+        for j, times in zip(rest, results):
+            per_candidate[j] = times
+    else:
+        # 모든 (후보, 참가자) 쌍을 동시에 보낸다 (공급자별 동시성/초당 호출 한도는 get_limiter)
+        per_candidate = await asyncio.gather(
+            *(_candidate_times(j, c) for j, c in enumerate(candidates))
+        )
+    log.info(
+        "[GDM] evaluated %d candidates x %d participants in %.2fs "
+        "(%d api calls, %d usable, %d pruned)",
+        n_candidates,
+        len(participants),
+        time.perf_counter() - t0,
+        api_calls,
+        sum(1 for j, times in enumerate(per_candidate) if times and j not in pruned),
+        len(pruned),
+    )
 
     used_any = False
-    # 각 (참가자, 후보) 쌍을 계산 (top_k가 작으므로 OK)
-    for j, c in enumerate(candidates):
-        clat = c.get("lat")
-        clng = c.get("lng")
-        if clat is None or clng is None:
+    usable: set[int] = set()
+    # 가지치기된 후보의 가중 최대 시간 하한 (실제 이동시간이 아니므로 max_times 와 따로 둔다)
+    lower_bound_weighted_max_times: List[Optional[float]] = [None] * n_candidates
+    for j, times in enumerate(per_candidate):
+        if not times:
             continue
 
         worst = 0.0
         worst_weighted = 0.0  # 가중치 적용된 최대 시간
-        ok_any = False
-
-        for p in participants:
-            plat = p.get("lat")
-            plng = p.get("lng")
-            if plat is None or plng is None:
-                continue
-
-            transportation = p.get("transportation", "").strip().lower()
-            
-            # 이동수단별로 다른 API 사용
-            if transportation in {"대중교통", "지하철", "버스", "subway", "train", "transit", "public", "t"}:
-                # 대중교통: Google API 사용
-                mode = _transportation_to_google_mode(transportation)
-                r = get_travel_time_single(
-                    start_lat=float(plat),
-                    start_lng=float(plng),
-                    goal_lat=float(clat),
-                    goal_lng=float(clng),
-                    mode=mode,
-                )
-            elif transportation in {"자동차", "차", "car", "drive", "driving", "d"}:
-                # 자동차: Naver API 사용
-                if get_travel_time_naver:
-                    r = await get_travel_time_naver(
-                        start_lat=float(plat),
-                        start_lng=float(plng),
-                        goal_lat=float(clat),
-                        goal_lng=float(clng),
-                        mode="driving",
-                    )
-                    # Naver API 응답 형식을 Google API와 동일하게 변환
-                    if r and r.get("success"):
-                        r = {
-                            "duration_seconds": r.get("duration_seconds"),
-                            "distance_meters": r.get("distance_meters"),
-                            "success": True,
-                        }
-                else:
-                    # Naver API 사용 불가 시 Google API로 fallback
-                    log.warning("[GDM] Naver API unavailable, falling back to Google API for driving")
-                    mode = _transportation_to_google_mode(transportation)
-                    r = get_travel_time_single(
-                        start_lat=float(plat),
-                        start_lng=float(plng),
-                        goal_lat=float(clat),
-                        goal_lng=float(clng),
-                        mode=mode,
-                    )
-            else:
-                # 기본값: Google API 사용 (기존 동작 유지)
-                mode = _transportation_to_google_mode(transportation)
-                r = get_travel_time_single(
-                    start_lat=float(plat),
-                    start_lng=float(plng),
-                    goal_lat=float(clat),
-                    goal_lng=float(clng),
-                    mode=mode,
-                )
-            
-            if not r or not r.get("success"):
-                ok_any = False
-                break
 
-            ok_any = True
-            t = float(r["duration_seconds"])
-            
-            # 대중교통에 추가 보정: 실제 시간을 약간 줄여서 더 유리하게 평가
-            # (대중교통 시간이 상대적으로 더 짧게 느껴지도록)
-            if transportation in {"대중교통", "지하철", "버스", "subway", "train", "transit", "public", "t"}:
-                t_adjusted = t * 0.9  # 대중교통 시간을 10% 줄여서 보정
-            else:
-                t_adjusted = t
-            
-            # 가중치 적용
-            weight = MODE_WEIGHTS.get(transportation, 1.0)
-            t_weighted = t_adjusted * weight
-            
+        for transportation, t in times:
+            t_weighted = _weighted(transportation, t)
             # 원본 최대 시간과 가중치 적용된 최대 시간 각각 추적
             if t > worst:
                 worst = t
             if t_weighted > worst_weighted:
                 worst_weighted = t_weighted
 
-        if ok_any:
-            used_any = True
-            max_times[j] = worst  # 원본 시간 (디버깅용)
-            weighted_max_times[j] = worst_weighted  # 가중치 적용된 시간 (선택 기준)
+        if j in pruned:
+            max_times[j] = None
+            weighted_max_times[j] = None
+            lower_bound_weighted_max_times[j] = worst_weighted
+            continue
+        max_times[j] = worst  # 원본 시간 (디버깅용)
+        weighted_max_times[j] = worst_weighted  # 가중치 적용된 시간 (선택 기준)
+        used_any = True
+        usable.add(j)
 
     if not used_any:
         return None
 
     # 5) minimax 기준으로 정렬 (가중치 적용된 시간 기준)
     # 대중교통 사용자가 더 짧은 시간으로 평가받도록 가중치 반영
-    sorted_indices = sorted(range(n_candidates), key=lambda idx: weighted_max_times[idx])
+    # 계산이 끝난 후보 → 가지치기된 후보(하한값) → 실패한 후보 순
+    sorted_indices = sorted(
+        range(n_candidates),
+        key=lambda idx: (
+            0 if idx in usable else 1 if idx in pruned else 2,
+            weighted_max_times[idx] if idx in usable else lower_bound_weighted_max_times[idx] or 0.0,
+        ),
+    )
     
     # 거리 기반 다양성 확보: 최소 거리(2km) 이상 떨어진 후보만 선택
-    import math
     MIN_DISTANCE_M = 2000  # 2km
     
     def haversine_distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -646,4 +1087,7 @@ async def compute_minimax_travel_times(
         "weighted_max_times": weighted_max_times,  # 가중치 적용된 시간
         "best_index": best_index,
         "selected_indices": selected_indices[:3],  # 거리 제약을 통과한 상위 3개 후보
+        "pruned_indices": sorted(pruned),  # 분기 한정으로 계산을 중단한 후보 (max_times 는 None)
+        # pruned 후보의 가중 최대 시간 하한 (나머지는 None)
+        "lower_bound_weighted_max_times": lower_bound_weighted_max_times,
     }
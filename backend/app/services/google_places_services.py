@@ -2,12 +2,19 @@
 from typing import Any, Dict, List, Optional
 
 import logging
+import httpx
 import requests
 import json  # ✅ 추가
 from core.config import GOOGLE_MAPS_API_KEY
 
+from .http_clients import get_async_client, get_session
+from .places_cache import PLACES_CACHE, FetchResult, nearby_key
+
 log = logging.getLogger(__name__)
 
+GOOGLE_NEARBY_SEARCH_URL = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+GOOGLE_PLACES_TIMEOUT_S = 5.0
+
 STATION_TYPES = {
     "subway_station",
     "train_station",
@@ -16,14 +23,13 @@ STATION_TYPES = {
 }
 
 
-def fetch_nearby_places(
+def _nearby_params(
     lat: float,
     lng: float,
-    radius: int = 1000,
-    keyword: Optional[str] = None,
-    type: Optional[str] = None,
-) -> List[Dict[str, Any]]:
-    url = "https://maps.googleapis.com/maps/api/place/nearbysearch/json"
+    radius: int,
+    keyword: Optional[str],
+    type: Optional[str],
+) -> Dict[str, Any]:
     params: Dict[str, Any] = {
         "location": f"{lat},{lng}",
         "radius": radius,
@@ -35,20 +41,18 @@ def fetch_nearby_places(
         params["keyword"] = keyword
     if type:
         params["type"] = type
+    return params
 
-    try:
-        res = requests.get(url, params=params, timeout=5)
-    except requests.RequestException as e:
-        log.warning(f"[GGL] request error: {e}")
-        return []
 
+def _parse_nearby_response(res: Any) -> FetchResult:
+    """requests / httpx 응답 공용 해석 → (결과, 캐시해도 되는지)."""
     if res.status_code != 200:
         log.warning(
             "[GGL] non-200 response: status=%s, body=%s",
             res.status_code,
             res.text[:200],
         )
-        return []
+        return [], False
 
     data = res.json()
     
@@ -69,7 +73,85 @@ def fetch_nearby_places(
                 "Please enable 'Places API (Legacy)' in Google Cloud Console or migrate to Places API (New)."
         )
 
-    return results
+    return results, status in ("OK", "ZERO_RESULTS")
+
+
+def _only_stations(places: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        p
+        for p in places
+        if any(t in STATION_TYPES for t in (p.get("types") or []))
+    ]
+
+
+def _fetch_nearby_places_uncached(
+    lat: float,
+    lng: float,
+    radius: int,
+    keyword: Optional[str],
+    type: Optional[str],
+) -> FetchResult:
+    url = GOOGLE_NEARBY_SEARCH_URL
+    params = _nearby_params(lat, lng, radius, keyword, type)
+
+    try:
+        res = get_session(url).get(url, params=params, timeout=GOOGLE_PLACES_TIMEOUT_S)
+    except requests.RequestException as e:
+        log.warning(f"[GGL] request error: {e}")
+        return [], False
+
+    return _parse_nearby_response(res)
+
+
+async def _fetch_nearby_places_uncached_async(
+    lat: float,
+    lng: float,
+    radius: int,
+    keyword: Optional[str],
+    type: Optional[str],
+) -> FetchResult:
+    url = GOOGLE_NEARBY_SEARCH_URL
+    params = _nearby_params(lat, lng, radius, keyword, type)
+
+    try:
+        res = await get_async_client(url).get(url, params=params, timeout=GOOGLE_PLACES_TIMEOUT_S)
+    except httpx.HTTPError as e:
+        log.warning(f"[GGL] request error: {e}")
+        return [], False
+
+    return _parse_nearby_response(res)
+
+
+def fetch_nearby_places(
+    lat: float,
+    lng: float,
+    radius: int = 1000,
+    keyword: Optional[str] = None,
+    type: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    동기 버전 (sync 라우터 / compute 실행기 스레드용). async 코드에서는 fetch_nearby_places_async.
+    결과는 places_cache 에 (geohash 셀, radius, keyword, type) 기준으로 캐시된다.
+    """
+    return PLACES_CACHE.get_or_fetch(
+        nearby_key(lat, lng, radius, keyword, type),
+        lambda: _fetch_nearby_places_uncached(lat, lng, radius, keyword, type),
+    )
+
+
+async def fetch_nearby_places_async(
+    lat: float,
+    lng: float,
+    radius: int = 1000,
+    keyword: Optional[str] = None,
+    type: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """fetch_nearby_places 의 async 버전 (이벤트 루프를 막지 않음, 같은 캐시 사용)."""
+    return await PLACES_CACHE.aget_or_fetch(
+        nearby_key(lat, lng, radius, keyword, type),
+        lambda: _fetch_nearby_places_uncached_async(lat, lng, radius, keyword, type),
+    )
+
 
 def fetch_nearby_stations(
     lat: float,
@@ -82,12 +164,18 @@ def fetch_nearby_stations(
         radius=radius,
         type="transit_station",
     )
-
-    stations = [
-        p
-        for p in places
-        if any(t in STATION_TYPES for t in (p.get("types") or []))
-    ]
+    return _only_stations(places)
 
 
-    return stations
+async def fetch_nearby_stations_async(
+    lat: float,
+    lng: float,
+    radius: int = 1500,
+) -> List[Dict[str, Any]]:
+    places = await fetch_nearby_places_async(
+        lat=lat,
+        lng=lng,
+        radius=radius,
+        type="transit_station",
+    )
+    return _only_stations(places)
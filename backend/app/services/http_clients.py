@@ -0,0 +1,168 @@
+# app/services/http_clients.py
+"""
+외부 API(Google / Naver / ORS) 공용 HTTP 클라이언트.
+
+- 지금까지는 호출마다 requests.get / httpx.AsyncClient() 를 새로 만들어서
+  매 요청이 TCP + TLS 핸드셰이크부터 다시 했다 (플랜 계산 한 번에 수십 번).
+- 여기서는 업스트림 호스트마다 keep-alive 커넥션 풀을 가진 클라이언트 1개를
+  서버 수명 동안 재사용한다.
+    - 동기 코드: get_session(url)       → requests.Session (HTTP/1.1 keep-alive)
+    - async 코드: get_async_client(url) → httpx.AsyncClient (h2 패키지가 있으면 HTTP/2,
+                                          서버가 지원하지 않으면 ALPN 으로 HTTP/1.1)
+- httpx.AsyncClient 는 만든 이벤트 루프에 묶이므로 루프별로 따로 둔다
+  (asyncio.run / 임시 루프에서 부르는 코드가 있어서).
+- main.py startup 에서 주요 호스트 클라이언트를 미리 만들고, shutdown 에서 모두 닫는다.
+- timeout 은 호출하는 쪽이 요청마다 넘긴다 (클라이언트 기본값은 HTTP_DEFAULT_TIMEOUT_S).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Dict, Iterable
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import h2  # noqa: F401  (httpx HTTP/2 지원에 필요)
+    _H2_AVAILABLE = True
+except ImportError:
+    _H2_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+# 호스트당 최대 커넥션 수 / 유지할 keep-alive 커넥션 수
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "20"))
+HTTP_KEEPALIVE_EXPIRY_S = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_S", "60"))
+HTTP_DEFAULT_TIMEOUT_S = float(os.getenv("HTTP_DEFAULT_TIMEOUT_S", "10"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1").strip().lower() not in ("0", "false", "no")
+
+# 서버 시작 시 미리 클라이언트를 만들어 둘 업스트림
+KNOWN_UPSTREAMS = (
+    "https://maps.googleapis.com",
+    "https://routes.googleapis.com",
+    "https://maps.apigw.ntruss.com",
+    "https://openapi.naver.com",
+    "https://api.openrouteservice.org",
+)
+
+
+def _origin(url: str) -> str:
+    """URL → 'scheme://host[:port]' (클라이언트 키)."""
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        raise ValueError(f"absolute URL required: {url!r}")
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+class HttpClientRegistry:
+    """업스트림 호스트별 requests.Session / httpx.AsyncClient 보관소."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, requests.Session] = {}
+        # 이벤트 루프 → {origin: AsyncClient} (루프가 사라지면 항목도 사라진다)
+        self._async: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, httpx.AsyncClient]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._created = {"session": 0, "async": 0}
+
+    @property
+    def http2(self) -> bool:
+        return HTTP2_ENABLED and _H2_AVAILABLE
+
+    def session(self, url: str) -> requests.Session:
+        origin = _origin(url)
+        with self._lock:
+            sess = self._sessions.get(origin)
+            if sess is None:
+                sess = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_MAXSIZE)
+                sess.mount(origin, adapter)
+                self._sessions[origin] = sess
+                self._created["session"] += 1
+            return sess
+
+    def async_client(self, url: str) -> httpx.AsyncClient:
+        """현재 실행 중인 이벤트 루프용 클라이언트 (async 함수 안에서 호출)."""
+        origin = _origin(url)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async.get(loop)
+            if clients is None:
+                clients = self._async[loop] = {}
+            client = clients.get(origin)
+            if client is None or client.is_closed:
+                client = httpx.AsyncClient(
+                    base_url=origin,
+                    http2=self.http2,
+                    timeout=HTTP_DEFAULT_TIMEOUT_S,
+                    limits=httpx.Limits(
+                        max_connections=HTTP_POOL_MAXSIZE,
+                        max_keepalive_connections=HTTP_POOL_MAXSIZE,
+                        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY_S,
+                    ),
+                )
+                clients[origin] = client
+                self._created["async"] += 1
+            return client
+
+    async def start(self, urls: Iterable[str] = KNOWN_UPSTREAMS) -> None:
+        """서버 루프에서 주요 업스트림 클라이언트를 미리 만든다 (startup)."""
+        urls = tuple(urls)
+        for url in urls:
+            self.async_client(url)
+            self.session(url)
+        log.info(
+            "[HTTP] pooled clients ready for %d upstreams (http2=%s)",
+            len(urls),
+            self.http2,
+        )
+
+    async def aclose(self) -> None:
+        """모든 클라이언트 닫기 (shutdown). 현재 루프의 AsyncClient 는 await 로 닫는다."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._async.pop(loop, {})
+            others = [c for cs in self._async.values() for c in cs.values()]
+            self._async.clear()
+        for client in clients.values():
+            await client.aclose()
+        if others:
+            # 다른(임시) 루프에서 만든 클라이언트는 그 루프에서만 닫을 수 있어 참조만 버린다
+            log.debug("[HTTP] dropped %d clients bound to other event loops", len(others))
+        self.close_sessions()
+
+    def close_sessions(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for sess in sessions:
+            sess.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "http2": self.http2,
+                "sessions": sorted(self._sessions),
+                "async_clients": sorted({o for cs in self._async.values() for o in cs}),
+                "created": dict(self._created),
+            }
+
+
+HTTP_CLIENTS = HttpClientRegistry()
+
+
+def get_session(url: str) -> requests.Session:
+    """url 업스트림용 공용 requests.Session (동기 코드)."""
+    return HTTP_CLIENTS.session(url)
+
+
+def get_async_client(url: str) -> httpx.AsyncClient:
+    """url 업스트림용 공용 httpx.AsyncClient (async 코드, 닫지 말 것)."""
+    return HTTP_CLIENTS.async_client(url)
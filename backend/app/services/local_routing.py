@@ -0,0 +1,197 @@
+# app/services/local_routing.py
+"""
+로컬 도로 그래프 기반 두 지점 이동시간 추정.
+
+- 좌표를 그래프 노드로 스냅한 뒤 Contraction Hierarchy 로 최단 이동시간/거리를 구한다.
+  (외부 API 호출 없이 1 ms 안쪽)
+- 노드까지의 직선 접근 거리는 이동수단별 접근 속도로 더한다.
+- 그래프의 travel_time 은 제한속도 기준(자유 흐름)이라 실시간 교통은 반영되지 않는다.
+  → 반환값은 항상 is_estimated=True, source="local_graph".
+- 해당 이동수단의 그래프/CH 가 로드되지 않았거나, 스냅 거리가 너무 멀거나,
+  경로가 없으면 None (호출하는 쪽이 외부 API 등으로 넘어가면 된다).
+- 여러 출발지 × 여러 도착지는 local_travel_matrix() 로 한 번에 계산한다
+  (CH bucket 방식: N×M 번 질의 대신 N + M 번 탐색).
+- drive 그래프는 calc_func 가 로드하고, walk/bike 그래프는 load_local_graph() 로
+  같은 스냅샷(.npy mmap) 경로로 로드한다.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .contraction_hierarchy import get_hierarchy, load_hierarchy, register_hierarchy
+from .node_snapper import get_snapper, register_snapper
+from .road_graph import CSRGraph, load_snapshot, snapshot_exists
+
+log = logging.getLogger(__name__)
+
+# API 이동수단 이름 → 로컬 그래프 이름 (register_snapper / register_hierarchy 에 쓴 이름)
+LOCAL_GRAPH_FOR_MODE = {"driving": "drive", "walking": "walk", "bicycling": "bike"}
+
+# 좌표 ↔ 가장 가까운 노드 거리가 이보다 멀면 그래프 밖으로 보고 추정하지 않는다
+LOCAL_MAX_SNAP_M = float(os.getenv("LOCAL_MAX_SNAP_M", "500"))
+
+# 좌표 → 노드 접근 구간 속도 (km/h)
+ACCESS_SPEED_KMPH = {"driving": 15.0, "walking": 4.5, "bicycling": 4.5}
+
+# load_local_graph() 로 로드한 그래프 (이름 → CSRGraph)
+_GRAPHS: Dict[str, CSRGraph] = {}
+
+
+def load_local_graph(name: str, snapshot_dir: Any) -> Optional[CSRGraph]:
+    """
+    build_seoul_graph.py 가 만든 <mode>_csr 스냅샷을 mmap 으로 열고
+    스냅퍼 + (있으면) Contraction Hierarchy 를 name 으로 등록한다.
+    스냅샷이 없으면 None (해당 이동수단 로컬 추정은 꺼진 상태로 동작).
+    """
+    if not snapshot_exists(snapshot_dir):
+        log.warning("[LOCAL_ROUTING] %s: snapshot not found at %s", name, snapshot_dir)
+        return None
+
+    graph = load_snapshot(snapshot_dir, mmap=True)
+    register_snapper(name, graph)
+    ch = load_hierarchy(snapshot_dir, "travel_time")
+    if ch is not None:
+        register_hierarchy(name, ch)
+    else:
+        log.warning(
+            "[LOCAL_ROUTING] %s: no contraction hierarchy in %s, local estimates disabled",
+            name,
+            snapshot_dir,
+        )
+    _GRAPHS[name] = graph
+    log.info(
+        "[LOCAL_ROUTING] %s graph loaded (nodes=%d, edges=%d, version=%s)",
+        name,
+        graph.n_nodes,
+        graph.n_edges,
+        graph.graph_version,
+    )
+    return graph
+
+
+def get_local_graph(name: str) -> Optional[CSRGraph]:
+    return _GRAPHS.get(name)
+
+
+def _split_cost(ch: Any, cost: Any, aux: Any) -> Tuple[Any, Any]:
+    """CH (주 weight, 보조 weight) → (초, m). travel_time 기준 CH 면 보조 weight 가 length."""
+    if ch.weight == "travel_time":
+        return cost, aux
+    return aux, cost
+
+
+def local_travel_time(
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str = "driving",
+) -> Optional[Dict[str, Any]]:
+    """
+    get_travel_time() 과 같은 모양의 dict 또는 None.
+        {"duration_seconds", "distance_meters", "mode", "success",
+         "is_estimated": True, "source": "local_graph"}
+    """
+    graph = LOCAL_GRAPH_FOR_MODE.get(mode)
+    if graph is None:
+        return None
+    ch = get_hierarchy(graph)
+    snapper = get_snapper(graph)
+    if ch is None or snapper is None:
+        return None
+
+    nodes, snap_m = snapper.nearest_with_distance(
+        [(start_lng, start_lat), (goal_lng, goal_lat)]
+    )
+    if len(nodes) != 2 or max(snap_m) > LOCAL_MAX_SNAP_M:
+        return None
+
+    try:
+        cost, length = ch.query_nodes(nodes[0], nodes[1])
+    except KeyError:
+        # 스냅퍼와 CH 가 서로 다른 그래프에서 만들어진 경우
+        log.warning("[LOCAL_ROUTING] %s: snapped node not in hierarchy", graph)
+        return None
+    if not math.isfinite(cost):
+        return None
+
+    access_m = float(snap_m[0] + snap_m[1])
+    access_s = access_m / (ACCESS_SPEED_KMPH.get(mode, 4.5) / 3.6)
+    duration_s, distance_m = _split_cost(ch, cost, length)
+
+    return {
+        "duration_seconds": int(round(duration_s + access_s)),
+        "distance_meters": int(round(distance_m + access_m)),
+        "mode": mode,
+        "success": True,
+        "is_estimated": True,
+        "source": "local_graph",
+    }
+
+
+def local_travel_matrix(
+    origins: Sequence[Tuple[float, float]],       # [(lat, lng), ...]
+    destinations: Sequence[Tuple[float, float]],  # [(lat, lng), ...]
+    mode: str = "driving",
+) -> Optional[Dict[str, Any]]:
+    """
+    origins × destinations 이동시간/거리 행렬.
+
+    반환 (그래프/CH 가 없으면 None):
+        {
+            "durations_seconds": [[int | None, ...], ...],  # N×M
+            "distances_meters":  [[int | None, ...], ...],
+            "mode": str, "is_estimated": True, "source": "local_graph",
+        }
+    스냅 거리가 LOCAL_MAX_SNAP_M 보다 먼 지점의 행/열과 경로가 없는 쌍은 None.
+    """
+    graph = LOCAL_GRAPH_FOR_MODE.get(mode)
+    if graph is None:
+        return None
+    ch = get_hierarchy(graph)
+    snapper = get_snapper(graph)
+    if ch is None or snapper is None:
+        return None
+
+    n_src = len(origins)
+    points = [(lng, lat) for lat, lng in origins] + [(lng, lat) for lat, lng in destinations]
+    nodes, snap_m = snapper.nearest_with_distance(points)
+    try:
+        idx = [ch.index_of(nid) for nid in nodes]
+    except KeyError:
+        log.warning("[LOCAL_ROUTING] %s: snapped node not in hierarchy", graph)
+        return None
+
+    snap = np.asarray(snap_m, dtype=np.float64).reshape(-1)
+    cost, aux = ch.many_to_many(idx[:n_src], idx[n_src:])
+    duration_s, distance_m = _split_cost(ch, cost, aux)
+
+    # 좌표 → 노드 접근 구간 (출발 + 도착)
+    access_m = snap[:n_src, None] + snap[None, n_src:]
+    access_s = access_m / (ACCESS_SPEED_KMPH.get(mode, 4.5) / 3.6)
+    duration_s = duration_s + access_s
+    distance_m = distance_m + access_m
+
+    ok = np.isfinite(duration_s)
+    ok &= (snap[:n_src, None] <= LOCAL_MAX_SNAP_M) & (snap[None, n_src:] <= LOCAL_MAX_SNAP_M)
+
+    def _to_rows(values: np.ndarray) -> List[List[Optional[int]]]:
+        rounded = np.rint(np.where(ok, values, 0.0)).astype(np.int64).tolist()
+        mask = ok.tolist()
+        return [
+            [v if m else None for v, m in zip(row, mask_row)]
+            for row, mask_row in zip(rounded, mask)
+        ]
+
+    return {
+        "durations_seconds": _to_rows(duration_s),
+        "distances_meters": _to_rows(distance_m),
+        "mode": mode,
+        "is_estimated": True,
+        "source": "local_graph",
+    }
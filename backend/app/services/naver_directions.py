@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from typing import Any, Dict, Optional, Literal, List
+import asyncio
 import httpx
 import logging
 from pathlib import Path
@@ -18,12 +19,18 @@ except Exception:
     pass
 
 log = logging.getLogger(__name__)
-# Google Distance Matrix (교통 반영)
+# Google Distance Matrix (교통 반영, async 버전 — 이벤트 루프를 막지 않음)
 try:
-    from ..services.google_distance_matrix import get_travel_time_single as _gdm_single
+    from ..services.google_distance_matrix import get_travel_time_single_async as _gdm_single
 except Exception:
     _gdm_single = None
 
+from .local_routing import local_travel_time
+from .transit_network import get_transit_network
+from .http_clients import get_async_client
+from .speed_profile import record_observation_later
+from .travel_time_cache import TRAVEL_TIME_CACHE
+
 # 정확한(실시간) 값만 허용할지 여부
 # - 기본값: 정확값만 (추정치 금지)
 # - 필요 시 서버 env로 ALLOW_ESTIMATED_TRAVEL_TIME=true 설정
@@ -31,6 +38,13 @@ ALLOW_ESTIMATED_TRAVEL_TIME = os.getenv(
     "ALLOW_ESTIMATED_TRAVEL_TIME", ""
 ).strip().lower() in {"1", "true", "yes", "y"}
 
+# 로컬 도로 그래프(Contraction Hierarchy) 추정치를 외부 API 보다 먼저 쓸지 여부
+# - 기본값: 외부 API 우선, 실패 시 ALLOW_ESTIMATED_TRAVEL_TIME 일 때만 로컬 추정
+# - LOCAL_TRAVEL_TIME_FIRST=true 면 driving/walking/transit 은 로컬 추정이 되면 API 를 부르지 않는다
+LOCAL_TRAVEL_TIME_FIRST = os.getenv(
+    "LOCAL_TRAVEL_TIME_FIRST", ""
+).strip().lower() in {"1", "true", "yes", "y"}
+
 
 # 네이버 Directions API 엔드포인트
 # 공식 문서: https://maps.apigw.ntruss.com/map-direction/v1/driving
@@ -122,6 +136,56 @@ def _fail_unavailable(mode: str) -> Dict[str, Any]:
     return {"success": False, "mode": mode, "error": "travel_time_unavailable"}
 
 
+def _local_estimate(
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str,
+) -> Optional[Dict[str, Any]]:
+    """로컬 추정 (driving/walking: 도로 그래프, transit: 지하철 네트워크). 불가하면 None."""
+    if mode == "transit":
+        net = get_transit_network()
+        if net is None:
+            return None
+        return net.travel_time(start_lat, start_lng, goal_lat, goal_lng)
+    return local_travel_time(start_lat, start_lng, goal_lat, goal_lng, mode=mode)
+
+
+def _local_or_fail(
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str,
+) -> Dict[str, Any]:
+    """외부 API 실패 시: 추정치가 허용되면 로컬 추정, 아니면 계산 실패."""
+    if ALLOW_ESTIMATED_TRAVEL_TIME:
+        local = _local_estimate(start_lat, start_lng, goal_lat, goal_lng, mode)
+        if local is not None:
+            return local
+    return _fail_unavailable(mode)
+
+
+def _record_traffic_observation(
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    duration_seconds: float,
+) -> None:
+    """
+    실시간 교통 반영 자동차 소요시간 vs 로컬 자유 흐름 추정 → 시간대 속도 계수 보정용 관측.
+    로컬 경로 탐색은 이벤트 루프를 막으므로 관측 전용 스레드에서 하고 결과를 기다리지 않는다.
+    """
+
+    def _freeflow() -> Optional[float]:
+        free = local_travel_time(start_lat, start_lng, goal_lat, goal_lng, mode="driving")
+        return None if free is None else float(free["duration_seconds"])
+
+    record_observation_later(_freeflow, duration_seconds)
+
+
 async def _call_openrouteservice(
     start_lat: float,
     start_lng: float,
@@ -163,39 +227,39 @@ async def _call_openrouteservice(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(url, headers=headers, json=body)
-            response.raise_for_status()
-            data = response.json()
-
-            routes = data.get("routes", [])
-            if not routes:
-                log.warning("[ORS] No routes returned")
-                return None
+        client = get_async_client(url)
+        response = await client.post(url, headers=headers, json=body, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
+
+        routes = data.get("routes", [])
+        if not routes:
+            log.warning("[ORS] No routes returned")
+            return None
 
-            route = routes[0]
-            summary = route.get("summary", {})
-            duration_s = summary.get("duration")
-            distance_m = summary.get("distance")
+        route = routes[0]
+        summary = route.get("summary", {})
+        duration_s = summary.get("duration")
+        distance_m = summary.get("distance")
 
-            if duration_s is None:
-                log.warning("[ORS] Duration not found in response")
-                return None
+        if duration_s is None:
+            log.warning("[ORS] Duration not found in response")
+            return None
 
-            log.info(
-                "[ORS] ✓ Success for mode=%s | duration=%.1fs, distance=%.1fm",
-                mode,
-                duration_s,
-                distance_m or 0,
-            )
+        log.info(
+            "[ORS] ✓ Success for mode=%s | duration=%.1fs, distance=%.1fm",
+            mode,
+            duration_s,
+            distance_m or 0,
+        )
 
-            return {
-                "duration_seconds": int(duration_s),
-                "distance_meters": int(distance_m) if distance_m else None,
-                "mode": mode,
-                "success": True,
-                "source": "openrouteservice",
-            }
+        return {
+            "duration_seconds": int(duration_s),
+            "distance_meters": int(distance_m) if distance_m else None,
+            "mode": mode,
+            "success": True,
+            "source": "openrouteservice",
+        }
 
     except httpx.HTTPStatusError as e:
         body_text = None
@@ -298,65 +362,65 @@ async def get_driving_direction(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                NAVER_DRIVING_URL, headers=headers, params=params
-            )
+        client = get_async_client(NAVER_DRIVING_URL)
+        response = await client.get(
+            NAVER_DRIVING_URL, headers=headers, params=params, timeout=10.0
+        )
+
+        # 401 에러도 응답 본문을 확인하기 위해 raise_for_status 전에 처리
+        if response.status_code == 401:
+            try:
+                error_body = response.json()
+                log.error(
+                    "[NAVER Directions] [DRIVING API] 401 Authentication Failed | body=%s",
+                    str(error_body)[:500],
+                )
+            except Exception:
+                log.error(
+                    "[NAVER Directions] [DRIVING API] 401 Authentication Failed | body=%s",
+                    response.text[:500],
+                )
 
-            # 401 에러도 응답 본문을 확인하기 위해 raise_for_status 전에 처리
-            if response.status_code == 401:
-                try:
-                    error_body = response.json()
-                    log.error(
-                        "[NAVER Directions] [DRIVING API] 401 Authentication Failed | body=%s",
-                        str(error_body)[:500],
-                    )
-                except Exception:
-                    log.error(
-                        "[NAVER Directions] [DRIVING API] 401 Authentication Failed | body=%s",
-                        response.text[:500],
-                    )
-
-            # 네이버 API는 인증 실패 시 HTTP 200으로 응답하지만 본문에 error 객체를 포함
-            data = response.json()
+        # 네이버 API는 인증 실패 시 HTTP 200으로 응답하지만 본문에 error 객체를 포함
+        data = response.json()
             
-            # 인증 실패 체크 (errorCode: 200, message: "Authentication Failed")
-            if "error" in data:
-                error_info = data.get("error", {})
-                error_code = error_info.get("errorCode")
-                error_message = error_info.get("message", "")
+        # 인증 실패 체크 (errorCode: 200, message: "Authentication Failed")
+        if "error" in data:
+            error_info = data.get("error", {})
+            error_code = error_info.get("errorCode")
+            error_message = error_info.get("message", "")
                 
-                if error_code == "200" or "Authentication Failed" in error_message:
-                    log.error(
-                        "[NAVER Directions] [DRIVING API] ✗ Authentication Failed | "
-                        "errorCode=%s, message=%s, details=%s | "
-                        "해결 방법: 네이버 클라우드 플랫폼 콘솔에서 Application에 'Directions 5' 또는 'Directions 15' 서비스를 등록했는지 확인하세요. "
-                        "또한 API 키가 Directions API용인지 확인하세요.",
-                        error_code,
-                        error_message,
-                        error_info.get("details", ""),
-                    )
-                    return None
-                else:
-                    log.error(
-                        "[NAVER Directions] [DRIVING API] ✗ API error: errorCode=%s, message=%s, details=%s",
-                        error_code,
-                        error_message,
-                        error_info.get("details", ""),
-                    )
-                    return None
-
-            response.raise_for_status()
-
-            if data.get("code") != 0:
+            if error_code == "200" or "Authentication Failed" in error_message:
+                log.error(
+                    "[NAVER Directions] [DRIVING API] ✗ Authentication Failed | "
+                    "errorCode=%s, message=%s, details=%s | "
+                    "해결 방법: 네이버 클라우드 플랫폼 콘솔에서 Application에 'Directions 5' 또는 'Directions 15' 서비스를 등록했는지 확인하세요. "
+                    "또한 API 키가 Directions API용인지 확인하세요.",
+                    error_code,
+                    error_message,
+                    error_info.get("details", ""),
+                )
+                return None
+            else:
                 log.error(
-                    "[NAVER Directions] [DRIVING API] ✗ API error: code=%s, message=%s",
-                    data.get("code"),
-                    data.get("message"),
+                    "[NAVER Directions] [DRIVING API] ✗ API error: errorCode=%s, message=%s, details=%s",
+                    error_code,
+                    error_message,
+                    error_info.get("details", ""),
                 )
                 return None
 
-            return data
+        response.raise_for_status()
+
+        if data.get("code") != 0:
+            log.error(
+                "[NAVER Directions] [DRIVING API] ✗ API error: code=%s, message=%s",
+                data.get("code"),
+                data.get("message"),
+            )
+            return None
+
+        return data
 
     except httpx.HTTPStatusError as e:
         body = None
@@ -439,49 +503,49 @@ async def get_walking_direction(
     }
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(
-                NAVER_WALKING_URL, headers=headers, params=params
-            )
+        client = get_async_client(NAVER_WALKING_URL)
+        response = await client.get(
+            NAVER_WALKING_URL, headers=headers, params=params, timeout=10.0
+        )
             
-            # 네이버 API는 인증 실패 시 HTTP 200으로 응답하지만 본문에 error 객체를 포함
-            data = response.json()
+        # 네이버 API는 인증 실패 시 HTTP 200으로 응답하지만 본문에 error 객체를 포함
+        data = response.json()
             
-            # 인증 실패 체크 (errorCode: 200, message: "Authentication Failed")
-            if "error" in data:
-                error_info = data.get("error", {})
-                error_code = error_info.get("errorCode")
-                error_message = error_info.get("message", "")
+        # 인증 실패 체크 (errorCode: 200, message: "Authentication Failed")
+        if "error" in data:
+            error_info = data.get("error", {})
+            error_code = error_info.get("errorCode")
+            error_message = error_info.get("message", "")
                 
-                if error_code == "200" or "Authentication Failed" in error_message:
-                    log.error(
-                        "[NAVER Directions] [WALKING API] ✗ Authentication Failed | "
-                        "errorCode=%s, message=%s, details=%s | "
-                        "해결 방법: 네이버 클라우드 플랫폼 콘솔에서 Application에 'Directions 5' 또는 'Directions 15' 서비스를 등록했는지 확인하세요.",
-                        error_code,
-                        error_message,
-                        error_info.get("details", ""),
-                    )
-                    return None
-                else:
-                    log.error(
-                        "[NAVER Directions] [WALKING API] ✗ API error: errorCode=%s, message=%s",
-                        error_code,
-                        error_message,
-                    )
-                    return None
-
-            response.raise_for_status()
-
-            if data.get("code") != 0:
-                log.warning(
-                    "[NAVER Directions] API returned error code=%s, message=%s",
-                    data.get("code"),
-                    data.get("message"),
+            if error_code == "200" or "Authentication Failed" in error_message:
+                log.error(
+                    "[NAVER Directions] [WALKING API] ✗ Authentication Failed | "
+                    "errorCode=%s, message=%s, details=%s | "
+                    "해결 방법: 네이버 클라우드 플랫폼 콘솔에서 Application에 'Directions 5' 또는 'Directions 15' 서비스를 등록했는지 확인하세요.",
+                    error_code,
+                    error_message,
+                    error_info.get("details", ""),
+                )
+                return None
+            else:
+                log.error(
+                    "[NAVER Directions] [WALKING API] ✗ API error: errorCode=%s, message=%s",
+                    error_code,
+                    error_message,
                 )
                 return None
 
-            return data
+        response.raise_for_status()
+
+        if data.get("code") != 0:
+            log.warning(
+                "[NAVER Directions] API returned error code=%s, message=%s",
+                data.get("code"),
+                data.get("message"),
+            )
+            return None
+
+        return data
 
     except httpx.HTTPStatusError as e:
         body = None
@@ -661,6 +725,41 @@ def extract_route_path_from_walking_response(
     return _extract_route_path_points(data, preferred_key="traoptimal")
 
 
+def travel_time_without_api(
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str,
+) -> Optional[Dict[str, Any]]:
+    """
+    외부 API 없이 답할 수 있으면 결과 (LOCAL_TRAVEL_TIME_FIRST 로컬 추정 / Naver 실측값 캐시), 아니면 None.
+    호출 한도(rate_limiter)를 잡기 전에 먼저 불러서, 캐시 hit 이 한도 슬롯을 쓰지 않게 한다.
+    """
+    if LOCAL_TRAVEL_TIME_FIRST and mode in ("driving", "walking", "transit"):
+        local = _local_estimate(start_lat, start_lng, goal_lat, goal_lng, mode)
+        if local is not None:
+            return local
+
+    # Naver 실측값 캐시 (transit 은 Google 쪽에서 캐시)
+    if mode in ("driving", "walking"):
+        return TRAVEL_TIME_CACHE.get("naver", mode, start_lat, start_lng, goal_lat, goal_lng)
+    return None
+
+
+async def travel_time_without_api_async(
+    start_lat: float,
+    start_lng: float,
+    goal_lat: float,
+    goal_lng: float,
+    mode: str,
+) -> Optional[Dict[str, Any]]:
+    """travel_time_without_api 의 async 버전 (로컬 그래프 추정 / SQLite 캐시 조회를 이벤트 루프 밖 스레드에서)."""
+    return await asyncio.to_thread(
+        travel_time_without_api, start_lat, start_lng, goal_lat, goal_lng, mode
+    )
+
+
 async def get_travel_time(
     start_lat: float,
     start_lng: float,
@@ -668,6 +767,7 @@ async def get_travel_time(
     goal_lng: float,
     mode: Literal["driving", "transit", "walking"] = "driving",
     driving_option: str = "trafast",
+    check_cache: bool = True,
 ) -> Optional[Dict[str, Any]]:
     """
     출발지와 도착지 간의 이동 시간 계산 (통합 함수)
@@ -679,6 +779,7 @@ async def get_travel_time(
         goal_lng: 도착지 경도
         mode: 이동 수단 (driving, transit)
         driving_option: 자동차 경로 옵션 (trafast, tracomfort, traoptimal)
+        check_cache: False 면 travel_time_without_api(_async) 를 이미 확인한 것으로 보고 건너뛴다
 
     Returns:
         {
@@ -688,14 +789,19 @@ async def get_travel_time(
             "success": bool,          # 성공 여부
         } 또는 None
     """
+    if check_cache:
+        hit = await travel_time_without_api_async(start_lat, start_lng, goal_lat, goal_lng, mode)
+        if hit is not None:
+            return hit
+
     if mode == "driving":
         # 자동차: Naver Directions API만 사용
         data = await get_driving_direction(
             start_lat, start_lng, goal_lat, goal_lng, option=driving_option
         )
         if not data:
-            # Naver API 실패 시 계산 실패 반환
-            return _fail_unavailable("driving")
+            # Naver API 실패 시 계산 실패 반환 (추정 허용 시 로컬 그래프)
+            return _local_or_fail(start_lat, start_lng, goal_lat, goal_lng, "driving")
 
         duration = extract_travel_time_from_driving_response(
             data, option=driving_option
@@ -707,6 +813,8 @@ async def get_travel_time(
             )
             return _fail_unavailable("driving")
 
+        _record_traffic_observation(start_lat, start_lng, goal_lat, goal_lng, duration)
+
         # 거리 정보 추출 (선택적)
         distance = None
         try:
@@ -721,7 +829,7 @@ async def get_travel_time(
         except (KeyError, ValueError, TypeError):
             pass
 
-        return {
+        result = {
             "duration_seconds": duration,
             "distance_meters": distance,
             "mode": "driving",
@@ -729,6 +837,8 @@ async def get_travel_time(
             "is_estimated": False,
             "source": "naver_directions",
         }
+        TRAVEL_TIME_CACHE.put("naver", "driving", start_lat, start_lng, goal_lat, goal_lng, result)
+        return result
 
     elif mode == "walking":
         # 도보: Naver Directions API 사용
@@ -739,7 +849,7 @@ async def get_travel_time(
             log.error(
                 "[TRAVEL_TIME] [WALKING] ✗ Naver Directions API returned None"
             )
-            return _fail_unavailable("walking")
+            return _local_or_fail(start_lat, start_lng, goal_lat, goal_lng, "walking")
 
         duration = extract_travel_time_from_walking_response(data)
         if duration is None:
@@ -759,7 +869,7 @@ async def get_travel_time(
         except (KeyError, ValueError, TypeError):
             pass
 
-        return {
+        result = {
             "duration_seconds": duration,
             "distance_meters": distance,
             "mode": "walking",
@@ -767,6 +877,8 @@ async def get_travel_time(
             "is_estimated": False,
             "source": "naver_directions",
         }
+        TRAVEL_TIME_CACHE.put("naver", "walking", start_lat, start_lng, goal_lat, goal_lng, result)
+        return result
 
     elif mode == "transit":
         log.info(
@@ -779,7 +891,7 @@ async def get_travel_time(
 
         # 대중교통: Google transit만 사용
         if _gdm_single is not None:
-            g = _gdm_single(
+            g = await _gdm_single(
                 start_lat=start_lat,
                 start_lng=start_lng,
                 goal_lat=goal_lat,
@@ -805,7 +917,7 @@ async def get_travel_time(
                 "[TRAVEL_TIME] [TRANSIT] ✗ Google Distance Matrix not available"
             )
 
-        return _fail_unavailable("transit")
+        return _local_or_fail(start_lat, start_lng, goal_lat, goal_lng, "transit")
 
     else:
         log.warning("[NAVER Directions] Unknown mode: %s", mode)
@@ -0,0 +1,165 @@
+# app/services/node_snapper.py
+"""
+좌표 → 그래프 노드 스냅 서비스.
+
+- ox.distance.nearest_nodes 는 비투영(위경도) 그래프에서 호출할 때마다
+  전체 노드로 BallTree 를 새로 만든다 (요청당 수백 ms).
+- 여기서는 그래프 로드 시 1번만 노드 좌표를 로컬 평면(m 단위, 등장방형 투영)으로
+  바꿔 KD-tree 를 만들어 두고, 이후에는 트리 조회만 한다.
+- 서울 정도 범위(수십 km)에서는 등장방형 투영 오차가 무시할 만하다.
+
+사용:
+    register_snapper("drive", G)              # 그래프 로드 시 1회
+    get_snapper("drive").nearest_many(coords) # [(lon, lat), ...] → [node_id, ...]
+"""
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from scipy.spatial import cKDTree
+except ImportError:  # scipy 가 없으면 numpy 전수 비교로 동작 (느리지만 결과 동일)
+    cKDTree = None
+
+log = logging.getLogger(__name__)
+
+EARTH_RADIUS_M = 6371000.0
+
+
+class NodeSnapper:
+    """노드 좌표 KD-tree. 모든 거리는 미터 단위."""
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        lon: np.ndarray,
+        lat: np.ndarray,
+    ) -> None:
+        self.node_ids = np.asarray(node_ids, dtype=np.int64)
+        lon = np.asarray(lon, dtype=np.float64)
+        lat = np.asarray(lat, dtype=np.float64)
+
+        # 투영 기준점: 노드 좌표 중앙
+        self.lon0 = float(np.mean(lon)) if lon.size else 0.0
+        self.lat0 = float(np.mean(lat)) if lat.size else 0.0
+        self._kx = EARTH_RADIUS_M * math.cos(math.radians(self.lat0)) * math.pi / 180.0
+        self._ky = EARTH_RADIUS_M * math.pi / 180.0
+
+        self._xy = self._project(lon, lat)
+        self._tree = cKDTree(self._xy) if cKDTree is not None else None
+
+    @classmethod
+    def from_graph(cls, G: Any) -> "NodeSnapper":
+        """CSRGraph(node_ids/x/y 배열) 또는 networkx 그래프에서 생성."""
+        if hasattr(G, "node_ids") and hasattr(G, "x") and hasattr(G, "y"):
+            return cls(G.node_ids, G.x, G.y)
+
+        ids = list(G.nodes)
+        lon = [float(G.nodes[n]["x"]) for n in ids]
+        lat = [float(G.nodes[n]["y"]) for n in ids]
+        return cls(np.asarray(ids, dtype=np.int64), np.asarray(lon), np.asarray(lat))
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.node_ids.shape[0])
+
+    def _project(self, lon: np.ndarray, lat: np.ndarray) -> np.ndarray:
+        x = (np.asarray(lon, dtype=np.float64) - self.lon0) * self._kx
+        y = (np.asarray(lat, dtype=np.float64) - self.lat0) * self._ky
+        return np.column_stack([x, y])
+
+    def _query(self, xy: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self._tree is not None:
+            dist, idx = self._tree.query(xy, k=1)
+            return np.asarray(dist, dtype=np.float64), np.asarray(idx, dtype=np.int64)
+
+        dist = np.empty(len(xy), dtype=np.float64)
+        idx = np.empty(len(xy), dtype=np.int64)
+        for i, (px, py) in enumerate(xy):
+            d2 = (self._xy[:, 0] - px) ** 2 + (self._xy[:, 1] - py) ** 2
+            j = int(np.argmin(d2))
+            idx[i] = j
+            dist[i] = math.sqrt(float(d2[j]))
+        return dist, idx
+
+    def nearest_with_distance(
+        self,
+        coords: Sequence[Tuple[float, float]],  # [(lon, lat), ...]
+    ) -> Tuple[List[int], List[float]]:
+        """(lon, lat) 목록 → (노드 id 목록, 스냅 거리[m] 목록)."""
+        if not coords or self.n_nodes == 0:
+            return [], []
+        arr = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        dist, idx = self._query(self._project(arr[:, 0], arr[:, 1]))
+        return self.node_ids[idx].tolist(), dist.tolist()
+
+    def nearest_index(self, lon: Any, lat: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """경도/위도 배열 → (가장 가까운 노드의 내부 인덱스 배열, 거리[m] 배열)."""
+        if self.n_nodes == 0:
+            raise ValueError("NodeSnapper has no nodes")
+        dist, idx = self._query(self._project(np.atleast_1d(lon), np.atleast_1d(lat)))
+        return idx, dist
+
+    def nearest_many(self, coords: Sequence[Tuple[float, float]]) -> List[int]:
+        """(lon, lat) 목록 → 가장 가까운 노드 id 목록."""
+        return self.nearest_with_distance(coords)[0]
+
+    def nearest(self, lon: float, lat: float) -> int:
+        return self.nearest_many([(lon, lat)])[0]
+
+    def within_index(
+        self, lon: float, lat: float, radius_m: float
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """(lon, lat) 반경 radius_m 안의 노드 (내부 인덱스 배열, 거리[m] 배열)."""
+        if self.n_nodes == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+        p = self._project(np.array([lon]), np.array([lat]))[0]
+        if self._tree is not None:
+            idx = np.asarray(self._tree.query_ball_point(p, r=float(radius_m)), dtype=np.int64)
+        else:
+            d2 = (self._xy[:, 0] - p[0]) ** 2 + (self._xy[:, 1] - p[1]) ** 2
+            idx = np.flatnonzero(d2 <= float(radius_m) ** 2)
+        dist = np.hypot(self._xy[idx, 0] - p[0], self._xy[idx, 1] - p[1])
+        return idx, dist
+
+    def within(self, lon: float, lat: float, radius_m: float) -> List[int]:
+        """(lon, lat) 반경 radius_m 안의 노드 id 목록."""
+        idx, _ = self.within_index(lon, lat, radius_m)
+        return self.node_ids[idx].tolist()
+
+
+# 그래프 이름("drive", "walk", ...) → NodeSnapper
+_SNAPPERS: Dict[str, NodeSnapper] = {}
+
+
+def register_snapper(name: str, G: Any) -> NodeSnapper:
+    """그래프를 로드한 쪽에서 1회 호출. 같은 이름이면 교체한다."""
+    snapper = NodeSnapper.from_graph(G)
+    _SNAPPERS[name] = snapper
+    log.info(
+        "[SNAP] %s: %d nodes indexed (%s)",
+        name,
+        snapper.n_nodes,
+        "cKDTree" if snapper._tree is not None else "numpy",
+    )
+    return snapper
+
+
+def get_snapper(name: str = "drive") -> Optional[NodeSnapper]:
+    """등록된 스냅퍼 반환 (아직 그래프가 로드되지 않았으면 None)."""
+    return _SNAPPERS.get(name)
+
+
+def snap_to_nodes(
+    coords: Sequence[Tuple[float, float]],  # [(lon, lat), ...]
+    graph: str = "drive",
+) -> List[int]:
+    """등록된 그래프 기준으로 (lon, lat) → 노드 id. 그래프가 없으면 RuntimeError."""
+    snapper = _SNAPPERS.get(graph)
+    if snapper is None:
+        raise RuntimeError(f"Graph {graph!r} is not loaded (register_snapper 먼저 호출)")
+    return snapper.nearest_many(coords)
@@ -0,0 +1,356 @@
+# app/services/origin_cache.py
+"""
+출발지(origin)별 최단거리 배열 캐시.
+
+- 모임에 참가자가 한 명 추가/삭제되면 나머지 참가자의 출발 노드는 그대로인데,
+  예전에는 모든 참가자의 Dijkstra 를 다시 돌렸다.
+- 여기서는 (meeting_id, participant_id, 이동수단, 스냅 노드, weight, graph_version)
+  → 거리 배열(노드 인덱스 순서) 을 메모리에 보관해서 바뀐 출발지만 새로 탐색하게 한다.
+- 배열 하나가 노드 수 × 8 byte 라서 개수가 아니라 총 바이트 수로 LRU 제한을 건다.
+- 탐색 반경(cutoff)이 있는 배열은 "그 cutoff 이하 요청" 에만 쓸 수 있다.
+  더 작은 cutoff 요청에는 cutoff 밖 값을 inf 로 잘라서 돌려준다
+  (cutoff Dijkstra 결과와 정확히 같다).
+
+디스크 캐시 (DiskSPTStore)
+- 큰 역/대학/업무지구처럼 여러 모임에서 반복해서 쓰이는 출발 노드는
+  모임이 달라도 같은 최단거리 트리를 매번 다시 계산한다.
+- 여러 번(SPT_CACHE_MIN_REQUESTS) 요청된 노드는 전체 트리를 uint16 으로 양자화해
+  SPT_CACHE_DIR/<graph_version>/<weight>_<node_id>.v<SPT_FILE_FORMAT>.npy 로 저장하고 mmap 으로 읽는다.
+    * length      : 2 m 단위 내림 (최대 약 131 km, 실제보다 0~2 m 짧게)
+    * travel_time : 1 초 단위 내림 (최대 약 18 시간, 실제보다 0~1 초 짧게)
+    * 65535 = 도달 불가
+    * 내림이라 cutoff 로 자를 때 정확한 탐색이 남기는 노드는 디스크 결과에서도 항상 남는다.
+- 총 파일 크기(SPT_CACHE_MAX_MB) 제한은 여러 워커 프로세스가 함께 지킨다:
+  저장할 때마다 파일 lock 을 잡고 디렉토리를 훑어(파일 크기 / mtime = 마지막 사용) 오래된 것부터 지운다.
+- 이전 그래프 버전 디렉토리는 서버가 지우지 않는다 (아직 옛 그래프로 떠 있는 워커가 쓰는 중일 수 있음).
+  build_seoul_graph.py 가 새 스냅샷을 만든 뒤 prune_versions() 로 정리한다.
+"""
+from __future__ import annotations
+
+import os
+import shutil
+import threading
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 lock 없이 동작 (한도를 잠깐 넘을 수 있음)
+    fcntl = None
+
+ORIGIN_CACHE_MAX_MB = float(os.getenv("ORIGIN_CACHE_MAX_MB", "256"))
+# cutoff 탐색 결과를 저장할 때 요청보다 얼마나 넓게 탐색해 둘지
+# (참가자가 추가되어 탐색 반경이 조금 커져도 캐시를 재사용하기 위함)
+ORIGIN_CACHE_CUTOFF_SLACK = float(os.getenv("ORIGIN_CACHE_CUTOFF_SLACK", "2.0"))
+
+
+def covers(stored_cutoff: Optional[float], wanted_cutoff: Optional[float]) -> bool:
+    """stored_cutoff 로 탐색한 배열로 wanted_cutoff 요청에 답할 수 있는지."""
+    if stored_cutoff is None:
+        return True
+    if wanted_cutoff is None:
+        return False
+    return wanted_cutoff <= stored_cutoff
+
+
+def truncate(dist: np.ndarray, cutoff: Optional[float]) -> np.ndarray:
+    """cutoff 보다 먼 노드를 inf 로 (cutoff 가 None 이면 그대로)."""
+    if cutoff is None:
+        return dist
+    return np.where(dist <= cutoff, dist, np.inf)
+
+
+class DistanceArrayCache:
+    """총 바이트 수 기준 LRU. 값은 (탐색 cutoff, 읽기 전용 거리 배열)."""
+
+    def __init__(self, max_bytes: int, name: str = "origin_distances") -> None:
+        self.max_bytes = max(0, int(max_bytes))
+        self.name = name
+        self._data: "OrderedDict[Hashable, Tuple[Optional[float], np.ndarray]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self, key: Hashable, cutoff: Optional[float] = None
+    ) -> Optional[np.ndarray]:
+        """cutoff 요청에 쓸 수 있는 배열이 있으면 (잘라서) 반환, 없으면 None."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None or not covers(item[0], cutoff):
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            dist = item[1]
+        return truncate(dist, cutoff)
+
+    def set(self, key: Hashable, dist: np.ndarray, cutoff: Optional[float]) -> None:
+        dist = np.asarray(dist)
+        size = int(dist.nbytes)
+        if size > self.max_bytes:
+            return
+        dist.flags.writeable = False
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= int(old[1].nbytes)
+            self._data[key] = (cutoff, dist)
+            self._bytes += size
+            while self._bytes > self.max_bytes and self._data:
+                _, (_, evicted) = self._data.popitem(last=False)
+                self._bytes -= int(evicted.nbytes)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "evictions": self.evictions,
+            }
+
+
+ORIGIN_DISTANCE_CACHE = DistanceArrayCache(int(ORIGIN_CACHE_MAX_MB * 1024 * 1024))
+
+
+# ----------------------------------------------------------------------
+# 디스크 캐시 (인기 출발 노드의 전체 최단거리 트리)
+# ----------------------------------------------------------------------
+SPT_CACHE_DIR = Path(
+    os.getenv(
+        "SPT_CACHE_DIR",
+        str(Path(__file__).resolve().parents[2] / "seoul_graph_out" / "spt_cache"),
+    )
+)
+SPT_CACHE_MAX_MB = float(os.getenv("SPT_CACHE_MAX_MB", "1024"))  # 0 이면 사용 안 함
+SPT_CACHE_MIN_REQUESTS = int(os.getenv("SPT_CACHE_MIN_REQUESTS", "2"))
+
+# weight 별 양자화 단위 (uint16 한 칸이 몇 m / 몇 초인지)
+SPT_QUANT_SCALE = {"length": 2.0, "travel_time": 1.0}
+# 파일 이름에 넣는 양자화 방식 버전 (2: 내림. 1(반올림) 파일은 읽지 않고 용량 정리 때 지워진다)
+SPT_FILE_FORMAT = 2
+_LOCK_FILE = ".lock"
+_Q_INF = np.iinfo(np.uint16).max
+# 인기도 카운터가 끝없이 커지지 않도록 이 개수를 넘으면 초기화
+_MAX_TRACKED_ORIGINS = 100_000
+
+
+def quantize(dist: np.ndarray, scale: float) -> np.ndarray:
+    """내림 양자화 (dequantize 결과는 항상 원래 거리 이하)."""
+    q = np.full(dist.shape, _Q_INF, dtype=np.uint16)
+    units = np.floor(dist / scale)
+    ok = np.isfinite(units) & (units < _Q_INF)
+    q[ok] = units[ok].astype(np.uint16)
+    return q
+
+
+def dequantize(q: np.ndarray, scale: float) -> np.ndarray:
+    dist = q.astype(np.float64) * scale
+    dist[q == _Q_INF] = np.inf
+    return dist
+
+
+class DiskSPTStore:
+    def __init__(self, root: Path, max_bytes: int, min_requests: int) -> None:
+        self.root = Path(root)
+        self.max_bytes = max(0, int(max_bytes))
+        self.min_requests = max(1, int(min_requests))
+        self._lock = threading.Lock()
+        self._version: Optional[str] = None
+        self._dir: Optional[Path] = None
+        self._requests: Counter = Counter()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _bind(self, graph_version: str) -> Path:
+        """graph_version 디렉토리로 전환. lock 안에서 호출."""
+        if self._version == graph_version and self._dir is not None:
+            return self._dir
+
+        d = self.root / graph_version
+        d.mkdir(parents=True, exist_ok=True)
+        self._requests.clear()
+        self._version = graph_version
+        self._dir = d
+        return d
+
+    def _path(self, d: Path, weight: str, node_id: int) -> Path:
+        return d / f"{weight}_{int(node_id)}.v{SPT_FILE_FORMAT}.npy"
+
+    @contextmanager
+    def _process_lock(self) -> Iterator[None]:
+        """같은 SPT_CACHE_DIR 을 쓰는 모든 프로세스 사이의 lock (용량 정리 / 버전 정리)."""
+        if fcntl is None:
+            yield
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self.root / _LOCK_FILE, "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _scan(d: Path) -> List[Tuple[float, int, Path]]:
+        """디렉토리의 (mtime, 크기, 경로) 목록 (오래 안 쓴 것부터)."""
+        files: List[Tuple[float, int, Path]] = []
+        try:
+            entries = list(os.scandir(d))
+        except OSError:
+            return files
+        for e in entries:
+            if not e.name.endswith(".npy"):
+                continue
+            try:
+                st = e.stat()
+            except OSError:
+                continue  # 다른 프로세스가 방금 지운 파일
+            files.append((st.st_mtime, st.st_size, Path(e.path)))
+        files.sort(key=lambda f: f[0])
+        return files
+
+    def get(
+        self,
+        graph_version: str,
+        node_id: int,
+        weight: str,
+        cutoff: Optional[float] = None,
+    ) -> Optional[np.ndarray]:
+        """저장된 트리가 있으면 float64 거리 배열(cutoff 로 잘라서), 없으면 None."""
+        scale = SPT_QUANT_SCALE.get(weight)
+        if not self.enabled or scale is None:
+            return None
+        with self._lock:
+            path = self._path(self._bind(graph_version), weight, node_id)
+        try:
+            q = np.load(path, mmap_mode="r")
+            os.utime(path)  # mtime = 마지막 사용 시각 (모든 프로세스가 같은 LRU 순서를 본다)
+        except (OSError, ValueError):
+            # 없거나, 다른 프로세스가 방금 지운 경우 등
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return truncate(dequantize(np.asarray(q), scale), cutoff)
+
+    def admit(self, graph_version: str, node_id: int, weight: str) -> bool:
+        """이번 요청까지 포함해 min_requests 번 이상 요청된 출발 노드인지 (저장 대상)."""
+        if not self.enabled or weight not in SPT_QUANT_SCALE:
+            return False
+        with self._lock:
+            self._bind(graph_version)
+            if len(self._requests) > _MAX_TRACKED_ORIGINS:
+                self._requests.clear()
+            key = (weight, int(node_id))
+            self._requests[key] += 1
+            return self._requests[key] >= self.min_requests
+
+    def put(self, graph_version: str, node_id: int, weight: str, dist: np.ndarray) -> None:
+        """전체(cutoff 없는) 트리만 저장한다."""
+        scale = SPT_QUANT_SCALE.get(weight)
+        if not self.enabled or scale is None:
+            return
+        q = quantize(np.asarray(dist, dtype=np.float64), scale)
+        with self._lock:
+            d = self._bind(graph_version)
+        path = self._path(d, weight, node_id)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(tmp, "wb") as f:
+                np.save(f, q)
+            os.replace(tmp, path)  # 다른 프로세스가 반쯤 쓴 파일을 읽지 않도록
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        with self._lock:
+            self.writes += 1
+        self._enforce_limit(d)
+
+    def _enforce_limit(self, d: Path) -> None:
+        """디렉토리 전체 크기가 max_bytes 를 넘으면 mtime 이 오래된 파일부터 지운다 (프로세스 간 lock)."""
+        evicted = 0
+        with self._process_lock():
+            files = self._scan(d)
+            total = sum(size for _, size, _ in files)
+            for _, size, path in files:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                evicted += 1
+        with self._lock:
+            self.evictions += evicted
+
+    def prune_versions(self, keep: Iterable[str]) -> List[str]:
+        """
+        keep 에 없는 graph_version 디렉토리를 지운다 (build_seoul_graph.py 에서 호출).
+        서버는 지우지 않는다 — 옛 그래프로 떠 있는 워커가 아직 쓰고 있을 수 있다.
+        """
+        keep = set(keep)
+        removed: List[str] = []
+        if not self.root.exists():
+            return removed
+        with self._process_lock():
+            for child in self.root.iterdir():
+                if child.is_dir() and child.name not in keep:
+                    shutil.rmtree(child, ignore_errors=True)
+                    removed.append(child.name)
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            d = self._dir
+        if d is not None:
+            files = self._scan(d)
+            usage = (len(files), sum(size for _, size, _ in files))
+        else:
+            usage = (0, 0)
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": "spt_disk",
+                "enabled": self.enabled,
+                "dir": str(self._dir or self.root),
+                "graph_version": self._version,
+                "files": usage[0],
+                "bytes": usage[1],
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "writes": self.writes,
+                "evictions": self.evictions,
+            }
+
+
+SPT_DISK_STORE = DiskSPTStore(
+    SPT_CACHE_DIR,
+    max_bytes=int(SPT_CACHE_MAX_MB * 1024 * 1024),
+    min_requests=SPT_CACHE_MIN_REQUESTS,
+)
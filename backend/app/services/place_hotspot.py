@@ -1,6 +1,7 @@
 # app/services/place_hotspot.py
 from __future__ import annotations
 
+import os
 from collections import Counter
 from math import log1p
 from typing import Any, Dict, List, Tuple
@@ -16,6 +17,17 @@ from .google_places_services import (
     fetch_nearby_stations,
     STATION_TYPES,
 )
+from .poi_index import get_poi_index
+from .station_access import nearby_stations
+
+# 1 이면 오프라인 POI 인덱스가 있어도 항상 Google Nearby Search 로 점수 계산 (인덱스 검증/갱신용)
+PLACE_SCORE_LIVE = os.getenv("PLACE_SCORE_LIVE", "0").strip().lower() in ("1", "true", "yes")
+
+# adjust_to_busy_station_area 기본 판정값
+# (busy_score 테이블과 calc_func 의 "이미 번화한 역세권" 지름길이 같은 값을 써야 결과가 같다)
+BUSY_AREA_RADIUS_M = 400       # 번화가 판정 반경
+BUSY_AREA_MIN_SCORE = 5.0      # 번화가 유지 조건
+BUSY_AREA_MIN_POI_COUNT = 8    # POI 최소 조건
 
 
 # 번화가 판단에 포함할 카테고리
@@ -29,27 +41,44 @@ BUSY_CATEGORIES: set[PlaceCategory] = {
 }
 
 
-def score_area_with_places(
-    lat: float,
-    lng: float,
-    radius: int = 400,
-) -> Tuple[float, bool, int, Counter]:
-    """
-    특정 좌표 주변 radius(m)에 대해:
-      - 역세권 여부
-      - 번화가용 POI 개수
-      - 카테고리별 카운트
-      - 번화가 score 계산
-    """
+def _is_subway_station(st: Dict[str, Any]) -> bool:
+    """지하철/전철역인지 (로컬 지하철 데이터에서 온 역은 이름과 상관없이 역)."""
+    if st.get("source") == "local_transit":
+        return True
+    name = st.get("name") or ""
+    return any(keyword in name for keyword in ["역", "station", "Station", "지하철", "전철"])
+
+
+def busy_area_score(is_station_area: bool, category_counter: Counter) -> Tuple[float, int]:
+    """역세권 여부 + 카테고리별 개수 → (번화가 score, 번화가 POI 수)."""
+    # 번화가 POI 수
+    poi_count = sum(
+        count
+        for cat, count in category_counter.items()
+        if cat in BUSY_CATEGORIES
+    )
+
+    # 점수 계산
+    score = 0.0
+
+    # 역세권 보너스
+    if is_station_area:
+        score += 10.0
+
+    # 번화가 밀도 점수 (log 스케일)
+    score += 2.0 * log1p(poi_count)
+
+    return score, poi_count
 
+
+def _area_counts_live(lat: float, lng: float, radius: int) -> Tuple[bool, Counter]:
+    """Google Nearby Search 결과로 (역세권 여부, 카테고리별 개수)."""
     places = fetch_nearby_places(lat=lat, lng=lng, radius=radius)
-    if not places:
-        return 0.0, False, 0, Counter()
 
     is_station_area = False
     category_counter: Counter = Counter()
 
-    for p in places:
+    for p in places or []:
         types: List[str] = p.get("types") or []
 
         # 역세권 판정
@@ -61,33 +90,45 @@ def score_area_with_places(
         if cat is not None:
             category_counter[cat] += 1
 
-    # 번화가 POI 수
-    poi_count = sum(
-        count
-        for cat, count in category_counter.items()
-        if cat in BUSY_CATEGORIES
-    )
+    return is_station_area, category_counter
 
-    # 점수 계산
-    score = 0.0
 
-    # 역세권 보너스
-    if is_station_area:
-        score += 10.0
+def score_area_with_places(
+    lat: float,
+    lng: float,
+    radius: int = 400,
+    live: bool = PLACE_SCORE_LIVE,
+) -> Tuple[float, bool, int, Counter]:
+    """
+    특정 좌표 주변 radius(m)에 대해:
+      - 역세권 여부
+      - 번화가용 POI 개수
+      - 카테고리별 카운트
+      - 번화가 score 계산
 
-    # 번화가 밀도 점수 (log 스케일)
-    score += 2.0 * log1p(poi_count)
+    오프라인 POI 인덱스(poi_index)가 있으면 그걸로 계산하고 (API 호출 없음),
+    없거나 live=True 면 Google Nearby Search 를 부른다.
+    """
+    index = None if live else get_poi_index()
+    if index is not None:
+        is_station_area, category_counter = index.area_counts(lat, lng, radius)
+    else:
+        is_station_area, category_counter = _area_counts_live(lat, lng, radius)
+
+    if not is_station_area and not category_counter:
+        return 0.0, False, 0, Counter()
 
+    score, poi_count = busy_area_score(is_station_area, category_counter)
     return score, is_station_area, poi_count, category_counter
 
 
 def adjust_to_busy_station_area(
     lat: float,
     lng: float,
-    base_radius: int = 400,            # 번화가 판정 반경
-    station_search_radius: int = 1000, # 주변 역 탐색 반경
-    min_score: float = 5.0,            # 번화가 유지 조건
-    min_poi_count: int = 8,            # POI 최소 조건
+    base_radius: int = BUSY_AREA_RADIUS_M,          # 번화가 판정 반경
+    station_search_radius: int = 1000,              # 주변 역 탐색 반경
+    min_score: float = BUSY_AREA_MIN_SCORE,         # 번화가 유지 조건
+    min_poi_count: int = BUSY_AREA_MIN_POI_COUNT,   # POI 최소 조건
 ) -> Dict[str, Any]:
     """
     1) (lat, lng)의 번화가 점수를 평가
@@ -122,7 +163,10 @@ def adjust_to_busy_station_area(
     }
 
     # 2. 주변 역 목록 확인 (역을 우선적으로 선택하기 위해 먼저 확인)
-    stations = fetch_nearby_stations(lat=lat, lng=lng, radius=station_search_radius)
+    #    지하철 데이터가 로드돼 있으면 사전 계산 테이블(도보 시간 가까운 순), 없으면 Google
+    stations = nearby_stations(lat, lng, station_search_radius)
+    if stations is None:
+        stations = fetch_nearby_stations(lat=lat, lng=lng, radius=station_search_radius)
     
     # 원래 위치가 역세권인지 확인
     orig_is_station_area = orig_is_station
@@ -135,7 +179,7 @@ def adjust_to_busy_station_area(
         best_station_info: Dict[str, Any] | None = None
 
         # 역 이름에 "역"이 포함된 것들을 우선적으로 확인
-        station_with_name = [st for st in stations if any(keyword in st.get("name", "") for keyword in ["역", "station", "Station", "지하철", "전철"])]
+        station_with_name = [st for st in stations if _is_subway_station(st)]
         stations_to_check = (station_with_name + stations)[:3]  # 최대 3개만 확인
 
         for st in stations_to_check:
@@ -151,8 +195,7 @@ def adjust_to_busy_station_area(
             )
             
             # 역 이름 확인 (지하철역/전철역 등 역 이름이 포함되어 있는지)
-            station_name = st.get("name", "")
-            is_subway_station = any(keyword in station_name for keyword in ["역", "station", "Station", "지하철", "전철"])
+            is_subway_station = _is_subway_station(st)
             
             # 역인 경우 추가 보너스 (역 우선 선택)
             if is_subway_station:
@@ -221,7 +264,7 @@ def adjust_to_busy_station_area(
     best_station_info: Dict[str, Any] | None = None
 
     # 역 이름에 "역"이 포함된 것들을 우선적으로 확인
-    station_with_name = [st for st in stations if any(keyword in st.get("name", "") for keyword in ["역", "station", "Station", "지하철", "전철"])]
+    station_with_name = [st for st in stations if _is_subway_station(st)]
     stations_to_check = (station_with_name + stations)[:3]  # 최대 3개만 확인
 
     for st in stations_to_check:
@@ -237,8 +280,7 @@ def adjust_to_busy_station_area(
         )
         
         # 역 이름 확인
-        station_name = st.get("name", "")
-        is_subway_station = any(keyword in station_name for keyword in ["역", "station", "Station", "지하철", "전철"])
+        is_subway_station = _is_subway_station(st)
         
         # 역인 경우 추가 보너스
         if is_subway_station:
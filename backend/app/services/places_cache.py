@@ -0,0 +1,193 @@
+# app/services/places_cache.py
+"""
+Google Places Nearby Search 결과 캐시.
+
+- fetch_nearby_places 는 가장 많이 부르는 외부 API 다
+  (후보마다 중심 + 주변 역 score_area_with_places, 코스 단계마다, must_visit 마다).
+  같은 계산 안에서도 같은 검색이 여러 번 나가고, 다시 계산하면 전부 다시 나간다.
+- 키: (geohash 셀, radius, keyword, type)
+    * 위치는 geohash PLACES_CACHE_GEOHASH_PRECISION 자리(기본 7 ≈ 150m×150m) 셀로 묶는다.
+      셀 안의 다른 점에서 검색해도 같은 결과를 돌려준다 (반경 수백 m 검색에서는 차이가 작다).
+- 프로세스 메모리 LRU + TTL (result_cache.TTLCache).
+- 같은 키를 동시에 찾는 요청은 하나만 실제로 호출하고 나머지는 그 결과를 기다린다
+  (스레드: concurrent.futures.Future, async: 이벤트 루프별 호출 task 를 shield 로 공유).
+  합류한 요청은 캐시 miss 가 아니라 coalesced 로 센다.
+- API 오류로 빈 결과가 나온 경우는 캐시하지 않는다 (fetch 가 (결과, 캐시 가능 여부) 를 돌려줌).
+
+환경변수
+- PLACES_CACHE_MAXSIZE            : 최대 항목 수, 0 이면 캐시 안 함 (기본 5000)
+- PLACES_CACHE_TTL_S              : 항목 유효 시간 초 (기본 86400)
+- PLACES_CACHE_GEOHASH_PRECISION  : geohash 자리 수 (기본 7)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .result_cache import TTLCache
+
+log = logging.getLogger(__name__)
+
+PLACES_CACHE_MAXSIZE = int(os.getenv("PLACES_CACHE_MAXSIZE", "5000"))
+PLACES_CACHE_TTL_S = float(os.getenv("PLACES_CACHE_TTL_S", "86400"))
+PLACES_CACHE_GEOHASH_PRECISION = int(os.getenv("PLACES_CACHE_GEOHASH_PRECISION", "7"))
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+Places = List[Dict[str, Any]]
+FetchResult = Tuple[Places, bool]  # (결과, 캐시해도 되는지)
+
+
+def geohash_encode(lat: float, lng: float, precision: int = PLACES_CACHE_GEOHASH_PRECISION) -> str:
+    """표준 geohash (경도/위도 비트를 번갈아 5비트씩 base32)."""
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    out: List[str] = []
+    bits = 0
+    n_bits = 0
+    even = True  # 짝수 번째 비트는 경도
+    while len(out) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_lo = mid
+            else:
+                bits <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        n_bits += 1
+        if n_bits == 5:
+            out.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            n_bits = 0
+    return "".join(out)
+
+
+def nearby_key(
+    lat: float,
+    lng: float,
+    radius: int,
+    keyword: Optional[str],
+    type: Optional[str],
+) -> Tuple[str, int, str, str]:
+    return (
+        geohash_encode(float(lat), float(lng)),
+        int(radius),
+        (keyword or "").strip(),
+        (type or "").strip(),
+    )
+
+
+class CoalescingCache:
+    """TTLCache + 동시 요청 합치기 (single flight)."""
+
+    def __init__(self, maxsize: int, ttl_s: float, name: str) -> None:
+        self._cache = TTLCache(maxsize, ttl_s, name=name)
+        self._lock = threading.Lock()
+        self._inflight: Dict[Hashable, "Future[Places]"] = {}
+        # 이벤트 루프 → {key: 실제 호출 중인 asyncio.Task}
+        self._async_inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.coalesced = 0
+        self.uncacheable = 0
+
+    def _store(self, key: Hashable, result: FetchResult) -> Places:
+        places, cacheable = result
+        if cacheable:
+            self._cache.set(key, list(places))
+        else:
+            with self._lock:
+                self.uncacheable += 1
+        return places
+
+    def get_or_fetch(self, key: Hashable, fetch: Callable[[], FetchResult]) -> Places:
+        """동기 버전 (스레드에서 호출)."""
+        with self._lock:
+            # 진행 중인 요청에 합류하는 쪽은 캐시 miss 로 세지 않는다 (coalesced 로만 센다)
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                hit = self._cache.get(key)
+                if hit is not None:
+                    return list(hit)
+                fut = self._inflight[key] = Future()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return list(fut.result())
+
+        try:
+            places = self._store(key, fetch())
+            fut.set_result(places)
+            return list(places)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def aget_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[FetchResult]]) -> Places:
+        """
+        async 버전 (같은 이벤트 루프 안의 동시 요청끼리 합친다).
+        실제 호출은 별도 task 로 돌리고 모두 shield 로 기다리므로,
+        먼저 보낸 요청이 취소돼도 같이 기다리던 다른 요청은 결과를 받는다.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            inflight = self._async_inflight.get(loop)
+            if inflight is None:
+                inflight = self._async_inflight[loop] = {}
+            task = inflight.get(key)
+            if task is None:
+                hit = self._cache.get(key)
+                if hit is not None:
+                    return list(hit)
+                task = inflight[key] = loop.create_task(self._afetch(key, fetch, inflight))
+                # 기다리는 쪽이 모두 취소돼도 "exception was never retrieved" 경고가 나지 않게
+                task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            else:
+                self.coalesced += 1
+        return list(await asyncio.shield(task))
+
+    async def _afetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Awaitable[FetchResult]],
+        inflight: Dict[Hashable, "asyncio.Task[Places]"],
+    ) -> Places:
+        try:
+            return self._store(key, await fetch())
+        finally:
+            with self._lock:
+                inflight.pop(key, None)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self._cache.stats()
+        with self._lock:
+            stats["coalesced"] = self.coalesced
+            stats["uncacheable"] = self.uncacheable
+            stats["inflight"] = len(self._inflight) + sum(len(d) for d in self._async_inflight.values())
+        stats["geohash_precision"] = PLACES_CACHE_GEOHASH_PRECISION
+        return stats
+
+
+PLACES_CACHE = CoalescingCache(PLACES_CACHE_MAXSIZE, PLACES_CACHE_TTL_S, name="places_nearby")
@@ -0,0 +1,283 @@
+# app/services/poi_index.py
+"""
+서울 POI(가게/문화시설/역) 오프라인 인덱스.
+
+- score_area_with_places(번화가/역세권 점수)는 좌표마다 Google Nearby Search 를 불렀고,
+  adjust_to_busy_station_area 한 번에 최대 8번(중심 + 역 후보들) 호출했다.
+- build_seoul_graph.py 에서 OSM POI 를 한 번 받아
+  (좌표, 우리 카테고리(PlaceCategory), 역 여부) 배열로 저장해 두고,
+  서버는 KD-tree(NodeSnapper) 반경 조회로 같은 값을 계산한다 (호출당 수십 µs).
+- OSM 태그는 Google place type 으로 바꾼 뒤 GOOGLE_TYPE_TO_CATEGORY /
+  map_google_types_to_category / STATION_TYPES 를 그대로 써서 분류한다 (분류 기준을 한 곳에 유지).
+- Google Nearby Search 는 한 번에 최대 20개만 돌려주므로, 점수 기준(min_score, min_poi_count)이
+  그대로 의미를 갖도록 카테고리 개수는 반경 안 가까운 POI_SAMPLE_SIZE 개만 센다.
+  역 여부는 반경 안 전체에서 판단한다.
+
+저장 위치: POI_INDEX_DIR (기본 seoul_graph_out/pois/)
+    meta.json    : 포맷 버전, POI 수, 출처, poi_version 등
+    lat.npy      : float64 (n,)
+    lng.npy      : float64 (n,)
+    category.npy : int8    (n,)  POI_CATEGORIES 인덱스, 카테고리 없음은 -1
+    station.npy  : bool    (n,)  역(STATION_TYPES) 여부
+
+환경변수
+- POI_INDEX_DIR   : 인덱스 디렉토리
+- POI_SAMPLE_SIZE : 카테고리를 셀 가까운 POI 수, 0 이면 반경 안 전부 (기본 20)
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union, get_args
+
+import numpy as np
+
+from core.place_category import PlaceCategory, map_google_types_to_category
+
+from .google_places_services import STATION_TYPES
+from .node_snapper import NodeSnapper
+from .road_graph import read_array_meta, save_array_directory
+
+log = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+POI_INDEX_FORMAT = 1
+POI_INDEX_DIR = Path(
+    os.getenv(
+        "POI_INDEX_DIR",
+        str(Path(__file__).resolve().parents[2] / "seoul_graph_out" / "pois"),
+    )
+)
+POI_SAMPLE_SIZE = int(os.getenv("POI_SAMPLE_SIZE", "20"))
+
+# category.npy 코드 → 카테고리 (PlaceCategory 선언 순서)
+POI_CATEGORIES: Tuple[str, ...] = get_args(PlaceCategory)
+_NO_CATEGORY = -1
+
+# OSM 태그 (key, value) → Google place type
+# (Google 기준 분류표(GOOGLE_TYPE_TO_CATEGORY)를 그대로 쓰기 위한 변환, 버스 정류장은 역으로 치지 않음)
+OSM_TAG_TO_GOOGLE_TYPE: Dict[Tuple[str, str], str] = {
+    ("amenity", "restaurant"): "restaurant",
+    ("amenity", "fast_food"): "fast_food_restaurant",
+    ("amenity", "food_court"): "food_court",
+    ("amenity", "bar"): "bar",
+    ("amenity", "pub"): "bar",
+    ("amenity", "biergarten"): "bar",
+    ("amenity", "cafe"): "cafe",
+    ("amenity", "ice_cream"): "dessert_shop",
+    ("shop", "bakery"): "bakery",
+    ("shop", "confectionery"): "dessert_shop",
+    ("shop", "pastry"): "dessert_shop",
+    ("shop", "mall"): "shopping_mall",
+    ("shop", "department_store"): "department_store",
+    ("shop", "clothes"): "clothing_store",
+    ("shop", "books"): "book_store",
+    ("shop", "pet"): "pet_store",
+    ("shop", "furniture"): "furniture_store",
+    ("shop", "beauty"): "beauty_salon",
+    ("shop", "hairdresser"): "hair_care",
+    ("shop", "massage"): "spa",
+    ("amenity", "cinema"): "movie_theater",
+    ("amenity", "library"): "library",
+    ("amenity", "arts_centre"): "museum",
+    ("tourism", "museum"): "museum",
+    ("tourism", "gallery"): "museum",
+    ("tourism", "attraction"): "tourist_attraction",
+    ("tourism", "theme_park"): "amusement_park",
+    ("tourism", "zoo"): "zoo",
+    ("tourism", "camp_site"): "campground",
+    ("leisure", "park"): "park",
+    ("leisure", "amusement_arcade"): "amusement_park",
+    ("leisure", "water_park"): "amusement_park",
+    ("leisure", "sauna"): "spa",
+    ("railway", "station"): "train_station",
+    ("station", "subway"): "subway_station",
+    ("amenity", "bus_station"): "bus_station",
+}
+
+# build_seoul_graph.py 에서 osmnx features 조회에 넘길 태그
+OSM_POI_TAGS: Dict[str, List[str]] = {}
+for _key, _value in OSM_TAG_TO_GOOGLE_TYPE:
+    OSM_POI_TAGS.setdefault(_key, []).append(_value)
+
+
+def osm_tags_to_google_types(tags: Mapping[str, Any]) -> List[str]:
+    """OSM 태그 dict → Google place type 목록 (GeoDataFrame 행의 NaN 값은 무시)."""
+    types: List[str] = []
+    for key in OSM_POI_TAGS:
+        value = tags.get(key)
+        if not isinstance(value, str):
+            continue
+        t = OSM_TAG_TO_GOOGLE_TYPE.get((key, value))
+        if t is not None and t not in types:
+            types.append(t)
+    return types
+
+
+class POIIndex:
+    """POI 좌표 KD-tree + 카테고리/역 배열."""
+
+    def __init__(
+        self,
+        lat: np.ndarray,
+        lng: np.ndarray,
+        category: np.ndarray,
+        station: np.ndarray,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.category = np.asarray(category, dtype=np.int8)
+        self.station = np.asarray(station, dtype=bool)
+        self.meta = dict(meta or {})
+        self._snapper = NodeSnapper(np.arange(self.lat.shape[0]), self.lng, self.lat)
+
+    @property
+    def n_pois(self) -> int:
+        return int(self.lat.shape[0])
+
+    @property
+    def version(self) -> str:
+        version = self.meta.get("poi_version")
+        if not version:
+            version = self.meta["poi_version"] = _poi_version(self)
+        return version
+
+    def area_counts(
+        self,
+        lat: float,
+        lng: float,
+        radius: float,
+        sample_size: int = POI_SAMPLE_SIZE,
+    ) -> Tuple[bool, Counter]:
+        """
+        (lat, lng) 반경 radius(m) 안 POI 로 (역세권 여부, 카테고리별 개수).
+        카테고리는 가까운 sample_size 개만 센다 (Nearby Search 20개 제한과 맞춤).
+        """
+        idx, dist = self._snapper.within_index(lng, lat, radius)
+        if idx.size == 0:
+            return False, Counter()
+
+        is_station = bool(self.station[idx].any())
+        if sample_size > 0 and idx.size > sample_size:
+            keep = np.argpartition(dist, sample_size - 1)[:sample_size]
+            idx = idx[keep]
+        codes = self.category[idx]
+        codes = codes[codes != _NO_CATEGORY]
+        counts = np.bincount(codes.astype(np.int64), minlength=len(POI_CATEGORIES))
+        return is_station, Counter(
+            {POI_CATEGORIES[c]: int(n) for c, n in enumerate(counts) if n}
+        )
+
+
+def _poi_version(index: POIIndex) -> str:
+    h = hashlib.sha1()
+    for arr in (index.lat, index.lng, index.category, index.station):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()[:16]
+
+
+def build_poi_index(
+    records: Iterable[Tuple[float, float, Sequence[str]]],  # (lat, lng, Google types)
+    source: str = "osm",
+) -> POIIndex:
+    """(lat, lng, Google place types) 목록 → POIIndex. 카테고리도 역도 아닌 POI 는 버린다."""
+    code_of = {c: i for i, c in enumerate(POI_CATEGORIES)}
+    lat: List[float] = []
+    lng: List[float] = []
+    category: List[int] = []
+    station: List[bool] = []
+    for p_lat, p_lng, types in records:
+        types = list(types)
+        cat = map_google_types_to_category(types)
+        is_station = any(t in STATION_TYPES for t in types)
+        if cat is None and not is_station:
+            continue
+        lat.append(float(p_lat))
+        lng.append(float(p_lng))
+        category.append(code_of[cat] if cat is not None else _NO_CATEGORY)
+        station.append(is_station)
+
+    index = POIIndex(
+        np.asarray(lat, dtype=np.float64),
+        np.asarray(lng, dtype=np.float64),
+        np.asarray(category, dtype=np.int8),
+        np.asarray(station, dtype=bool),
+        meta={"source": source},
+    )
+    index.meta.update(
+        {
+            "n_pois": index.n_pois,
+            "n_stations": int(index.station.sum()),
+            "categories": list(POI_CATEGORIES),
+        }
+    )
+    return index
+
+
+def save_poi_index(index: POIIndex, directory: PathLike = POI_INDEX_DIR) -> Path:
+    out = Path(directory)
+    arrays = {
+        "lat": np.ascontiguousarray(index.lat, dtype=np.float64),
+        "lng": np.ascontiguousarray(index.lng, dtype=np.float64),
+        "category": np.ascontiguousarray(index.category, dtype=np.int8),
+        "station": np.ascontiguousarray(index.station, dtype=bool),
+    }
+    meta = dict(index.meta)
+    meta["format"] = POI_INDEX_FORMAT
+    meta["poi_version"] = _poi_version(index)
+    index.meta = save_array_directory(out, arrays, meta)
+    return out
+
+
+def load_poi_index(directory: PathLike = POI_INDEX_DIR) -> Optional[POIIndex]:
+    """없거나 포맷/카테고리 구성이 맞지 않으면 None."""
+    src = Path(directory)
+    # 카테고리 코드가 PlaceCategory 순서라서, 순서가 바뀌면 잘못 읽힌다
+    meta = read_array_meta(src, POI_INDEX_FORMAT, "POI", {"categories": list(POI_CATEGORIES)})
+    if meta is None:
+        return None
+
+    return POIIndex(
+        lat=np.load(src / "lat.npy"),
+        lng=np.load(src / "lng.npy"),
+        category=np.load(src / "category.npy"),
+        station=np.load(src / "station.npy"),
+        meta=meta,
+    )
+
+
+_INDEX: Optional[POIIndex] = None
+_INDEX_LOADED = False
+_INDEX_LOCK = threading.Lock()
+
+
+def get_poi_index() -> Optional[POIIndex]:
+    """POI_INDEX_DIR 를 처음 호출 시 1회 로드. 없거나 깨져 있으면 None (Google Nearby Search 사용)."""
+    global _INDEX, _INDEX_LOADED
+    if _INDEX_LOADED:
+        return _INDEX
+    with _INDEX_LOCK:
+        if not _INDEX_LOADED:
+            try:
+                _INDEX = load_poi_index(POI_INDEX_DIR)
+                if _INDEX is not None:
+                    log.info(
+                        "[POI] loaded %s (pois=%d, stations=%d, version=%s)",
+                        POI_INDEX_DIR,
+                        _INDEX.n_pois,
+                        int(_INDEX.station.sum()),
+                        _INDEX.version,
+                    )
+                else:
+                    log.info("[POI] no POI index at %s, using Google Nearby Search", POI_INDEX_DIR)
+            except (OSError, KeyError, ValueError) as e:
+                log.error("[POI] failed to load %s: %s", POI_INDEX_DIR, e)
+                _INDEX = None
+            _INDEX_LOADED = True
+    return _INDEX
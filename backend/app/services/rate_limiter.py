@@ -0,0 +1,131 @@
+# app/services/rate_limiter.py
+"""
+외부 API 공급자(provider)별 동시 호출 한도 + 초당 호출 한도.
+
+- compute_minimax_travel_times 처럼 (후보 × 참가자) 호출을 asyncio.gather 로
+  한꺼번에 보내는 코드가 공급자 쿼터(QPS)를 넘지 않게 한다.
+- 공급자마다
+    * asyncio.Semaphore : 동시에 진행 중인 요청 수 상한
+    * AsyncTokenBucket  : 초당 요청 수 상한 (burst 만큼은 바로 통과)
+  를 두고, `async with get_limiter("google"):` 로 감싼 구간만 한도를 적용한다.
+- asyncio 동기화 객체는 이벤트 루프에 묶이므로 http_clients 와 같이 루프별로 따로 둔다.
+
+환경변수 (<P> = GOOGLE / NAVER)
+- <P>_MAX_CONCURRENCY : 동시 요청 수 (기본 8)
+- <P>_RATE_PER_S      : 초당 요청 수, 0 이하면 제한 없음 (기본 10)
+- <P>_RATE_BURST      : 한 번에 바로 보낼 수 있는 요청 수 (기본 = <P>_MAX_CONCURRENCY)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import weakref
+from typing import Any, Dict, Tuple
+
+log = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_RATE_PER_S = 10.0
+
+
+def _provider_limits(provider: str) -> Tuple[int, float, float]:
+    """환경변수 → (동시 요청 수, 초당 요청 수, burst)."""
+    prefix = provider.upper()
+    concurrency = int(os.getenv(f"{prefix}_MAX_CONCURRENCY", str(DEFAULT_MAX_CONCURRENCY)))
+    rate = float(os.getenv(f"{prefix}_RATE_PER_S", str(DEFAULT_RATE_PER_S)))
+    burst = float(os.getenv(f"{prefix}_RATE_BURST", str(concurrency)))
+    return max(1, concurrency), rate, max(1.0, burst)
+
+
+class AsyncTokenBucket:
+    """초당 rate_per_s 개씩 채워지는 토큰 버킷 (최대 burst 개)."""
+
+    def __init__(self, rate_per_s: float, burst: float) -> None:
+        self.rate_per_s = float(rate_per_s)
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        # 대기자는 도착 순서대로 토큰을 받는다
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_s)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        if self.rate_per_s <= 0:
+            return
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1.0:
+                await asyncio.sleep((1.0 - self._tokens) / self.rate_per_s)
+                self._refill()
+            self._tokens -= 1.0
+
+
+class ProviderLimiter:
+    """`async with limiter:` 구간 = 동시 요청 슬롯 1개 + 토큰 1개."""
+
+    def __init__(self, name: str, max_concurrency: int, rate_per_s: float, burst: float) -> None:
+        self.name = name
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._sem = asyncio.Semaphore(self.max_concurrency)
+        self._bucket = AsyncTokenBucket(rate_per_s, burst)
+        self._stats = {"calls": 0, "waited_s": 0.0}
+
+    async def __aenter__(self) -> "ProviderLimiter":
+        t0 = time.monotonic()
+        await self._sem.acquire()
+        try:
+            await self._bucket.acquire()
+        except BaseException:
+            # 토큰 대기 중 취소되면 슬롯을 돌려준다
+            self._sem.release()
+            raise
+        self._stats["calls"] += 1
+        self._stats["waited_s"] += time.monotonic() - t0
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        self._sem.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_concurrency": self.max_concurrency,
+            "rate_per_s": self._bucket.rate_per_s,
+            "burst": self._bucket.burst,
+            "calls": self._stats["calls"],
+            "waited_s": round(self._stats["waited_s"], 3),
+        }
+
+
+_lock = threading.Lock()
+# 이벤트 루프 → {provider: ProviderLimiter}
+_LIMITERS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, ProviderLimiter]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_limiter(provider: str) -> ProviderLimiter:
+    """현재 이벤트 루프에서 쓸 provider("google"/"naver") 한도 (async 함수 안에서 호출)."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        limiters = _LIMITERS.get(loop)
+        if limiters is None:
+            limiters = _LIMITERS[loop] = {}
+        limiter = limiters.get(provider)
+        if limiter is None:
+            concurrency, rate, burst = _provider_limits(provider)
+            limiter = limiters[provider] = ProviderLimiter(provider, concurrency, rate, burst)
+            log.info(
+                "[RATE] %s: max_concurrency=%d rate_per_s=%.1f burst=%.0f",
+                provider,
+                concurrency,
+                rate,
+                burst,
+            )
+        return limiter
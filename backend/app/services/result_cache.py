@@ -0,0 +1,79 @@
+# app/services/result_cache.py
+"""
+프로세스 메모리 LRU + TTL 캐시.
+
+- 최대 maxsize 개까지 보관하고, 넘치면 가장 오래 안 쓴 항목부터 버린다.
+- ttl_s 가 지난 항목은 조회 시 만료 처리한다 (ttl_s <= 0 이면 만료 없음).
+- hit / miss / eviction 수를 stats() 로 노출한다.
+- 여러 스레드(FastAPI 스레드풀, compute 실행기)에서 동시에 써도 되도록 lock 으로 보호.
+
+값은 그대로 저장/반환하므로, 호출하는 쪽에서 수정할 객체라면 복사해서 넣고 빼야 한다.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class TTLCache:
+    def __init__(self, maxsize: int, ttl_s: float, name: str = "cache") -> None:
+        self.maxsize = max(0, int(maxsize))
+        self.ttl_s = float(ttl_s)
+        self.name = name
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            stored_at, value = item
+            if self.ttl_s > 0 and now - stored_at > self.ttl_s:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl_s": self.ttl_s,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
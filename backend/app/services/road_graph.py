@@ -0,0 +1,587 @@
+# app/services/road_graph.py
+"""
+도로 그래프를 CSR(compressed sparse row) 배열로 들고 있는 경량 그래프 엔진.
+
+- networkx MultiGraph 는 노드/간선마다 dict 를 들고 있어서
+  서울 전체 그래프에서 Dijkstra 를 돌리면 메모리/속도 모두 부담이 크다.
+- 여기서는 노드를 0..n-1 정수 인덱스로 바꾸고
+  (indptr, indices, weights) 세 배열만으로 인접 리스트를 표현한다.
+    - indices : int32 (이웃 노드 인덱스)
+    - weights : float32 (간선 길이 등)
+- 평행 간선(MultiGraph)은 weight 별로 최소값 하나만 남긴다.
+  (networkx 의 single_source_dijkstra 와 같은 규칙)
+"""
+from __future__ import annotations
+
+import hashlib
+import heapq
+import json
+import logging
+import math
+import os
+import shutil
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import dijkstra as _csgraph_dijkstra
+except ImportError:  # scipy 가 없으면 파이썬 힙 Dijkstra 로 동작 (느리지만 결과 동일)
+    csr_matrix = None
+    _csgraph_dijkstra = None
+
+log = logging.getLogger(__name__)
+
+# .npy 묶음 디렉토리 포맷 버전 (파일 구성이 바뀌면 올린다, 테이블마다 따로)
+SNAPSHOT_FORMAT = 1
+# 스냅샷 / CH / 역 접근 / 번화가 점수 / POI 인덱스 디렉토리 공통
+SNAPSHOT_META_FILE = "meta.json"
+
+EARTH_RADIUS_M = 6371000  # 지구 반지름 (m)
+# 시간대 weight (speed_profile, "travel_time@...") 배열을 몇 개까지 들고 있을지
+DERIVED_WEIGHT_CACHE_SIZE = 4
+
+
+class CSRGraph:
+    """
+    노드 인덱스 기반 CSR 그래프.
+
+    - node_ids : 원래 그래프의 노드 id (오름차순 정렬, int64)
+    - x, y     : 노드 경도/위도 (float64)
+    - indptr   : 노드 i 의 이웃은 indices[indptr[i]:indptr[i+1]]
+    - weights  : {"length": float32 배열, ...} (indices 와 같은 길이)
+    """
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        x: np.ndarray,
+        y: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: Dict[str, np.ndarray],
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.node_ids = node_ids
+        self.x = x
+        self.y = y
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.meta: Dict[str, Any] = dict(meta or {})
+
+        # Dijkstra 는 scipy.sparse.csgraph 로 (mmap 된) 배열 위에서 바로 돌린다.
+        # 연결 구조(indptr int32 / indices)는 1벌만, weight 는 이름별 float64 배열만 따로 둔다.
+        self._topology: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._weight_cache: Dict[str, np.ndarray] = {}
+        # scipy 가 없을 때만 쓰는 파이썬 list (힙 Dijkstra 내부 루프용)
+        self._topology_lists: Optional[Tuple[List[int], List[int]]] = None
+        self._weight_lists: Dict[str, List[float]] = {}
+        # 직선거리 계산용 (위도 rad, 경도 rad, cos(위도)) — 처음 쓸 때 1회 계산
+        self._rad_cache: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    # ------------------------------------------------------------------
+    # 생성
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_networkx(
+        cls,
+        G: Any,
+        weights: Sequence[str] = ("length",),
+    ) -> "CSRGraph":
+        """
+        networkx (Multi)Graph / (Multi)DiGraph → CSRGraph 변환.
+
+        - 무방향 그래프면 양방향 간선을 모두 넣는다.
+        - weight 속성이 없는 간선은 networkx 와 동일하게 1 로 취급한다.
+        - self-loop 는 최단거리에 영향이 없으므로 버린다.
+        """
+        n = G.number_of_nodes()
+        node_ids = np.fromiter(G.nodes, dtype=np.int64, count=n)
+        node_ids.sort()
+        pos = {int(nid): i for i, nid in enumerate(node_ids.tolist())}
+
+        x = np.array([float(G.nodes[nid]["x"]) for nid in node_ids.tolist()], dtype=np.float64)
+        y = np.array([float(G.nodes[nid]["y"]) for nid in node_ids.tolist()], dtype=np.float64)
+
+        directed = G.is_directed()
+        src: List[int] = []
+        dst: List[int] = []
+        cols: Dict[str, List[float]] = {w: [] for w in weights}
+
+        for u, v, data in G.edges(data=True):
+            if u == v:
+                continue
+            iu = pos[int(u)]
+            iv = pos[int(v)]
+            vals = [float(data.get(w, 1)) for w in weights]
+
+            src.append(iu)
+            dst.append(iv)
+            for w, val in zip(weights, vals):
+                cols[w].append(val)
+
+            if not directed:
+                src.append(iv)
+                dst.append(iu)
+                for w, val in zip(weights, vals):
+                    cols[w].append(val)
+
+        src_arr = np.asarray(src, dtype=np.int64)
+        dst_arr = np.asarray(dst, dtype=np.int64)
+        w_arrs = {w: np.asarray(cols[w], dtype=np.float64) for w in weights}
+
+        indptr, indices, merged = _build_csr(n, src_arr, dst_arr, w_arrs)
+        return cls(node_ids, x, y, indptr, indices, merged)
+
+    # ------------------------------------------------------------------
+    # 기본 정보
+    # ------------------------------------------------------------------
+    @property
+    def n_nodes(self) -> int:
+        return int(self.node_ids.shape[0])
+
+    @property
+    def n_edges(self) -> int:
+        return int(self.indices.shape[0])
+
+    @property
+    def graph_version(self) -> str:
+        """배열 내용 해시 (스냅샷이면 meta 값, 아니면 처음 요청 시 계산)."""
+        version = self.meta.get("graph_version")
+        if version is None:
+            version = self.meta["graph_version"] = _graph_version(self)
+        return version
+
+    @property
+    def nodes(self) -> "_NodeView":
+        """networkx 처럼 G.nodes[node_id]["x"] / G.nodes() 로 접근할 수 있게 해주는 뷰."""
+        return _NodeView(self)
+
+    def index_of(self, node_id: int) -> int:
+        """원래 노드 id → 내부 인덱스. 없으면 KeyError."""
+        i = int(np.searchsorted(self.node_ids, node_id))
+        if i >= self.n_nodes or int(self.node_ids[i]) != int(node_id):
+            raise KeyError(node_id)
+        return i
+
+    def indices_of(self, node_ids: Iterable[int]) -> List[int]:
+        return [self.index_of(nid) for nid in node_ids]
+
+    def _radians(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if self._rad_cache is None:
+            lat = np.radians(np.asarray(self.y, dtype=np.float64))
+            lon = np.radians(np.asarray(self.x, dtype=np.float64))
+            self._rad_cache = (lat, lon, np.cos(lat))
+        return self._rad_cache
+
+    def haversine_from(self, lat: float, lon: float) -> np.ndarray:
+        """(lat, lon) 에서 모든 노드까지의 직선거리[m] (노드 인덱스 순서의 float64 배열)."""
+        lat_n, lon_n, cos_n = self._radians()
+        lat0 = math.radians(float(lat))
+        lon0 = math.radians(float(lon))
+        a = (
+            np.sin((lat_n - lat0) / 2.0) ** 2
+            + math.cos(lat0) * cos_n * np.sin((lon_n - lon0) / 2.0) ** 2
+        )
+        return EARTH_RADIUS_M * 2.0 * np.arctan2(np.sqrt(a), np.sqrt(1.0 - a))
+
+    def nearest_nodes(self, X: Sequence[float], Y: Sequence[float]) -> List[int]:
+        """
+        (경도 X, 위도 Y) 목록 → 가장 가까운 노드 id 목록 (haversine 기준).
+        ox.distance.nearest_nodes 와 같은 인터페이스.
+        """
+        return [
+            int(self.node_ids[int(np.argmin(self.haversine_from(lat, lon)))])
+            for lon, lat in zip(X, Y)
+        ]
+
+    def nbytes(self) -> int:
+        """그래프 배열들이 차지하는 바이트 수 (대략적인 상주 메모리)."""
+        total = (
+            self.node_ids.nbytes
+            + self.x.nbytes
+            + self.y.nbytes
+            + self.indptr.nbytes
+            + self.indices.nbytes
+        )
+        total += sum(int(w.nbytes) for w in self.weights.values())
+        return int(total)
+
+    # ------------------------------------------------------------------
+    # 최단거리
+    # ------------------------------------------------------------------
+    def _csr_topology(self) -> Tuple[np.ndarray, np.ndarray]:
+        """scipy 가 복사 없이 받는 (indptr int32, indices int32). 스냅샷 indices 는 그대로(mmap) 쓴다."""
+        if self._topology is None:
+            self._topology = (
+                np.asarray(self.indptr, dtype=np.int32),
+                np.asarray(self.indices, dtype=np.int32),
+            )
+        return self._topology
+
+    def _weight_array(self, weight: str) -> np.ndarray:
+        """weight 이름 → float64 간선 배열 (csgraph 가 변환 복사를 하지 않도록 1회만 변환)."""
+        arr = self._weight_cache.get(weight)
+        if arr is None:
+            src = self.weights.get(weight)
+            if src is None:
+                src = self._derived_weight(weight)
+            arr = np.asarray(src, dtype=np.float64)
+            self._weight_cache[weight] = arr
+        return arr
+
+    def prepare(self, weight: str = "length") -> None:
+        """첫 질의가 변환 비용을 떠안지 않도록 미리 준비 (워커 시작 시)."""
+        if csr_matrix is not None:
+            self._csr_topology()
+            self._weight_array(weight)
+        else:
+            self._adjacency(weight)
+
+    def _adjacency(self, weight: str) -> Tuple[List[int], List[int], List[float]]:
+        """scipy 가 없을 때의 파이썬 list 인접 구조 (연결 구조는 weight 와 무관하게 1벌)."""
+        if self._topology_lists is None:
+            self._topology_lists = (self.indptr.tolist(), self.indices.tolist())
+        w = self._weight_lists.get(weight)
+        if w is None:
+            w = self._weight_lists[weight] = self._weight_array(weight).tolist()
+        return self._topology_lists[0], self._topology_lists[1], w
+
+    def _derived_weight(self, weight: str) -> np.ndarray:
+        """
+        저장된 weight 가 아닌 이름 → 기존 weight 로 계산한 배열.
+        지금은 시간대 weight ("travel_time@d<요일>h<시>.<version>", speed_profile 참고)만 있다.
+        self.weights 에는 넣지 않는다 (graph_version / 스냅샷 / 공유 메모리에 섞이지 않게).
+        """
+        from .speed_profile import derive_weight, is_time_dependent_weight
+
+        if not is_time_dependent_weight(weight):
+            raise KeyError(f"unknown edge weight: {weight!r}")
+        # 시간대별 weight 배열은 간선 수만큼 커서 최근 것 몇 개만 남긴다
+        derived = [w for w in self._weight_cache if w not in self.weights]
+        for old in derived[: max(0, len(derived) - DERIVED_WEIGHT_CACHE_SIZE + 1)]:
+            del self._weight_cache[old]
+            self._weight_lists.pop(old, None)
+        return derive_weight(self, weight)
+
+    def dijkstra(
+        self,
+        source: int,
+        weight: str = "length",
+        cutoff: Optional[float] = None,
+    ) -> np.ndarray:
+        """
+        source(내부 인덱스)에서 모든 노드까지의 최단거리.
+
+        - 반환: float64 배열 (도달 불가 / cutoff 초과 노드는 inf)
+        - scipy.sparse.csgraph.dijkstra (limit=cutoff 면 cutoff 안쪽만 탐색),
+          scipy 가 없으면 이진 힙 기반 lazy-deletion Dijkstra
+        """
+        if _csgraph_dijkstra is not None:
+            indptr, indices = self._csr_topology()
+            n = self.n_nodes
+            matrix = csr_matrix((self._weight_array(weight), indices, indptr), shape=(n, n))
+            return _csgraph_dijkstra(
+                matrix,
+                directed=True,
+                indices=int(source),
+                limit=np.inf if cutoff is None else float(cutoff),
+            )
+        return self._dijkstra_heap(source, weight, cutoff)
+
+    def _dijkstra_heap(
+        self,
+        source: int,
+        weight: str,
+        cutoff: Optional[float],
+    ) -> np.ndarray:
+        """파이썬 힙 Dijkstra. 거리는 dict 로 들고 있어 cutoff 가 있으면 탐색한 노드 수만큼만 든다."""
+        indptr, indices, w = self._adjacency(weight)
+        limit = math.inf if cutoff is None else float(cutoff)
+
+        dist: Dict[int, float] = {source: 0.0}
+        done = set()
+        heap: List[Tuple[float, int]] = [(0.0, source)]
+        pop = heapq.heappop
+        push = heapq.heappush
+        inf = math.inf
+
+        while heap:
+            d, u = pop(heap)
+            if u in done:
+                continue
+            done.add(u)
+            for j in range(indptr[u], indptr[u + 1]):
+                v = indices[j]
+                nd = d + w[j]
+                if nd < dist.get(v, inf) and nd <= limit:
+                    dist[v] = nd
+                    push(heap, (nd, v))
+
+        out = np.full(self.n_nodes, np.inf, dtype=np.float64)
+        if dist:
+            out[np.fromiter(dist.keys(), dtype=np.int64, count=len(dist))] = np.fromiter(
+                dist.values(), dtype=np.float64, count=len(dist)
+            )
+        return out
+
+    def distances_to_dict(self, dist: np.ndarray) -> Dict[int, float]:
+        """
+        dijkstra() 결과 배열 → {node_id: 거리} dict.
+        networkx 결과와 같은 순서(가까운 노드부터)로 채운다.
+        """
+        reach = np.flatnonzero(np.isfinite(dist))
+        order = reach[np.argsort(dist[reach], kind="stable")]
+        return dict(zip(self.node_ids[order].tolist(), dist[order].tolist()))
+
+
+class _NodeView:
+    """CSRGraph.nodes 용 읽기 전용 뷰 (networkx NodeView 의 필요한 부분만 흉내)."""
+
+    def __init__(self, graph: CSRGraph) -> None:
+        self._graph = graph
+
+    def __call__(self) -> "_NodeView":
+        return self
+
+    def __getitem__(self, node_id: int) -> Dict[str, float]:
+        i = self._graph.index_of(node_id)
+        return {"x": float(self._graph.x[i]), "y": float(self._graph.y[i])}
+
+    def __iter__(self):
+        return iter(self._graph.node_ids.tolist())
+
+    def __len__(self) -> int:
+        return self._graph.n_nodes
+
+    def __contains__(self, node_id: object) -> bool:
+        try:
+            self._graph.index_of(int(node_id))  # type: ignore[arg-type]
+        except (KeyError, TypeError, ValueError):
+            return False
+        return True
+
+
+# ----------------------------------------------------------------------
+# 바이너리 스냅샷 (.npy 묶음)
+# ----------------------------------------------------------------------
+# seoul_graph_out/<mode>_csr/
+#   meta.json          : 포맷 버전, 모드, weight 목록, graph_version 등
+#   node_ids.npy       : int64
+#   x.npy, y.npy       : float64 (경도/위도)
+#   indptr.npy         : int64
+#   indices.npy        : int32
+#   w_<weight>.npy     : float32 (예: w_length.npy, w_travel_time.npy)
+#
+# .npz 는 zip 이라 mmap 이 안 되므로 배열마다 .npy 파일을 따로 둔다.
+# np.load(mmap_mode="r") 로 열면 여러 uvicorn 워커가 같은 페이지를 공유한다.
+#
+# CH(ch_<weight>/), 역 접근(station_access/), 번화가 점수(busy_score/), POI 인덱스도
+# 같은 ".npy 묶음 + meta.json" 디렉토리라서 아래 save_array_directory 로 쓴다.
+
+PathLike = Union[str, Path]
+
+
+def save_array_directory(
+    directory: PathLike,
+    arrays: Dict[str, np.ndarray],
+    meta: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    {이름: 배열} 을 <이름>.npy 로, meta(+created_at) 를 meta.json 으로 저장하고 저장한 meta 를 반환.
+
+    서버/Dijkstra 워커가 기존 파일을 mmap 으로 열어 둔 채 다시 빌드할 수 있으므로
+    제자리에 덮어쓰지 않는다 (np.save 가 파일을 자르면 매핑한 프로세스가 SIGBUS 로 죽는다).
+    옆의 임시 디렉토리에 전부 쓴 뒤 이름을 바꿔 통째로 교체하고, 옛 디렉토리는 지운다
+    (이미 매핑한 페이지는 파일이 지워져도 유효). 옛 디렉토리의 하위 디렉토리
+    (스냅샷 아래 CH / 역 접근 / 번화가 점수)는 새 디렉토리로 옮겨 온다 — 각자 graph_version 을 확인한다.
+    """
+    out = Path(directory)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tag = f"{os.getpid()}.{threading.get_ident()}"
+    tmp = out.with_name(f".{out.name}.{tag}.tmp")
+    old = out.with_name(f".{out.name}.{tag}.old")
+
+    meta = dict(meta)
+    meta["created_at"] = datetime.now(timezone.utc).isoformat()
+    try:
+        tmp.mkdir()
+        for name, arr in arrays.items():
+            np.save(tmp / f"{name}.npy", arr)
+        with open(tmp / SNAPSHOT_META_FILE, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+        if out.exists():
+            for sub in out.iterdir():
+                if sub.is_dir() and not (tmp / sub.name).exists():
+                    os.replace(sub, tmp / sub.name)
+            os.replace(out, old)
+        os.replace(tmp, out)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    shutil.rmtree(old, ignore_errors=True)
+    return meta
+
+
+def _graph_version(graph: CSRGraph) -> str:
+    h = hashlib.sha1()
+    for arr in (graph.node_ids, graph.indptr, graph.indices):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    for name in sorted(graph.weights):
+        h.update(name.encode())
+        h.update(np.ascontiguousarray(graph.weights[name]).tobytes())
+    return h.hexdigest()[:16]
+
+
+def read_array_meta(
+    directory: PathLike,
+    fmt: int,
+    tag: str,
+    expected: Optional[Dict[str, Any]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    save_array_directory 로 만든 디렉토리의 meta.json.
+    없으면 None, format 이 fmt 가 아니거나 expected 의 항목(graph_version 등)이 다르면
+    그 디렉토리를 무시하도록 경고를 남기고 None.
+    """
+    src = Path(directory)
+    if not (src / SNAPSHOT_META_FILE).exists():
+        return None
+    with open(src / SNAPSHOT_META_FILE, encoding="utf-8") as f:
+        meta = json.load(f)
+
+    if meta.get("format") != fmt:
+        log.warning("[%s] %s: unsupported format %r, ignored", tag, src, meta.get("format"))
+        return None
+    for key, value in (expected or {}).items():
+        if meta.get(key) != value:
+            log.warning(
+                "[%s] %s: built for %s %s but loaded one is %s, ignored "
+                "(build_seoul_graph.py 로 다시 생성하세요)",
+                tag,
+                src,
+                key,
+                meta.get(key),
+                value,
+            )
+            return None
+    return meta
+
+
+def snapshot_graph_version(directory: PathLike) -> Optional[str]:
+    """스냅샷 디렉토리의 graph_version (스냅샷이 없으면 None)."""
+    src = Path(directory)
+    if not (src / SNAPSHOT_META_FILE).exists():
+        return None
+    with open(src / SNAPSHOT_META_FILE, encoding="utf-8") as f:
+        return json.load(f).get("graph_version")
+
+
+def save_snapshot(
+    graph: CSRGraph,
+    directory: PathLike,
+    *,
+    mode: str,
+    extra_meta: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """CSRGraph 를 .npy 묶음 디렉토리로 저장하고 경로를 반환."""
+    arrays = {
+        "node_ids": np.ascontiguousarray(graph.node_ids, dtype=np.int64),
+        "x": np.ascontiguousarray(graph.x, dtype=np.float64),
+        "y": np.ascontiguousarray(graph.y, dtype=np.float64),
+        "indptr": np.ascontiguousarray(graph.indptr, dtype=np.int64),
+        "indices": np.ascontiguousarray(graph.indices, dtype=np.int32),
+    }
+    for name, arr in graph.weights.items():
+        arrays[f"w_{name}"] = np.ascontiguousarray(arr, dtype=np.float32)
+
+    meta: Dict[str, Any] = {
+        "format": SNAPSHOT_FORMAT,
+        "mode": mode,
+        "weights": sorted(graph.weights),
+        "n_nodes": graph.n_nodes,
+        "n_edges": graph.n_edges,
+        "graph_version": _graph_version(graph),
+    }
+    if extra_meta:
+        meta.update(extra_meta)
+
+    graph.meta = save_array_directory(directory, arrays, meta)
+    return Path(directory)
+
+
+def snapshot_exists(directory: PathLike) -> bool:
+    return (Path(directory) / SNAPSHOT_META_FILE).exists()
+
+
+def load_snapshot(directory: PathLike, mmap: bool = True) -> CSRGraph:
+    """
+    save_snapshot() 으로 만든 디렉토리를 CSRGraph 로 로드.
+    mmap=True 이면 배열을 읽기 전용 메모리 맵으로 연다 (수백 ms 내 로드).
+    """
+    src = Path(directory)
+    with open(src / SNAPSHOT_META_FILE, encoding="utf-8") as f:
+        meta = json.load(f)
+
+    if meta.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(
+            f"Unsupported graph snapshot format {meta.get('format')!r} at {src} "
+            f"(expected {SNAPSHOT_FORMAT}). build_seoul_graph.py 로 다시 생성하세요."
+        )
+
+    mmap_mode = "r" if mmap else None
+    # 다른 프로세스(dijkstra_pool 워커)가 같은 파일을 다시 열 수 있게 경로를 남긴다
+    meta["snapshot_dir"] = str(src.resolve())
+
+    def _load(name: str) -> np.ndarray:
+        return np.load(src / name, mmap_mode=mmap_mode)
+
+    weights = {w: _load(f"w_{w}.npy") for w in meta.get("weights", [])}
+    return CSRGraph(
+        node_ids=_load("node_ids.npy"),
+        x=_load("x.npy"),
+        y=_load("y.npy"),
+        indptr=_load("indptr.npy"),
+        indices=_load("indices.npy"),
+        weights=weights,
+        meta=meta,
+    )
+
+
+def _build_csr(
+    n: int,
+    src: np.ndarray,
+    dst: np.ndarray,
+    weights: Dict[str, np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+    """(src, dst, w) 간선 목록 → CSR. 같은 (src, dst) 쌍은 weight 별 최소값으로 합친다."""
+    if src.size == 0:
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        return indptr, np.zeros(0, dtype=np.int32), {
+            w: np.zeros(0, dtype=np.float32) for w in weights
+        }
+
+    order = np.lexsort((dst, src))
+    src = src[order]
+    dst = dst[order]
+
+    first = np.ones(src.shape[0], dtype=bool)
+    first[1:] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+    starts = np.flatnonzero(first)
+
+    merged = {
+        w: np.minimum.reduceat(arr[order], starts).astype(np.float32)
+        for w, arr in weights.items()
+    }
+
+    counts = np.bincount(src[starts], minlength=n)
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+    indices = dst[starts].astype(np.int32)
+    return indptr, indices, merged
@@ -0,0 +1,414 @@
+# app/services/speed_profile.py
+"""
+도로 등급별 시간대(요일 × 시) 속도 계수 — 자동차 이동시간을 실시간 API 없이 추정.
+
+- 중간 지점 탐색은 자동차를 "최단거리 / 10km/h" 로 계산했고, 실제 교통은
+  참가자 × 후보마다 Naver/Google 을 불러야만 반영됐다.
+- 여기서는 travel_time(제한속도 기준 자유 흐름 초)에 도로 등급별 계수를 나눠
+  "그 요일/시간대의 예상 이동시간" 간선 weight 를 만든다.
+      travel_time@d<요일>h<시>.<profile version>   (예: travel_time@d4h18.3f2a9c01)
+  CSRGraph 가 이 이름을 처음 보면 derive_weight() 로 배열을 만들어 둔다
+  (프로세스 풀 워커도 같은 이름으로 각자 만든다).
+- 계수 = 실제 속도 / 자유 흐름 속도 (1 보다 작을수록 막힘).
+  기본값은 data/speed_profile.json (SPEED_PROFILE_PATH) 이고,
+  Naver 자동차 길찾기 응답(실시간 교통)과 로컬 자유 흐름 추정의 비율을 요일/시간대별로 모아
+  SPEED_PROFILE_MIN_OBSERVATIONS 개 이상 쌓인 칸은 다음 로드 때 계수를 보정한다.
+- 한 번의 이동 안에서는 출발 시각의 계수 하나를 쓴다 (시간대 경계를 넘는 적분은 하지 않음).
+  출발 시각 = 모임 시간 - SPEED_PROFILE_LEAD_MIN.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 lock 없이 동작 (동시에 flush 하면 관측 일부를 잃을 수 있음)
+    fcntl = None
+
+log = logging.getLogger(__name__)
+
+_BACKEND_ROOT = Path(__file__).resolve().parents[2]
+
+SPEED_PROFILE_PATH = Path(
+    os.getenv("SPEED_PROFILE_PATH", str(_BACKEND_ROOT / "data" / "speed_profile.json"))
+)
+# API 응답으로 모은 요일/시간대별 관측 (자동 생성)
+SPEED_OBSERVATIONS_PATH = Path(
+    os.getenv(
+        "SPEED_OBSERVATIONS_PATH",
+        str(_BACKEND_ROOT / "seoul_graph_out" / "speed_observations.json"),
+    )
+)
+SPEED_PROFILE_LEARN = os.getenv("SPEED_PROFILE_LEARN", "1").strip().lower() not in ("0", "false", "no")
+# 한 칸(요일 × 시)에 관측이 이만큼 쌓여야 계수를 보정한다
+SPEED_PROFILE_MIN_OBSERVATIONS = int(os.getenv("SPEED_PROFILE_MIN_OBSERVATIONS", "20"))
+# 관측을 이만큼 모을 때마다 파일에 쓴다
+SPEED_OBSERVATIONS_FLUSH_EVERY = int(os.getenv("SPEED_OBSERVATIONS_FLUSH_EVERY", "20"))
+# 관측 전용 스레드에 밀려 있을 수 있는 작업 수 (넘으면 새 관측은 버린다)
+SPEED_OBSERVATION_QUEUE = int(os.getenv("SPEED_OBSERVATION_QUEUE", "32"))
+# 모임 시간보다 이만큼 먼저 출발한다고 본다
+SPEED_PROFILE_LEAD_MIN = float(os.getenv("SPEED_PROFILE_LEAD_MIN", "30"))
+# 모임 시간이 없을 때 쓰는 요일/시 (meeting_plans 기본 모임 시간 19:00)
+SPEED_PROFILE_DEFAULT_WEEKDAY = 4
+SPEED_PROFILE_DEFAULT_HOUR = 19
+
+# 모임 시간이 timezone 없이 들어오면 한국 시간으로 본다
+KST = timezone(timedelta(hours=9))
+
+# 도로 등급 (코드 = 인덱스). OSM highway 태그 → 등급, *_link 는 본선과 같은 등급.
+ROAD_CLASSES = ("motorway", "trunk", "primary", "secondary", "tertiary", "residential", "other")
+ROAD_CLASS_OTHER = len(ROAD_CLASSES) - 1
+_ROAD_CLASS_CODE = {name: i for i, name in enumerate(ROAD_CLASSES)}
+_ROAD_CLASS_CODE.update({"living_street": _ROAD_CLASS_CODE["residential"], "unclassified": _ROAD_CLASS_CODE["residential"]})
+
+# 스냅샷에 간선별 도로 등급 코드를 담는 배열 이름 (build_seoul_graph.py 의 SNAPSHOT_WEIGHTS)
+ROAD_CLASS_WEIGHT = "road_class"
+# 시간대 weight 를 만드는 기준 weight
+TD_BASE_WEIGHT = "travel_time"
+_TD_WEIGHT_RE = re.compile(r"^travel_time@d([0-6])h(\d{2})\.([0-9a-f]+)$")
+
+# 계수 보정 범위 (관측이 이상해도 이 밖으로는 나가지 않는다)
+_FACTOR_MIN, _FACTOR_MAX = 0.05, 1.2
+_CORRECTION_MIN, _CORRECTION_MAX = 0.5, 2.0
+
+
+def road_class_code(highway: Any) -> int:
+    """OSM highway 태그 (문자열 또는 목록) → 도로 등급 코드."""
+    if isinstance(highway, (list, tuple)):
+        codes = [road_class_code(h) for h in highway]
+        return min(codes) if codes else ROAD_CLASS_OTHER
+    if not highway:
+        return ROAD_CLASS_OTHER
+    name = str(highway).strip().lower()
+    if name.endswith("_link"):
+        name = name[: -len("_link")]
+    return _ROAD_CLASS_CODE.get(name, ROAD_CLASS_OTHER)
+
+
+def departure_slot(meeting_time: Optional[datetime]) -> Tuple[int, int]:
+    """모임 시간 → 출발 (요일 0=월, 시). 모임 시간이 없으면 기본값."""
+    if meeting_time is None:
+        return SPEED_PROFILE_DEFAULT_WEEKDAY, SPEED_PROFILE_DEFAULT_HOUR
+    if meeting_time.tzinfo is None:
+        meeting_time = meeting_time.replace(tzinfo=KST)
+    depart = meeting_time.astimezone(KST) - timedelta(minutes=SPEED_PROFILE_LEAD_MIN)
+    return depart.weekday(), depart.hour
+
+
+class SpeedProfile:
+    """factors[요일, 시, 등급] = 실제 속도 / 자유 흐름 속도."""
+
+    def __init__(self, factors: np.ndarray, source: str = "") -> None:
+        self.factors = np.asarray(factors, dtype=np.float64)
+        self.source = source
+        self.version = hashlib.sha1(
+            np.ascontiguousarray(self.factors.round(4)).tobytes()
+        ).hexdigest()[:8]
+
+    def factor(self, weekday: int, hour: int) -> np.ndarray:
+        """등급별 계수 (길이 len(ROAD_CLASSES))."""
+        return self.factors[int(weekday) % 7, int(hour) % 24]
+
+    def weight_name(self, weekday: int, hour: int) -> str:
+        """CSRGraph.dijkstra(weight=...) 에 넘길 시간대 weight 이름."""
+        return f"{TD_BASE_WEIGHT}@d{int(weekday) % 7}h{int(hour) % 24:02d}.{self.version}"
+
+    def edge_weights(self, graph: Any, weekday: int, hour: int) -> np.ndarray:
+        """graph 간선별 예상 이동 초 (travel_time / 등급 계수)."""
+        base = np.asarray(graph.weights[TD_BASE_WEIGHT], dtype=np.float64)
+        fac = self.factor(weekday, hour)
+        codes = graph.weights.get(ROAD_CLASS_WEIGHT)
+        if codes is None:
+            # 도로 등급이 없는 예전 스냅샷: 전부 "other"
+            return (base / fac[ROAD_CLASS_OTHER]).astype(np.float32)
+        cls = np.clip(np.asarray(codes, dtype=np.int64), 0, ROAD_CLASS_OTHER)
+        return (base / fac[cls]).astype(np.float32)
+
+
+def parse_weight_name(name: str) -> Optional[Tuple[int, int, str]]:
+    """'travel_time@d4h18.<version>' → (요일, 시, version). 시간대 weight 이름이 아니면 None."""
+    m = _TD_WEIGHT_RE.match(name)
+    if m is None:
+        return None
+    return int(m.group(1)), int(m.group(2)), m.group(3)
+
+
+def is_time_dependent_weight(name: str) -> bool:
+    return name.startswith(TD_BASE_WEIGHT + "@")
+
+
+def derive_weight(graph: Any, name: str) -> np.ndarray:
+    """CSRGraph 가 모르는 시간대 weight 이름을 배열로 만든다 (road_graph 에서 호출)."""
+    parsed = parse_weight_name(name)
+    if parsed is None:
+        raise KeyError(f"unknown edge weight: {name!r}")
+    if TD_BASE_WEIGHT not in graph.weights:
+        raise KeyError(f"time-dependent weight {name!r} needs {TD_BASE_WEIGHT!r} edge weight")
+    profile = get_speed_profile()
+    if profile is None:
+        raise KeyError(f"time-dependent weight {name!r}: speed profile is not loaded")
+    weekday, hour, version = parsed
+    if version != profile.version:
+        # 관측 보정이 다른 시점에 반영된 프로세스끼리 버전이 다를 수 있다 (현재 계수로 계산)
+        log.debug("[SPEED] weight %s requested, loaded profile is %s", name, profile.version)
+    return profile.edge_weights(graph, weekday, hour)
+
+
+# ----------------------------------------------------------------------
+# 로드
+# ----------------------------------------------------------------------
+def _read_table(path: Path) -> np.ndarray:
+    """speed_profile.json → (7, 24, 등급) 계수 배열. 형식이 틀리면 ValueError."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    classes: List[str] = list(data.get("classes") or ROAD_CLASSES)
+    unknown = set(classes) - set(ROAD_CLASSES)
+    if unknown:
+        raise ValueError(f"{path}: unknown road classes {sorted(unknown)}")
+
+    factors = np.full((7, 24, len(ROAD_CLASSES)), np.nan, dtype=np.float64)
+    day_types: Dict[str, Sequence[int]] = data.get("day_types") or {}
+    for day_type, by_class in (data.get("factors") or {}).items():
+        days = day_types.get(day_type)
+        if days is None:
+            raise ValueError(f"{path}: day type {day_type!r} is not in day_types")
+        for cls_name, hourly in by_class.items():
+            if cls_name not in classes:
+                raise ValueError(f"{path}: {day_type}.{cls_name} is not in classes")
+            if len(hourly) != 24:
+                raise ValueError(f"{path}: {day_type}.{cls_name} needs 24 hourly values")
+            for d in days:
+                factors[int(d), :, ROAD_CLASSES.index(cls_name)] = hourly
+
+    # 표에 없는 등급은 "other", 그것도 없으면 1.0 (자유 흐름)
+    other = factors[:, :, ROAD_CLASS_OTHER]
+    factors[:, :, ROAD_CLASS_OTHER] = np.where(np.isnan(other), 1.0, other)
+    factors = np.where(np.isnan(factors), factors[:, :, ROAD_CLASS_OTHER:], factors)
+    if np.any(factors <= 0):
+        raise ValueError(f"{path}: speed factors must be positive")
+    return np.clip(factors, _FACTOR_MIN, _FACTOR_MAX)
+
+
+def _apply_observations(factors: np.ndarray, cells: Dict[str, Any]) -> Tuple[np.ndarray, int]:
+    """관측 칸(자유 흐름 합 / 실제 합)으로 계수 보정. (보정된 계수, 보정한 칸 수)."""
+    out = factors.copy()
+    n_cells = 0
+    for key, cell in cells.items():
+        try:
+            weekday, hour = (int(v) for v in key.split("-"))
+            count = int(cell["count"])
+            freeflow_s = float(cell["freeflow_s"])
+            observed_s = float(cell["observed_s"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if count < SPEED_PROFILE_MIN_OBSERVATIONS or freeflow_s <= 0 or observed_s <= 0:
+            continue
+        # 경로의 등급 구성은 모르므로 칸 전체에 같은 비율을 곱한다
+        observed_factor = freeflow_s / observed_s
+        table_factor = float(np.mean(factors[weekday % 7, hour % 24]))
+        correction = min(max(observed_factor / table_factor, _CORRECTION_MIN), _CORRECTION_MAX)
+        out[weekday % 7, hour % 24] = np.clip(
+            factors[weekday % 7, hour % 24] * correction, _FACTOR_MIN, _FACTOR_MAX
+        )
+        n_cells += 1
+    return out, n_cells
+
+
+def load_speed_profile(
+    path: Path = SPEED_PROFILE_PATH,
+    observations_path: Optional[Path] = SPEED_OBSERVATIONS_PATH,
+) -> SpeedProfile:
+    """기본 계수 표 + (있으면) 관측 보정. 표 형식이 틀리면 ValueError."""
+    factors = _read_table(Path(path))
+    source = str(path)
+    if observations_path is not None and Path(observations_path).exists():
+        try:
+            with open(observations_path, encoding="utf-8") as f:
+                cells = json.load(f).get("cells") or {}
+            factors, n_cells = _apply_observations(factors, cells)
+            if n_cells:
+                source += f" + {n_cells} observed slots"
+        except (OSError, ValueError) as e:
+            log.warning("[SPEED] failed to read observations %s: %s", observations_path, e)
+    return SpeedProfile(factors, source=source)
+
+
+_PROFILE: Optional[SpeedProfile] = None
+_PROFILE_LOADED = False
+_PROFILE_LOCK = threading.Lock()
+
+
+def get_speed_profile() -> Optional[SpeedProfile]:
+    """처음 호출 시 1회 로드. 표가 없거나 깨져 있으면 None (기존 고정 속도 사용)."""
+    global _PROFILE, _PROFILE_LOADED
+    if _PROFILE_LOADED:
+        return _PROFILE
+    with _PROFILE_LOCK:
+        if not _PROFILE_LOADED:
+            if SPEED_PROFILE_PATH.exists():
+                try:
+                    _PROFILE = load_speed_profile()
+                    log.info("[SPEED] loaded %s (version=%s)", _PROFILE.source, _PROFILE.version)
+                except (OSError, ValueError) as e:
+                    log.error("[SPEED] failed to load %s: %s", SPEED_PROFILE_PATH, e)
+            else:
+                log.info("[SPEED] no speed profile at %s, using fixed driving speed", SPEED_PROFILE_PATH)
+            _PROFILE_LOADED = True
+    return _PROFILE
+
+
+# ----------------------------------------------------------------------
+# 관측 수집 (실시간 교통 API 응답 → 요일/시간대 보정)
+# ----------------------------------------------------------------------
+class _ObservationStore:
+    """
+    요일/시간대 칸별 (관측 수, 자유 흐름 초 합, 실제 초 합) 을 모아 JSON 으로 저장.
+
+    여러 워커 프로세스가 같은 파일에 쓰므로, 메모리에는 마지막 flush 이후 더한 값만 들고 있다가
+    flush 때 프로세스 간 lock 을 잡고 파일의 현재 값에 더해서 쓴다 (다른 워커의 관측을 덮지 않음).
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        # 마지막 flush 이후 이 프로세스에서 더한 값
+        self._delta: Dict[str, Dict[str, float]] = {}
+        self._pending = 0
+
+    def add(self, weekday: int, hour: int, freeflow_s: float, observed_s: float) -> None:
+        with self._lock:
+            cell = self._delta.setdefault(
+                f"{weekday}-{hour}", {"count": 0, "freeflow_s": 0.0, "observed_s": 0.0}
+            )
+            cell["count"] += 1
+            cell["freeflow_s"] += float(freeflow_s)
+            cell["observed_s"] += float(observed_s)
+            self._pending += 1
+            if self._pending >= SPEED_OBSERVATIONS_FLUSH_EVERY:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._flush_locked()
+
+    @contextmanager
+    def _process_lock(self) -> Iterator[None]:
+        """같은 관측 파일을 쓰는 모든 프로세스 사이의 lock (읽고 더해서 쓰는 동안)."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.path.with_name(self.path.name + ".lock"), "a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def _read_cells(self) -> Dict[str, Dict[str, float]]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f).get("cells") or {}
+        except (OSError, ValueError) as e:
+            log.warning("[SPEED] ignoring unreadable observations %s: %s", self.path, e)
+            return {}
+
+    def _flush_locked(self) -> None:
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with self._process_lock():
+                cells = self._read_cells()
+                for key, add in self._delta.items():
+                    cell = cells.setdefault(key, {"count": 0, "freeflow_s": 0.0, "observed_s": 0.0})
+                    for field, value in add.items():
+                        cell[field] = cell.get(field, 0) + value
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump({"cells": cells}, f)
+                os.replace(tmp, self.path)
+            # 실패하면 delta 를 남겨 두고 다음 flush 때 다시 더한다
+            self._delta = {}
+            self._pending = 0
+        except OSError as e:
+            tmp.unlink(missing_ok=True)
+            log.warning("[SPEED] failed to write observations %s: %s", self.path, e)
+
+
+_OBSERVATIONS = _ObservationStore(SPEED_OBSERVATIONS_PATH)
+
+
+def record_observation(
+    freeflow_s: float,
+    observed_s: float,
+    when: Optional[datetime] = None,
+) -> None:
+    """
+    같은 출발지/도착지의 로컬 자유 흐름 추정(초)과 실시간 교통 API 결과(초)를 기록한다.
+    when 이 없으면 지금 (실시간 API 응답은 "지금 출발" 기준).
+    """
+    if not SPEED_PROFILE_LEARN:
+        return
+    if not (math.isfinite(freeflow_s) and math.isfinite(observed_s)):
+        return
+    if freeflow_s < 60 or observed_s <= 0:
+        return  # 너무 짧은 구간은 신호/접근 구간 비중이 커서 제외
+    when = datetime.now(KST) if when is None else when
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=KST)
+    when = when.astimezone(KST)
+    _OBSERVATIONS.add(when.weekday(), when.hour, freeflow_s, observed_s)
+
+
+# 관측 기록(로컬 자유 흐름 경로 탐색 포함)은 응답과 상관없는 부가 작업이라 전용 스레드 1개에서 돌린다.
+# compute_executor 에 넣으면 요청용 자리(503 백프레셔 한도)를 minimax 의 Naver 응답 수만큼 차지한다.
+_OBSERVATION_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speed-observe")
+_OBSERVATION_SLOTS = threading.BoundedSemaphore(max(1, SPEED_OBSERVATION_QUEUE))
+
+
+def record_observation_later(freeflow: Callable[[], Optional[float]], observed_s: float) -> bool:
+    """
+    freeflow() (로컬 자유 흐름 추정 초, 못 구하면 None) 를 관측 전용 스레드에서 구해서 기록한다.
+    관측 시각은 지금. 결과를 기다리지 않고, 대기열이 꽉 차 있으면 이번 관측은 버리고 False.
+    """
+    if not SPEED_PROFILE_LEARN:
+        return False
+    if not _OBSERVATION_SLOTS.acquire(blocking=False):
+        return False
+    when = datetime.now(KST)
+
+    def _job() -> None:
+        try:
+            free = freeflow()
+            if free is not None:
+                record_observation(float(free), float(observed_s), when)
+        except Exception as e:
+            log.warning("[SPEED] failed to record traffic observation: %s", e)
+        finally:
+            _OBSERVATION_SLOTS.release()
+
+    try:
+        _OBSERVATION_EXECUTOR.submit(_job)
+    except RuntimeError:  # 종료 중
+        _OBSERVATION_SLOTS.release()
+        return False
+    return True
+
+
+def flush_observations() -> None:
+    _OBSERVATIONS.flush()
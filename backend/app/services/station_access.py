@@ -0,0 +1,350 @@
+# app/services/station_access.py
+"""
+도로 그래프 노드별 "가까운 지하철역 K개 + 도보 시간" 사전 계산 테이블.
+
+- 대중교통 시간 추정 / adjust_to_busy_station_area / generate_station_candidates 가
+  "여기서 가까운 역은?" 을 물을 때마다 Google fetch_nearby_stations(HTTP) 를 부르거나
+  역 주변 노드를 KD-tree 로 다시 훑었다.
+- build_seoul_graph.py 에서 drive 그래프의 모든 노드에 대해 한 번만 계산해 두고
+  서버는 배열 조회(노드당 O(1))만 한다.
+- 도보 시간은 walk 그래프가 있으면 역 → 반경 안 노드 Dijkstra(실제 보행 경로),
+  없으면 직선거리 × 우회 계수 추정.
+
+저장 위치: <drive 스냅샷 디렉토리>/station_access/
+    meta.json   : 포맷 버전, k, radius_m, graph_version, transit_version 등
+    station.npy : int32   (n_nodes, k)  역 인덱스 (TransitNetwork 역 순서, 없으면 -1)
+    walk_s.npy  : float32 (n_nodes, k)  도보 초 (가까운 순, 없으면 inf)
+노드 인덱스는 같은 디렉토리의 스냅샷(node_ids.npy)과 같다.
+역 인덱스는 지하철 데이터(SUBWAY_DATA_DIR) 순서라서 데이터가 바뀌면(transit_version) 무시한다.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .node_snapper import NodeSnapper, get_snapper
+from .road_graph import CSRGraph, read_array_meta, save_array_directory, snapshot_graph_version
+from .transit_network import (
+    TRANSIT_ACCESS_RADIUS_M,
+    WALK_SPEED_KMPH,
+    TransitNetwork,
+    walk_seconds,
+)
+
+log = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+STATION_ACCESS_FORMAT = 1
+STATION_ACCESS_DIR = "station_access"
+# 노드마다 저장할 역 수 / 역 탐색 도보 반경(m, 보행 경로 기준)
+STATION_ACCESS_K = int(os.getenv("STATION_ACCESS_K", "3"))
+STATION_ACCESS_RADIUS_M = float(os.getenv("STATION_ACCESS_RADIUS_M", str(TRANSIT_ACCESS_RADIUS_M)))
+# 좌표 → 노드 스냅 거리가 이보다 멀면 테이블을 쓰지 않는다
+STATION_ACCESS_MAX_SNAP_M = float(os.getenv("STATION_ACCESS_MAX_SNAP_M", "300"))
+
+
+def station_access_directory(snapshot_dir: PathLike) -> Path:
+    return Path(snapshot_dir) / STATION_ACCESS_DIR
+
+
+class StationAccessTable:
+    """노드 인덱스 → 가까운 역 K개 (역 인덱스, 도보 초). 역은 가까운 순."""
+
+    def __init__(
+        self,
+        node_ids: np.ndarray,
+        station: np.ndarray,
+        walk_s: np.ndarray,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.node_ids = node_ids
+        self.station = station
+        self.walk_s = walk_s
+        self.meta: Dict[str, Any] = dict(meta or {})
+
+    @property
+    def n_nodes(self) -> int:
+        return int(self.station.shape[0])
+
+    @property
+    def k(self) -> int:
+        return int(self.station.shape[1])
+
+    @property
+    def graph_version(self) -> Optional[str]:
+        return self.meta.get("graph_version")
+
+    @property
+    def transit_version(self) -> Optional[str]:
+        return self.meta.get("transit_version")
+
+    @property
+    def radius_m(self) -> float:
+        return float(self.meta.get("radius_m", STATION_ACCESS_RADIUS_M))
+
+    def index_of(self, node_id: int) -> int:
+        i = int(np.searchsorted(self.node_ids, node_id))
+        if i >= self.n_nodes or int(self.node_ids[i]) != int(node_id):
+            raise KeyError(node_id)
+        return i
+
+    def nearest(self, node_index: int) -> List[Tuple[int, float]]:
+        """노드 인덱스 → [(역 인덱스, 도보 초), ...] (가까운 순, 반경 안 역만)."""
+        row_s = self.station[node_index]
+        row_t = self.walk_s[node_index]
+        return [(int(s), float(t)) for s, t in zip(row_s, row_t) if s >= 0]
+
+    def egress_times(self, arrival: np.ndarray) -> np.ndarray:
+        """
+        역별 도착 시간(초, 역 인덱스 순) → 노드별 "역 도착 + 도보 이탈" 최솟값 (노드 인덱스 순).
+        반경 안에 역이 없거나 도달 못 한 역뿐이면 inf.
+        """
+        arrival = np.asarray(arrival, dtype=np.float64)
+        station = np.asarray(self.station)
+        valid = station >= 0
+        at = np.where(valid, arrival[np.where(valid, station, 0)], np.inf)
+        return np.min(at + np.asarray(self.walk_s, dtype=np.float64), axis=1)
+
+
+# ----------------------------------------------------------------------
+# 전처리 (build_seoul_graph.py)
+# ----------------------------------------------------------------------
+def _keep_k_nearest(
+    n_nodes: int,
+    node: np.ndarray,
+    station: np.ndarray,
+    seconds: np.ndarray,
+    k: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(노드, 역, 초) 후보 목록 → 노드마다 가장 가까운 역 k 개의 (n_nodes, k) 배열."""
+    out_station = np.full((n_nodes, k), -1, dtype=np.int32)
+    out_walk = np.full((n_nodes, k), np.inf, dtype=np.float32)
+    if node.size == 0:
+        return out_station, out_walk
+
+    order = np.lexsort((seconds, node))
+    node, station, seconds = node[order], station[order], seconds[order]
+    # 노드 그룹 안에서의 순위 (0 = 가장 가까운 역)
+    first = np.searchsorted(node, node, side="left")
+    rank = np.arange(node.size) - first
+    keep = rank < k
+    out_station[node[keep], rank[keep]] = station[keep]
+    out_walk[node[keep], rank[keep]] = seconds[keep]
+    return out_station, out_walk
+
+
+def build_station_access(
+    graph: CSRGraph,
+    network: TransitNetwork,
+    *,
+    walk_graph: Optional[CSRGraph] = None,
+    k: int = STATION_ACCESS_K,
+    radius_m: float = STATION_ACCESS_RADIUS_M,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> StationAccessTable:
+    """
+    graph(drive) 모든 노드 → 가까운 역 k 개 테이블.
+
+    walk_graph 가 있으면 역마다 walk 그래프에서 도보 반경만큼 Dijkstra 를 돌리고
+    (travel_time 기준), drive 노드는 가장 가까운 walk 노드의 값 + 스냅 구간 도보 시간을 쓴다.
+    없으면 역 반경 안 drive 노드까지 직선거리 기반 도보 추정.
+    """
+    t0 = time.perf_counter()
+    n = graph.n_nodes
+    walk_mps = WALK_SPEED_KMPH / 3.6
+    cutoff_s = radius_m / walk_mps
+
+    parts_node: List[np.ndarray] = []
+    parts_station: List[np.ndarray] = []
+    parts_seconds: List[np.ndarray] = []
+
+    if walk_graph is not None:
+        walk_snapper = NodeSnapper.from_graph(walk_graph)
+        # drive 노드 → 가장 가까운 walk 노드 (+ 그 구간 도보 시간)
+        drive_to_walk, drive_snap_m = walk_snapper.nearest_index(graph.x, graph.y)
+        drive_snap_s = np.asarray(drive_snap_m, dtype=np.float64) / walk_mps
+        station_walk, station_snap_m = walk_snapper.nearest_index(network.lng, network.lat)
+    else:
+        drive_snapper = NodeSnapper.from_graph(graph)
+
+    for s in range(network.n_stations):
+        if walk_graph is not None:
+            start_s = float(station_snap_m[s]) / walk_mps
+            dist = walk_graph.dijkstra(
+                int(station_walk[s]), weight="travel_time", cutoff=max(cutoff_s - start_s, 0.0)
+            )
+            seconds = dist[drive_to_walk] + drive_snap_s + start_s
+            idx = np.flatnonzero(seconds <= cutoff_s)
+            seconds = seconds[idx]
+        else:
+            idx, straight = drive_snapper.within_index(
+                float(network.lng[s]), float(network.lat[s]), radius_m
+            )
+            seconds = walk_seconds(straight)
+
+        parts_node.append(idx.astype(np.int64))
+        parts_station.append(np.full(idx.size, s, dtype=np.int32))
+        parts_seconds.append(np.asarray(seconds, dtype=np.float64))
+        if progress is not None and (s + 1) % 50 == 0:
+            progress(s + 1, network.n_stations)
+
+    station, walk = _keep_k_nearest(
+        n,
+        np.concatenate(parts_node) if parts_node else np.zeros(0, dtype=np.int64),
+        np.concatenate(parts_station) if parts_station else np.zeros(0, dtype=np.int32),
+        np.concatenate(parts_seconds) if parts_seconds else np.zeros(0, dtype=np.float64),
+        k,
+    )
+
+    meta = {
+        "format": STATION_ACCESS_FORMAT,
+        "k": int(k),
+        "radius_m": float(radius_m),
+        "graph_version": graph.graph_version,
+        "transit_version": network.version,
+        "walk_graph_version": walk_graph.graph_version if walk_graph is not None else None,
+        "n_stations": network.n_stations,
+        "nodes_with_station": int(np.count_nonzero(station[:, 0] >= 0)),
+        "build_seconds": round(time.perf_counter() - t0, 1),
+    }
+    return StationAccessTable(np.asarray(graph.node_ids), station, walk, meta)
+
+
+def save_station_access(table: StationAccessTable, snapshot_dir: PathLike) -> Path:
+    """스냅샷 디렉토리 아래 station_access/ 에 저장하고 경로를 반환."""
+    out = station_access_directory(snapshot_dir)
+    arrays = {
+        "station": np.ascontiguousarray(table.station, dtype=np.int32),
+        "walk_s": np.ascontiguousarray(table.walk_s, dtype=np.float32),
+    }
+    table.meta = save_array_directory(out, arrays, table.meta)
+    return out
+
+
+def load_station_access(
+    snapshot_dir: PathLike,
+    network: TransitNetwork,
+    mmap: bool = True,
+) -> Optional[StationAccessTable]:
+    """
+    스냅샷 디렉토리의 station_access/ 를 로드.
+    없거나, 스냅샷 graph_version / 지하철 데이터 version 과 맞지 않으면 None.
+    """
+    src = Path(snapshot_dir)
+    sa_dir = station_access_directory(src)
+    graph_version = snapshot_graph_version(src)
+    if graph_version is None:
+        return None
+    meta = read_array_meta(
+        sa_dir,
+        STATION_ACCESS_FORMAT,
+        "STATION",
+        {"graph_version": graph_version, "transit_version": network.version},
+    )
+    if meta is None:
+        return None
+
+    mmap_mode = "r" if mmap else None
+    return StationAccessTable(
+        node_ids=np.load(src / "node_ids.npy", mmap_mode=mmap_mode),
+        station=np.load(sa_dir / "station.npy", mmap_mode=mmap_mode),
+        walk_s=np.load(sa_dir / "walk_s.npy", mmap_mode=mmap_mode),
+        meta=meta,
+    )
+
+
+# ----------------------------------------------------------------------
+# 등록 / 조회
+# ----------------------------------------------------------------------
+# 그래프 이름("drive") → (StationAccessTable, TransitNetwork)
+_TABLES: Dict[str, Tuple[StationAccessTable, TransitNetwork]] = {}
+
+
+def register_station_access(
+    name: str,
+    table: StationAccessTable,
+    network: TransitNetwork,
+) -> StationAccessTable:
+    """그래프를 로드한 쪽에서 1회 호출. network.times_to_nodes() 도 이 테이블을 쓰게 된다."""
+    _TABLES[name] = (table, network)
+    network.attach_station_access(table)
+    log.info(
+        "[STATION] %s: %d nodes, k=%d, radius=%.0fm (%s nodes near a station)",
+        name,
+        table.n_nodes,
+        table.k,
+        table.radius_m,
+        table.meta.get("nodes_with_station", "?"),
+    )
+    return table
+
+
+def get_station_access(name: str = "drive") -> Optional[StationAccessTable]:
+    entry = _TABLES.get(name)
+    return entry[0] if entry is not None else None
+
+
+def _station_dict(network: TransitNetwork, s: int, walk_s: float, straight_m: float) -> Dict[str, Any]:
+    """fetch_nearby_stations() 결과(Google Places)와 같은 모양 + 도보 시간."""
+    return {
+        "name": network.names[s],
+        "place_id": None,
+        "station_id": network.station_ids[s],
+        "types": ["subway_station", "transit_station"],
+        "geometry": {"location": {"lat": float(network.lat[s]), "lng": float(network.lng[s])}},
+        "walk_seconds": int(round(walk_s)),
+        "distance_meters": int(round(straight_m)),
+        "source": "local_transit",
+    }
+
+
+def nearby_stations(
+    lat: float,
+    lng: float,
+    radius_m: float,
+    limit: Optional[int] = None,
+    graph: str = "drive",
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    (lat, lng) 반경 radius_m 안 지하철역 (도보 시간 가까운 순, fetch_nearby_stations 대체).
+
+    - 역 좌표 KD-tree 로 후보를 찾고, 가까운 노드의 사전 계산 테이블에 있는 역은
+      보행 경로 기준 도보 시간, 나머지는 직선거리 추정을 쓴다.
+    - 지하철 데이터가 로드되지 않았으면 None (호출하는 쪽이 Google 로 넘어가면 된다).
+    """
+    entry = _TABLES.get(graph)
+    if entry is None:
+        return None
+    table, network = entry
+
+    idx, straight = network.stations_within(lat, lng, radius_m)
+    walk = walk_seconds(straight)
+
+    snapper = get_snapper(graph)
+    if snapper is not None and idx.size:
+        (node_id,), (snap_m,) = snapper.nearest_with_distance([(lng, lat)])
+        if snap_m <= STATION_ACCESS_MAX_SNAP_M:
+            try:
+                row = dict(table.nearest(table.index_of(node_id)))
+            except KeyError:
+                row = {}
+            snap_s = snap_m / (WALK_SPEED_KMPH / 3.6)
+            walk = np.array(
+                [row[s] + snap_s if s in row else w for s, w in zip(idx.tolist(), walk)]
+            )
+
+    order = np.argsort(walk, kind="stable")
+    if limit is not None:
+        order = order[:limit]
+    return [
+        _station_dict(network, int(idx[i]), float(walk[i]), float(straight[i]))
+        for i in order
+        if math.isfinite(walk[i])
+    ]
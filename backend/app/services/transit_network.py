@@ -0,0 +1,610 @@
+# app/services/transit_network.py
+"""
+로컬 지하철 네트워크 모델 — 역 간 이동시간을 외부 API 없이 계산.
+
+- 중간 지점 탐색의 대중교통 시간은 지금까지 "직선거리 × 1.2 / 25km/h + 5분" 추정이고,
+  실제 값은 Google Routes TRANSIT 호출(느리고 호출 한도 있음)로만 얻을 수 있었다.
+- 여기서는 역/노선/역간 운행시간/환승 시간 데이터(CSV)를 읽어
+  RAPTOR 방식(라운드 = 탑승 횟수)으로 출발 역들 → 모든 역 도착시간을 구하고,
+  도보 접근(출발지 → 역) / 도보 이탈(역 → 목적지)을 붙여 문 앞 ~ 문 앞 시간을 만든다.
+- 시간표가 아니라 배차간격 기반 모델이다: 탈 때마다 배차간격의 절반을 기다린다고 본다.
+
+데이터 (SUBWAY_DATA_DIR, 기본 backend/data/subway — build_seoul_graph.py 가 OSM 노선(route) 관계로 생성,
+      운영 데이터(역간 실제 운행시간/배차간격)가 있으면 같은 형식으로 바꿔 넣어도 된다)
+    stations.csv   : station_id, name, lat, lng
+    lines.csv      : line_id, name, headway_s, circular(0/1, 생략 시 0)
+    line_stops.csv : line_id, seq, station_id, run_s
+                     (seq 순서대로 정렬, run_s = 직전 역 → 이 역 운행 초.
+                      첫 역의 run_s 는 순환선이면 마지막 역 → 첫 역, 아니면 무시)
+    transfers.csv  : from_station_id, to_station_id, transfer_s   (선택)
+                     (노선별로 역 id 가 다른 환승역 등, 서로 다른 역 id 사이 도보 시간. 양방향 적용)
+- 지선(예: 2호선 성수지선)은 별도 line_id 로 넣는다. 양방향 운행으로 본다.
+- 같은 역 id 에서 다른 노선으로 갈아탈 때는 TRANSIT_TRANSFER_PENALTY_S 를 더한다.
+"""
+from __future__ import annotations
+
+import csv
+import hashlib
+import logging
+import math
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .local_routing import local_travel_matrix
+from .node_snapper import NodeSnapper
+from .road_graph import CSRGraph
+
+log = logging.getLogger(__name__)
+
+SUBWAY_DATA_DIR = Path(
+    os.getenv(
+        "SUBWAY_DATA_DIR",
+        str(Path(__file__).resolve().parents[2] / "data" / "subway"),
+    )
+)
+# 같은 역에서 노선을 갈아탈 때 추가 시간 (승강장 이동)
+TRANSIT_TRANSFER_PENALTY_S = float(os.getenv("TRANSIT_TRANSFER_PENALTY_S", "180"))
+# 최대 탑승 횟수 (5 = 환승 4회)
+TRANSIT_MAX_ROUNDS = int(os.getenv("TRANSIT_MAX_ROUNDS", "5"))
+# 출발지/목적지에서 걸어갈 역 탐색 반경
+TRANSIT_ACCESS_RADIUS_M = float(os.getenv("TRANSIT_ACCESS_RADIUS_M", "1500"))
+# lines.csv 에 headway_s 가 비어 있을 때
+DEFAULT_HEADWAY_S = 300.0
+
+# OSM 으로 데이터를 만들 때 (build_subway_tables_from_osm)
+# - 역간 운행 초 = 역간 직선거리 / 표정속도 (정차 시간 포함 평균 속도, OSM 에는 운행시간이 없다)
+SUBWAY_OSM_SPEED_KMPH = 33.0
+SUBWAY_OSM_MIN_RUN_S = 60.0
+# 같은 이름의 정차 위치를 한 역으로 합치는 거리 (노선별 승강장 / 방향별 정차 위치)
+SUBWAY_OSM_MERGE_M = 500.0
+# 이름이 다른 역끼리 이 거리 안이면 도보 환승 (transfers.csv)
+SUBWAY_OSM_TRANSFER_M = 300.0
+
+# 도보 그래프가 없을 때 직선거리 → 도보 시간 환산
+WALK_SPEED_KMPH = 4.5
+WALK_DETOUR_FACTOR = 1.3
+
+
+def walk_seconds(straight_m: Any) -> Any:
+    """직선거리(m, 스칼라 또는 배열) → 도보 시간(초) 추정."""
+    return straight_m * WALK_DETOUR_FACTOR / (WALK_SPEED_KMPH / 3.6)
+
+
+@dataclass
+class TransitLine:
+    line_id: str
+    name: str
+    headway_s: float
+    circular: bool
+    stops: List[int]          # 역 인덱스 (seq 순)
+    runs: List[float]         # runs[i] = stops[i-1] → stops[i] 운행 초 (순환선이면 runs[0] = 마지막 → 첫 역)
+    # 스캔용 (역 순서, 각 역에 도착하기까지 직전 구간 운행 초) — 정방향/역방향
+    directions: List[Tuple[List[int], List[float]]] = field(default_factory=list)
+
+    def build_directions(self) -> None:
+        n = len(self.stops)
+        fwd_stops = list(self.stops)
+        fwd_runs = [0.0] + list(self.runs[1:])
+        # 역방향: rev[i-1] → rev[i] 구간 = 정방향 stops[n-i] ← stops[n-1-i] 구간
+        bwd_stops = fwd_stops[::-1]
+        bwd_runs = [0.0] + [self.runs[n - i] for i in range(1, n)]
+        if self.circular and n > 1:
+            # 한 바퀴를 넘어가는 경로도 스캔되도록 두 바퀴 이어 붙인다
+            wrap = float(self.runs[0])
+            fwd_stops, fwd_runs = fwd_stops * 2, fwd_runs + [wrap] + fwd_runs[1:]
+            bwd_stops, bwd_runs = bwd_stops * 2, bwd_runs + [wrap] + bwd_runs[1:]
+        self.directions = [(fwd_stops, fwd_runs), (bwd_stops, bwd_runs)]
+
+
+class TransitNetwork:
+    def __init__(
+        self,
+        station_ids: List[str],
+        names: List[str],
+        lat: np.ndarray,
+        lng: np.ndarray,
+        lines: List[TransitLine],
+        footpaths: Dict[int, List[Tuple[int, float]]],
+        version: str,
+    ) -> None:
+        self.station_ids = station_ids
+        self.names = names
+        self.lat = np.asarray(lat, dtype=np.float64)
+        self.lng = np.asarray(lng, dtype=np.float64)
+        self.lines = lines
+        self.footpaths = footpaths
+        self.version = version
+
+        # 역 → [(노선 인덱스, ...)] (라운드마다 표시된 역이 있는 노선만 스캔)
+        self._lines_at: List[List[int]] = [[] for _ in station_ids]
+        for li, line in enumerate(lines):
+            line.build_directions()
+            for s in set(line.stops):
+                self._lines_at[s].append(li)
+
+        # 역 좌표 KD-tree (노드 id = 역 인덱스)
+        self._stations = NodeSnapper(np.arange(len(station_ids)), self.lng, self.lat)
+        # 그래프 버전 → 그래프 노드 KD-tree (역 → 주변 노드 이탈 시간 계산용)
+        self._node_snappers: Dict[str, NodeSnapper] = {}
+        # 그래프 버전 → 노드별 가까운 역 사전 계산 테이블 (station_access.register_station_access)
+        self._access_tables: Dict[str, Any] = {}
+
+    @property
+    def n_stations(self) -> int:
+        return len(self.station_ids)
+
+    def stations_within(self, lat: float, lng: float, radius_m: float) -> Tuple[np.ndarray, np.ndarray]:
+        """(lat, lng) 반경 radius_m 안 역 (역 인덱스 배열, 직선거리[m] 배열)."""
+        return self._stations.within_index(lng, lat, radius_m)
+
+    def attach_station_access(self, table: Any) -> None:
+        """StationAccessTable 을 붙이면 같은 그래프의 times_to_nodes() 가 역 → 노드 탐색 대신 테이블을 쓴다."""
+        self._access_tables[table.graph_version] = table
+
+    # ------------------------------------------------------------------
+    # 역 간 (RAPTOR)
+    # ------------------------------------------------------------------
+    def raptor(
+        self,
+        access: Dict[int, float],
+        max_rounds: Optional[int] = None,
+    ) -> np.ndarray:
+        """
+        access {역 인덱스: 출발 시점부터 그 역 승강장까지 초} → 모든 역 도착 시간(초, 도달 불가 inf).
+
+        라운드 k 에서는 직전 라운드에 시간이 줄어든 역이 있는 노선만 양방향으로 훑고,
+        그 뒤 transfers.csv 의 역 간 도보 환승을 적용한다.
+        """
+        rounds = TRANSIT_MAX_ROUNDS if max_rounds is None else int(max_rounds)
+        inf = math.inf
+        best = [inf] * self.n_stations
+        for s, t in access.items():
+            if t < best[s]:
+                best[s] = float(t)
+        marked = {s for s in access if math.isfinite(best[s])}
+        # 출발 역에서 바로 이어지는 도보 환승 (라운드 0)
+        self._relax_footpaths(best, marked)
+
+        for round_no in range(1, rounds + 1):
+            if not marked:
+                break
+            prev = list(best)
+            extra = TRANSIT_TRANSFER_PENALTY_S if round_no > 1 else 0.0
+            lines = {li for s in marked for li in self._lines_at[s]}
+            new_marked = set()
+
+            for li in lines:
+                line = self.lines[li]
+                wait = line.headway_s / 2.0 + extra
+                for stops, runs in line.directions:
+                    ride = inf
+                    for i, s in enumerate(stops):
+                        if ride < inf:
+                            ride += runs[i]
+                            if ride < best[s]:
+                                best[s] = ride
+                                new_marked.add(s)
+                        if s in marked:
+                            board = prev[s] + wait
+                            if board < ride:
+                                ride = board
+
+            self._relax_footpaths(best, new_marked)
+            marked = new_marked
+
+        return np.asarray(best, dtype=np.float64)
+
+    def _relax_footpaths(self, best: List[float], marked: Set[int]) -> None:
+        """marked 역에서 도보 환승으로 더 빨리 갈 수 있는 역을 갱신하고 marked 에 추가 (연쇄 포함)."""
+        if not self.footpaths:
+            return
+        stack = list(marked)
+        while stack:
+            s = stack.pop()
+            for t, walk_s in self.footpaths.get(s, ()):
+                if best[s] + walk_s < best[t]:
+                    best[t] = best[s] + walk_s
+                    marked.add(t)
+                    stack.append(t)
+
+    # ------------------------------------------------------------------
+    # 도보 접근 / 이탈
+    # ------------------------------------------------------------------
+    def access_times(
+        self,
+        lat: float,
+        lng: float,
+        radius_m: Optional[float] = None,
+    ) -> Dict[int, float]:
+        """(lat, lng) 에서 반경 안 역까지 도보 초 (walk 그래프가 있으면 실제 경로, 없으면 직선 추정)."""
+        r = TRANSIT_ACCESS_RADIUS_M if radius_m is None else float(radius_m)
+        idx, straight = self._stations.within_index(lng, lat, r)
+        if idx.size == 0:
+            return {}
+
+        walk = walk_seconds(straight)
+        m = local_travel_matrix(
+            [(lat, lng)],
+            [(float(self.lat[s]), float(self.lng[s])) for s in idx],
+            mode="walking",
+        )
+        if m is not None:
+            routed = m["durations_seconds"][0]
+            walk = np.array(
+                [w if r_s is None else float(r_s) for w, r_s in zip(walk, routed)]
+            )
+        return {int(s): float(t) for s, t in zip(idx, walk)}
+
+    def travel_time(
+        self,
+        start_lat: float,
+        start_lng: float,
+        goal_lat: float,
+        goal_lng: float,
+    ) -> Dict[str, Any]:
+        """
+        문 앞 ~ 문 앞 대중교통 시간 추정 (get_travel_time 과 같은 모양).
+        지하철보다 걸어가는 게 빠르면 도보 시간.
+        """
+        duration = self.travel_times_from(start_lat, start_lng, [(goal_lat, goal_lng)])[0]
+        return {
+            "duration_seconds": int(round(duration)),
+            "distance_meters": None,
+            "mode": "transit",
+            "success": True,
+            "is_estimated": True,
+            "source": "local_transit",
+        }
+
+    def travel_times_from(
+        self,
+        start_lat: float,
+        start_lng: float,
+        goals: Sequence[Tuple[float, float]],  # [(lat, lng), ...]
+    ) -> List[float]:
+        """출발지 1곳 → 여러 도착지 대중교통 시간(초). RAPTOR 는 1번만 돈다."""
+        arrival = self.raptor(self.access_times(start_lat, start_lng))
+        out: List[float] = []
+        for goal_lat, goal_lng in goals:
+            egress = self.access_times(goal_lat, goal_lng)
+            via = min(
+                (arrival[s] + t for s, t in egress.items() if math.isfinite(arrival[s])),
+                default=math.inf,
+            )
+            straight = _haversine_m(start_lat, start_lng, goal_lat, goal_lng)
+            out.append(min(via, float(walk_seconds(straight))))
+        return out
+
+    def _snapper_for(self, graph: CSRGraph) -> NodeSnapper:
+        key = graph.graph_version
+        snapper = self._node_snappers.get(key)
+        if snapper is None:
+            # CSRGraph 노드 인덱스 순서 그대로 (within_index 결과를 배열 인덱스로 바로 쓴다)
+            snapper = self._node_snappers[key] = NodeSnapper.from_graph(graph)
+        return snapper
+
+    def times_to_nodes(self, graph: CSRGraph, lat: float, lng: float) -> np.ndarray:
+        """
+        (lat, lng) 에서 graph 의 모든 노드까지 대중교통 시간(초, 노드 인덱스 순서 배열).
+        = min(직선 도보 추정, 역 도착 시간 + 역 → 노드 도보 추정)
+        graph 용 역 접근 테이블이 붙어 있으면 노드마다 가까운 역 K개만 본다 (보행 경로 기준).
+        """
+        out = walk_seconds(graph.haversine_from(lat, lng))
+        arrival = self.raptor(self.access_times(lat, lng))
+        table = self._access_tables.get(graph.graph_version)
+        if table is not None:
+            return np.minimum(out, table.egress_times(arrival))
+
+        snapper = self._snapper_for(graph)
+        for s in np.flatnonzero(np.isfinite(arrival)):
+            idx, straight = snapper.within_index(
+                float(self.lng[s]), float(self.lat[s]), TRANSIT_ACCESS_RADIUS_M
+            )
+            if idx.size:
+                out[idx] = np.minimum(out[idx], arrival[s] + walk_seconds(straight))
+        return out
+
+
+def _haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    r = 6371000.0
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * r * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+# ----------------------------------------------------------------------
+# 로드
+# ----------------------------------------------------------------------
+def _read_csv(path: Path) -> List[Dict[str, str]]:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [{k.strip(): (v or "").strip() for k, v in row.items()} for row in csv.DictReader(f)]
+
+
+def load_transit_network(data_dir: Path) -> TransitNetwork:
+    """SUBWAY_DATA_DIR 형식의 CSV 묶음을 읽는다. 형식이 틀리면 ValueError."""
+    data_dir = Path(data_dir)
+    h = hashlib.sha1()
+    for name in ("stations.csv", "lines.csv", "line_stops.csv", "transfers.csv"):
+        if (data_dir / name).exists():
+            h.update((data_dir / name).read_bytes())
+
+    station_rows = _read_csv(data_dir / "stations.csv")
+    index: Dict[str, int] = {}
+    ids: List[str] = []
+    names: List[str] = []
+    lat: List[float] = []
+    lng: List[float] = []
+    for row in station_rows:
+        sid = row["station_id"]
+        if sid in index:
+            raise ValueError(f"stations.csv: duplicated station_id {sid!r}")
+        index[sid] = len(ids)
+        ids.append(sid)
+        names.append(row.get("name", ""))
+        lat.append(float(row["lat"]))
+        lng.append(float(row["lng"]))
+
+    def station(sid: str, where: str) -> int:
+        if sid not in index:
+            raise ValueError(f"{where}: unknown station_id {sid!r}")
+        return index[sid]
+
+    line_meta = {row["line_id"]: row for row in _read_csv(data_dir / "lines.csv")}
+    stops_by_line: Dict[str, List[Tuple[int, int, float]]] = {}
+    for row in _read_csv(data_dir / "line_stops.csv"):
+        lid = row["line_id"]
+        if lid not in line_meta:
+            raise ValueError(f"line_stops.csv: unknown line_id {lid!r}")
+        stops_by_line.setdefault(lid, []).append(
+            (int(row["seq"]), station(row["station_id"], "line_stops.csv"), float(row.get("run_s") or 0))
+        )
+
+    lines: List[TransitLine] = []
+    for lid, rows in stops_by_line.items():
+        rows.sort()
+        meta = line_meta[lid]
+        lines.append(
+            TransitLine(
+                line_id=lid,
+                name=meta.get("name", lid),
+                headway_s=float(meta.get("headway_s") or DEFAULT_HEADWAY_S),
+                circular=meta.get("circular", "0").lower() in ("1", "true", "y", "yes"),
+                stops=[s for _, s, _ in rows],
+                runs=[r for _, _, r in rows],
+            )
+        )
+
+    footpaths: Dict[int, List[Tuple[int, float]]] = {}
+    if (data_dir / "transfers.csv").exists():
+        for row in _read_csv(data_dir / "transfers.csv"):
+            a = station(row["from_station_id"], "transfers.csv")
+            b = station(row["to_station_id"], "transfers.csv")
+            t = float(row["transfer_s"])
+            footpaths.setdefault(a, []).append((b, t))
+            footpaths.setdefault(b, []).append((a, t))
+
+    return TransitNetwork(
+        station_ids=ids,
+        names=names,
+        lat=np.asarray(lat),
+        lng=np.asarray(lng),
+        lines=lines,
+        footpaths=footpaths,
+        version=h.hexdigest()[:16],
+    )
+
+
+# ----------------------------------------------------------------------
+# OSM 노선 관계 → CSV (build_seoul_graph.py)
+# ----------------------------------------------------------------------
+def _osm_station_name(name: str) -> str:
+    """"시청역", "시청 (1호선)" → "시청" (같은 역의 노선별 정차 위치를 합치는 키)."""
+    name = name.split("(")[0].strip()
+    if name.endswith("역") and len(name) > 1:
+        name = name[:-1]
+    return name.replace(" ", "")
+
+
+def _osm_headway_s(interval: str) -> str:
+    """route 관계의 interval 태그 ("5", "00:05", "00:05:00") → 초 (모르면 빈 값 = DEFAULT_HEADWAY_S)."""
+    parts = interval.strip().split(":")
+    try:
+        if len(parts) == 1:
+            return str(int(float(parts[0]) * 60))
+        if len(parts) in (2, 3):
+            return str(int(parts[0]) * 3600 + int(parts[1]) * 60 + (int(parts[2]) if len(parts) == 3 else 0))
+    except ValueError:
+        pass
+    return ""
+
+
+def build_subway_tables_from_osm(
+    elements: Sequence[Dict[str, Any]],
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Overpass 결과(route 관계 + 정차 노드, [out:json] 의 elements) → SUBWAY_DATA_DIR 형식의 CSV 행.
+
+    - 정차 위치(stop / stop_entry_only / stop_exit_only 노드)를 이름 + SUBWAY_OSM_MERGE_M 거리로 합쳐 역을 만든다.
+    - 방향별 관계 / 급행처럼 같은 노선(ref)의 역 집합에 이미 포함되는 관계는 버린다 (양방향 완행으로 모델링).
+      지선처럼 새 역이 있는 관계는 별도 line 으로 남는다.
+    - 첫 역과 마지막 역이 같거나 roundtrip=yes 면 순환선.
+    - 운행 초는 역간 직선거리 / SUBWAY_OSM_SPEED_KMPH 추정, 배차간격은 interval 태그 (없으면 기본값).
+    """
+    nodes = {e["id"]: e for e in elements if e.get("type") == "node"}
+    relations = sorted(
+        (e for e in elements if e.get("type") == "relation"), key=lambda e: e["id"]
+    )
+
+    # 역: 정규화한 이름 → [(역 인덱스)] , 역마다 좌표 합계
+    station_osm_id: List[int] = []
+    station_name: List[str] = []
+    sum_lat: List[float] = []
+    sum_lng: List[float] = []
+    count: List[int] = []
+    by_name: Dict[str, List[int]] = {}
+
+    def station_of(node: Dict[str, Any]) -> Optional[int]:
+        tags = node.get("tags") or {}
+        raw = tags.get("name:ko") or tags.get("name") or ""
+        key = _osm_station_name(raw)
+        if not key:
+            return None
+        lat, lng = float(node["lat"]), float(node["lon"])
+        for s in by_name.get(key, []):
+            if _haversine_m(lat, lng, sum_lat[s] / count[s], sum_lng[s] / count[s]) <= SUBWAY_OSM_MERGE_M:
+                sum_lat[s] += lat
+                sum_lng[s] += lng
+                count[s] += 1
+                return s
+        s = len(station_osm_id)
+        station_osm_id.append(int(node["id"]))
+        station_name.append(raw.split("(")[0].strip() or key)
+        sum_lat.append(lat)
+        sum_lng.append(lng)
+        count.append(1)
+        by_name.setdefault(key, []).append(s)
+        return s
+
+    routes: List[Tuple[Dict[str, Any], List[int], bool]] = []
+    for rel in relations:
+        tags = rel.get("tags") or {}
+        stops: List[int] = []
+        for m in rel.get("members", []):
+            if m.get("type") != "node" or not str(m.get("role", "")).startswith("stop"):
+                continue
+            node = nodes.get(m.get("ref"))
+            if node is None or "lat" not in node:
+                continue
+            s = station_of(node)
+            if s is not None and (not stops or stops[-1] != s):
+                stops.append(s)
+        circular = tags.get("roundtrip") == "yes"
+        if len(stops) > 2 and stops[0] == stops[-1]:
+            stops.pop()
+            circular = True
+        if len(stops) >= 2:
+            routes.append((rel, stops, circular))
+
+    # 같은 노선(ref, 없으면 이름) 안에서 역이 많은 관계부터, 새 역이 없는 관계는 버린다
+    groups: Dict[str, List[Tuple[Dict[str, Any], List[int], bool]]] = {}
+    for route in routes:
+        tags = route[0].get("tags") or {}
+        groups.setdefault(tags.get("ref") or tags.get("name") or str(route[0]["id"]), []).append(route)
+    kept: List[Tuple[Dict[str, Any], List[int], bool]] = []
+    for key in sorted(groups):
+        covered: Set[int] = set()
+        for route in sorted(groups[key], key=lambda r: (-len(set(r[1])), r[0]["id"])):
+            if set(route[1]) <= covered:
+                continue
+            covered |= set(route[1])
+            kept.append(route)
+
+    used = sorted({s for _, stops, _ in kept for s in stops})
+    sid = {s: f"osm{station_osm_id[s]}" for s in used}
+    lat = {s: sum_lat[s] / count[s] for s in used}
+    lng = {s: sum_lng[s] / count[s] for s in used}
+    speed_mps = SUBWAY_OSM_SPEED_KMPH / 3.6
+
+    def run_s(a: int, b: int) -> int:
+        return int(round(max(SUBWAY_OSM_MIN_RUN_S, _haversine_m(lat[a], lng[a], lat[b], lng[b]) / speed_mps)))
+
+    stations = [
+        {"station_id": sid[s], "name": station_name[s], "lat": f"{lat[s]:.7f}", "lng": f"{lng[s]:.7f}"}
+        for s in used
+    ]
+    lines: List[Dict[str, Any]] = []
+    line_stops: List[Dict[str, Any]] = []
+    for rel, stops, circular in kept:
+        tags = rel.get("tags") or {}
+        lid = f"osm{rel['id']}"
+        lines.append(
+            {
+                "line_id": lid,
+                "name": tags.get("name") or tags.get("ref") or lid,
+                "headway_s": _osm_headway_s(tags.get("interval", "")),
+                "circular": 1 if circular else 0,
+            }
+        )
+        for seq, s in enumerate(stops):
+            prev = stops[seq - 1] if seq else (stops[-1] if circular else None)
+            line_stops.append(
+                {
+                    "line_id": lid,
+                    "seq": seq,
+                    "station_id": sid[s],
+                    "run_s": run_s(prev, s) if prev is not None else 0,
+                }
+            )
+
+    transfers: List[Dict[str, Any]] = []
+    for i, a in enumerate(used):
+        for b in used[i + 1:]:
+            d = _haversine_m(lat[a], lng[a], lat[b], lng[b])
+            if d <= SUBWAY_OSM_TRANSFER_M:
+                transfers.append(
+                    {"from_station_id": sid[a], "to_station_id": sid[b], "transfer_s": int(round(walk_seconds(d)))}
+                )
+
+    return {
+        "stations.csv": stations,
+        "lines.csv": lines,
+        "line_stops.csv": line_stops,
+        "transfers.csv": transfers,
+    }
+
+
+def save_subway_tables(tables: Dict[str, List[Dict[str, Any]]], data_dir: Path = SUBWAY_DATA_DIR) -> Path:
+    """build_subway_tables_from_osm 결과를 CSV 로 저장 (파일마다 임시 파일에 쓴 뒤 교체)."""
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    columns = {
+        "stations.csv": ["station_id", "name", "lat", "lng"],
+        "lines.csv": ["line_id", "name", "headway_s", "circular"],
+        "line_stops.csv": ["line_id", "seq", "station_id", "run_s"],
+        "transfers.csv": ["from_station_id", "to_station_id", "transfer_s"],
+    }
+    for name, fields in columns.items():
+        tmp = data_dir / f".{name}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(tables.get(name, []))
+        os.replace(tmp, data_dir / name)
+    return data_dir
+
+
+_NETWORK: Optional[TransitNetwork] = None
+_NETWORK_LOADED = False
+_NETWORK_LOCK = threading.Lock()
+
+
+def get_transit_network() -> Optional[TransitNetwork]:
+    """SUBWAY_DATA_DIR 를 처음 호출 시 1회 로드. 데이터가 없거나 깨져 있으면 None (기존 추정 사용)."""
+    global _NETWORK, _NETWORK_LOADED
+    if _NETWORK_LOADED:
+        return _NETWORK
+    with _NETWORK_LOCK:
+        if not _NETWORK_LOADED:
+            if (SUBWAY_DATA_DIR / "stations.csv").exists():
+                try:
+                    _NETWORK = load_transit_network(SUBWAY_DATA_DIR)
+                    log.info(
+                        "[TRANSIT] loaded %s (stations=%d, lines=%d, version=%s)",
+                        SUBWAY_DATA_DIR,
+                        _NETWORK.n_stations,
+                        len(_NETWORK.lines),
+                        _NETWORK.version,
+                    )
+                except (OSError, KeyError, ValueError) as e:
+                    log.error("[TRANSIT] failed to load %s: %s", SUBWAY_DATA_DIR, e)
+            else:
+                log.info("[TRANSIT] no subway data at %s, using straight-line estimate", SUBWAY_DATA_DIR)
+            _NETWORK_LOADED = True
+    return _NETWORK
@@ -0,0 +1,381 @@
+# app/services/travel_time_cache.py
+"""
+외부 이동시간 API(Google Routes/Directions, Naver Directions) 결과 영구 캐시.
+
+- 같은 출발지/도착지 쌍을 플랜·코스를 다시 계산할 때마다 또 물어보던 것을
+  로컬 SQLite 파일에 저장해 두고 재사용한다 (서버 재시작 / 워커 프로세스 간 공유).
+- 키: (공급자, 이동수단, 출발 셀, 도착 셀, 출발 시간대)
+    * 셀: 위경도를 TRAVEL_CACHE_CELL_M(기본 75m) 격자로 스냅한 "i:j"
+      (geohash 는 7자리가 약 150m, 8자리가 약 38m 라 50~100m 에 맞는 단계가 없어서 고정 격자 사용)
+    * 출발 시간대: 자동차/대중교통은 KST 기준 (평일/토/일, 시) — 교통량·배차가 시간대마다 다르다.
+      도보는 시간대 구분 없음.
+- 이동수단별 TTL 이 지난 항목은 조회 시 miss 로 치고, 쓰기 TRAVEL_CACHE_SWEEP_EVERY 번마다
+  만료 항목 정리 + 행 수가 TRAVEL_CACHE_MAX_ROWS 를 넘으면 만료가 가까운 것부터 지운다.
+- put 은 async 코드에서 바로 불리므로 SQLite 를 건드리지 않는다. 메모리 대기열에 넣기만 하고
+  전용 쓰기 스레드가 모아서 한 트랜잭션으로 commit + 정리한다 (commit 전에도 get 에서 보인다).
+  async 코드의 조회는 aget (스레드에서 SQLite 조회).
+- 성공한 실측값(is_estimated 가 아닌 것)만 저장한다. 로컬 그래프 추정치는 저장하지 않음.
+
+환경변수
+- TRAVEL_CACHE_PATH        : SQLite 파일 경로 (기본 seoul_graph_out/travel_time_cache.sqlite)
+- TRAVEL_CACHE_MAX_ROWS    : 최대 행 수, 0 이면 캐시 사용 안 함 (기본 200000)
+- TRAVEL_CACHE_CELL_M      : 스냅 격자 크기 m (기본 75)
+- TRAVEL_CACHE_TTL_<MODE>_S: 이동수단별 TTL 초 (DRIVING 7일, TRANSIT 7일, WALKING 30일)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .speed_profile import KST
+
+log = logging.getLogger(__name__)
+
+TRAVEL_CACHE_PATH = Path(
+    os.getenv(
+        "TRAVEL_CACHE_PATH",
+        str(Path(__file__).resolve().parents[2] / "seoul_graph_out" / "travel_time_cache.sqlite"),
+    )
+)
+TRAVEL_CACHE_MAX_ROWS = int(os.getenv("TRAVEL_CACHE_MAX_ROWS", "200000"))
+TRAVEL_CACHE_CELL_M = float(os.getenv("TRAVEL_CACHE_CELL_M", "75"))
+TRAVEL_CACHE_SWEEP_EVERY = int(os.getenv("TRAVEL_CACHE_SWEEP_EVERY", "500"))
+
+_DAY_S = 24 * 3600
+TRAVEL_CACHE_TTL_S = {
+    "driving": float(os.getenv("TRAVEL_CACHE_TTL_DRIVING_S", str(7 * _DAY_S))),
+    "transit": float(os.getenv("TRAVEL_CACHE_TTL_TRANSIT_S", str(7 * _DAY_S))),
+    "walking": float(os.getenv("TRAVEL_CACHE_TTL_WALKING_S", str(30 * _DAY_S))),
+}
+_DEFAULT_TTL_S = 1 * _DAY_S
+
+# 격자 기준 위도 (서울). 경도 간격을 이 위도에서 TRAVEL_CACHE_CELL_M 이 되게 잡는다.
+_REF_LAT = 37.55
+_M_PER_DEG_LAT = 111_320.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS travel_time (
+    provider    TEXT    NOT NULL,
+    mode        TEXT    NOT NULL,
+    o_cell      TEXT    NOT NULL,
+    d_cell      TEXT    NOT NULL,
+    bucket      TEXT    NOT NULL,
+    duration_s  INTEGER NOT NULL,
+    distance_m  INTEGER,
+    source      TEXT,
+    created_at  REAL    NOT NULL,
+    expires_at  REAL    NOT NULL,
+    PRIMARY KEY (provider, mode, o_cell, d_cell, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS travel_time_expires ON travel_time (expires_at);
+"""
+
+
+def snap_cell(lat: float, lng: float, cell_m: float = TRAVEL_CACHE_CELL_M) -> str:
+    """위경도 → 고정 격자 셀 id "i:j" (셀 한 변 약 cell_m 미터)."""
+    dlat = cell_m / _M_PER_DEG_LAT
+    dlng = cell_m / (_M_PER_DEG_LAT * math.cos(math.radians(_REF_LAT)))
+    return f"{math.floor(float(lat) / dlat)}:{math.floor(float(lng) / dlng)}"
+
+
+def departure_bucket(mode: str, when: Optional[datetime] = None) -> str:
+    """출발 시간대 키. 도보는 "-", 그 외는 KST 기준 "wd19" / "sat09" / "sun23"."""
+    if mode == "walking":
+        return "-"
+    if when is None:
+        when = datetime.now(KST)
+    elif when.tzinfo is None:
+        when = when.replace(tzinfo=KST)
+    else:
+        when = when.astimezone(KST)
+    wd = when.weekday()
+    day = "wd" if wd < 5 else "sat" if wd == 5 else "sun"
+    return f"{day}{when.hour:02d}"
+
+
+class TravelTimeCache:
+    def __init__(self, path: Path, max_rows: int) -> None:
+        self.path = Path(path)
+        self.max_rows = max(0, int(max_rows))
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._broken = False
+        self._writes_since_sweep = 0
+        # 아직 commit 하지 않은 쓰기: 키 → 행 (쓰기 스레드가 가져간다)
+        self._pending: Dict[Tuple[str, str, str, str, str], Tuple[Any, ...]] = {}
+        self._pending_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._writer: Optional[threading.Thread] = None
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self.expired = 0
+        self.writes = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_rows > 0 and not self._broken
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """lock 안에서 호출. 파일을 열 수 없으면 캐시를 끄고 None."""
+        if self._conn is not None:
+            return self._conn
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=1.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")  # 여러 워커 프로세스가 같은 파일을 읽고 씀
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+        except sqlite3.Error as e:
+            log.warning("[TTCACHE] disabled, cannot open %s: %s", self.path, e)
+            self._broken = True
+            return None
+        self._conn = conn
+        return conn
+
+    @staticmethod
+    def _key(
+        provider: str,
+        mode: str,
+        start_lat: float,
+        start_lng: float,
+        goal_lat: float,
+        goal_lng: float,
+        when: Optional[datetime],
+    ) -> Tuple[str, str, str, str, str]:
+        return (
+            provider,
+            mode,
+            snap_cell(start_lat, start_lng),
+            snap_cell(goal_lat, goal_lng),
+            departure_bucket(mode, when),
+        )
+
+    def get(
+        self,
+        provider: str,
+        mode: str,
+        start_lat: float,
+        start_lng: float,
+        goal_lat: float,
+        goal_lng: float,
+        when: Optional[datetime] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """저장된 결과(get_travel_time 과 같은 모양 + "cached": True) 또는 None."""
+        if not self.enabled:
+            return None
+        key = self._key(provider, mode, start_lat, start_lng, goal_lat, goal_lng, when)
+        now = time.time()
+        with self._pending_lock:
+            pending = self._pending.get(key)
+        with self._lock:
+            if pending is not None:
+                # (duration_s, distance_m, source, created_at, expires_at)
+                row = (pending[0], pending[1], pending[2], pending[4])
+            else:
+                conn = self._connect()
+                if conn is None:
+                    return None
+                try:
+                    row = conn.execute(
+                        "SELECT duration_s, distance_m, source, expires_at FROM travel_time "
+                        "WHERE provider=? AND mode=? AND o_cell=? AND d_cell=? AND bucket=?",
+                        key,
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    log.warning("[TTCACHE] read failed: %s", e)
+                    row = None
+            if row is None or row[3] <= now:
+                if row is not None:
+                    self.expired += 1
+                self.misses[mode] += 1
+                return None
+            self.hits[mode] += 1
+        duration_s, distance_m, source, _ = row
+        return {
+            "duration_seconds": int(duration_s),
+            "distance_meters": distance_m,
+            "mode": mode,
+            "success": True,
+            "is_estimated": False,
+            "source": source,
+            "cached": True,
+        }
+
+    async def aget(
+        self,
+        provider: str,
+        mode: str,
+        start_lat: float,
+        start_lng: float,
+        goal_lat: float,
+        goal_lng: float,
+        when: Optional[datetime] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """get 의 async 버전 (SQLite 조회를 이벤트 루프 밖 스레드에서)."""
+        if not self.enabled:
+            return None
+        return await asyncio.to_thread(
+            self.get, provider, mode, start_lat, start_lng, goal_lat, goal_lng, when
+        )
+
+    def put(
+        self,
+        provider: str,
+        mode: str,
+        start_lat: float,
+        start_lng: float,
+        goal_lat: float,
+        goal_lng: float,
+        result: Optional[Dict[str, Any]],
+        when: Optional[datetime] = None,
+    ) -> None:
+        """성공한 실측 결과만 저장 (실패 / 추정치 / 캐시에서 나온 값은 무시)."""
+        if not self.enabled or not result or not result.get("success"):
+            return
+        if result.get("is_estimated") or result.get("cached"):
+            return
+        duration = result.get("duration_seconds")
+        if duration is None:
+            return
+        distance = result.get("distance_meters")
+        key = self._key(provider, mode, start_lat, start_lng, goal_lat, goal_lng, when)
+        now = time.time()
+        ttl = TRAVEL_CACHE_TTL_S.get(mode, _DEFAULT_TTL_S)
+        row = (
+            int(duration),
+            int(distance) if isinstance(distance, (int, float)) else None,
+            result.get("source"),
+            now,
+            now + ttl,
+        )
+        with self._pending_lock:
+            if self._stopping:
+                return
+            self._pending[key] = row
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="travel-cache-writer", daemon=True
+                )
+                self._writer.start()
+        self._wake.set()
+
+    def _writer_loop(self) -> None:
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            self._flush_pending()
+            if self._stopping:
+                return
+
+    def _flush_pending(self) -> None:
+        """대기 중인 쓰기를 한 트랜잭션으로 commit (쓰기 스레드 / close 에서)."""
+        with self._pending_lock:
+            batch = dict(self._pending)
+        if not batch:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            if conn is not None:
+                try:
+                    with conn:
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO travel_time VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            [key + row for key, row in batch.items()],
+                        )
+                    self.writes += len(batch)
+                    self._writes_since_sweep += len(batch)
+                    if self._writes_since_sweep >= TRAVEL_CACHE_SWEEP_EVERY:
+                        self._sweep(conn, now)
+                except sqlite3.Error as e:
+                    log.warning("[TTCACHE] write failed: %s", e)
+        with self._pending_lock:
+            # commit 하는 동안 같은 키로 새로 들어온 값은 남겨 둔다
+            for key, row in batch.items():
+                if self._pending.get(key) is row:
+                    del self._pending[key]
+
+    def _sweep(self, conn: sqlite3.Connection, now: float) -> None:
+        """만료 항목 삭제 + 행 수 상한 초과분은 만료가 가까운 것부터 삭제. lock 안에서 호출."""
+        self._writes_since_sweep = 0
+        with conn:
+            removed = conn.execute("DELETE FROM travel_time WHERE expires_at <= ?", (now,)).rowcount
+            (rows,) = conn.execute("SELECT COUNT(*) FROM travel_time").fetchone()
+            over = rows - self.max_rows
+            if over > 0:
+                # WITHOUT ROWID 테이블이라 기본 키 묶음으로 지운다
+                conn.execute(
+                    "DELETE FROM travel_time WHERE (provider, mode, o_cell, d_cell, bucket) IN "
+                    "(SELECT provider, mode, o_cell, d_cell, bucket FROM travel_time "
+                    "ORDER BY expires_at LIMIT ?)",
+                    (over,),
+                )
+                removed += over
+        self.evictions += removed
+
+    def clear(self) -> None:
+        with self._pending_lock:
+            self._pending.clear()
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            with conn:
+                conn.execute("DELETE FROM travel_time")
+
+    def close(self) -> None:
+        """대기 중인 쓰기를 commit 하고 연결을 닫는다."""
+        with self._pending_lock:
+            self._stopping = True
+            writer = self._writer
+        self._wake.set()
+        if writer is not None:
+            writer.join(timeout=5.0)
+        self._flush_pending()
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = None
+            conn = self._connect() if self.enabled else None
+            if conn is not None:
+                try:
+                    (rows,) = conn.execute("SELECT COUNT(*) FROM travel_time").fetchone()
+                except sqlite3.Error:
+                    rows = None
+            hits = sum(self.hits.values())
+            misses = sum(self.misses.values())
+            total = hits + misses
+            return {
+                "name": "travel_time",
+                "enabled": self.enabled,
+                "path": str(self.path),
+                "rows": rows,
+                "max_rows": self.max_rows,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": (hits / total) if total else 0.0,
+                "hits_by_mode": dict(self.hits),
+                "misses_by_mode": dict(self.misses),
+                "expired": self.expired,
+                "writes": self.writes,
+            "pending_writes": len(self._pending),
+                "evictions": self.evictions,
+            }
+
+
+TRAVEL_TIME_CACHE = TravelTimeCache(TRAVEL_CACHE_PATH, TRAVEL_CACHE_MAX_ROWS)
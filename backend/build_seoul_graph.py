@@ -4,11 +4,26 @@
 
 import os
 import osmnx as ox
+import requests
 import networkx as nx
 import matplotlib
 matplotlib.use("Agg")  # GUI 창 띄우지 않고 파일로만 저장
 import matplotlib.pyplot as plt
 
+from app.services.road_graph import CSRGraph, load_snapshot, save_snapshot, snapshot_exists
+from app.services.contraction_hierarchy import build_contraction_hierarchy, save_hierarchy
+from app.services.station_access import build_station_access, save_station_access
+from app.services.transit_network import (
+    SUBWAY_DATA_DIR, build_subway_tables_from_osm, get_transit_network, save_subway_tables,
+)
+from app.services.speed_profile import ROAD_CLASS_WEIGHT, road_class_code
+from app.services.poi_index import (
+    OSM_POI_TAGS, POI_INDEX_DIR, build_poi_index, load_poi_index, osm_tags_to_google_types,
+    save_poi_index,
+)
+from app.services.busy_score import build_busy_scores, save_busy_scores
+from app.services.origin_cache import SPT_DISK_STORE
+
 # ===================== 사용자 설정 =====================
 # True면 시청 기준 반경 DIST_M만(빠른 테스트), False면 "서울 전체"
 SMALL_TEST = False
@@ -24,6 +39,32 @@ RETAIN_ALL = False       # True: 단절 성분까지 유지
 OUTDIR = "seoul_graph_out"
 # 만들 모드들
 MODES = ["drive", "walk", "bike"]
+# 서버가 바로 mmap 으로 여는 바이너리 스냅샷(.npy 묶음) 에 넣을 간선 weight
+# (road_class 는 최단거리용이 아니라 시간대 속도 계수를 고를 도로 등급 코드, speed_profile 참고)
+SNAPSHOT_WEIGHTS = ("length", "travel_time", ROAD_CLASS_WEIGHT)
+# 두 지점 간 빠른 질의용 Contraction Hierarchy 를 만들 모드 / weight
+# (travel_time 기준 최단경로, 거리(length)는 같은 경로를 따라 같이 저장)
+CH_MODES = ("drive", "walk")
+CH_WEIGHT = "travel_time"
+CH_AUX_WEIGHT = "length"
+# drive 노드별 가까운 지하철역 테이블 (SUBWAY_DATA_DIR 에 지하철 데이터가 있을 때만,
+# walk 스냅샷이 있으면 보행 경로 기준 도보 시간)
+# OSM 노선(route) 관계로 지하철 역/노선 CSV 생성 (SUBWAY_DATA_DIR)
+SUBWAY_DATA = True
+# False: 이미 있는 CSV(운영 데이터로 바꿔 넣은 경우 포함)는 덮어쓰지 않음
+SUBWAY_DATA_OVERWRITE = False
+SUBWAY_OSM_AREA = "서울특별시"
+SUBWAY_OSM_TIMEOUT_S = 180
+STATION_ACCESS = True
+# 번화가 점수용 POI 인덱스 (OSM 가게/문화시설/역 → POI_INDEX_DIR)
+POI_INDEX = True
+# drive 노드별 번화가 점수 (POI 인덱스로 계산, 중간 지점 후보 정렬에 사용)
+BUSY_SCORE = True
+# True면 디스크 SPT 캐시(SPT_CACHE_DIR)에서 현재 drive 스냅샷이 아닌 옛 그래프 버전 디렉토리 삭제
+# (서버는 옛 그래프로 떠 있는 워커가 있을 수 있어서 직접 지우지 않는다)
+SPT_CACHE_PRUNE = True
+# True면 OSM 다운로드 없이 OUTDIR 의 기존 GraphML 로 스냅샷만 다시 생성
+SNAPSHOT_ONLY = False
 # =======================================================
 
 # OSMnx 전역 설정
@@ -48,7 +89,8 @@ def _parse_speed_kph(edge_data, mode="drive"):
     spd = edge_data.get("maxspeed")
     if isinstance(spd, list) and spd:
         spd = spd[0]
-    if spd:
+    # maxspeed 는 차량 제한속도라 도보/자전거에는 쓰지 않는다
+    if spd and mode == "drive":
         try:
             return float(str(spd).split()[0])  # "50 km/h" -> 50
         except Exception:
@@ -71,6 +113,12 @@ def add_travel_time(G, mode="drive"):
         data["travel_time"] = (L / 1000.0) / kph * 3600.0
     return G
 
+def add_road_class(G):
+    """간선에 road_class(도로 등급 코드) 추가 — 시간대 속도 계수 조회용"""
+    for u, v, k, data in G.edges(keys=True, data=True):
+        data[ROAD_CLASS_WEIGHT] = road_class_code(data.get("highway"))
+    return G
+
 def _route_sum_attr(G, route_nodes, attr: str) -> float:
     """
     경로(노드 리스트) 위의 간선 attr 합계.
@@ -129,6 +177,152 @@ def save_graph(G, mode, outdir=OUTDIR):
     ox.save_graph_geopackage(G, filepath=gpkg, directed=True)
     return graphml, gpkg
 
+def save_csr_snapshot(G, mode, outdir=OUTDIR):
+    """
+    서버용 바이너리 스냅샷 저장 (OUTDIR/<mode>_csr/).
+    - 서버는 무방향 그래프를 쓰므로 to_undirected() 후 CSR 로 변환
+    - travel_time 은 모드별 속도 기준으로 여기서 채운다
+    - road_class 는 OSM highway 태그 기준 (평행 간선은 더 큰 도로 등급이 남는다)
+    """
+    add_travel_time(G, mode=mode)
+    add_road_class(G)
+    csr = CSRGraph.from_networkx(G.to_undirected(), weights=SNAPSHOT_WEIGHTS)
+    path = save_snapshot(
+        csr,
+        os.path.join(outdir, f"{mode}_csr"),
+        mode=mode,
+        extra_meta={"source": f"{mode}.graphml", "small_test": SMALL_TEST},
+    )
+    return path, csr
+
+def save_ch(csr, snap_dir, mode):
+    """스냅샷 디렉토리 아래 ch_<weight>/ 에 Contraction Hierarchy 저장 (수 분 걸릴 수 있음)"""
+    def _progress(done, total):
+        print(f"[{mode}] CH contracted {done:,}/{total:,}")
+
+    ch = build_contraction_hierarchy(
+        csr, weight=CH_WEIGHT, aux_weight=CH_AUX_WEIGHT, progress=_progress
+    )
+    path = save_hierarchy(ch, snap_dir)
+    print(f"[{mode}] saved CH: {path} "
+          f"(shortcuts={ch.meta['n_shortcuts']:,}, {ch.meta['build_seconds']}s)")
+    return path
+
+def save_subway_data(data_dir=SUBWAY_DATA_DIR):
+    """OSM 지하철/경전철 노선 관계(정차 노드 포함)를 받아 SUBWAY_DATA_DIR 에 CSV 저장"""
+    if not SUBWAY_DATA_OVERWRITE and (data_dir / "stations.csv").exists():
+        print(f"[subway] keep existing subway data: {data_dir}")
+        return data_dir
+    if SMALL_TEST:
+        scope = f"(around:{DIST_M},{CENTER[0]},{CENTER[1]})"
+        area = ""
+    else:
+        scope = "(area.a)"
+        area = f'area["name"="{SUBWAY_OSM_AREA}"]["boundary"="administrative"]->.a;'
+    # 수도권 광역철도(1호선, 경의중앙선 등)는 route=train 으로 그려져 있어 network 로 골라낸다
+    query = f"""
+[out:json][timeout:{SUBWAY_OSM_TIMEOUT_S}];
+{area}
+(
+  relation["route"~"^(subway|light_rail)$"]{scope};
+  relation["route"="train"]["network"~"수도권"]{scope};
+)->.routes;
+.routes out body;
+node(r.routes);
+out body;
+"""
+    url = getattr(ox.settings, "overpass_url", None) or ox.settings.overpass_endpoint
+    resp = requests.post(url.rstrip("/") + "/interpreter", data={"data": query},
+                         timeout=SUBWAY_OSM_TIMEOUT_S + 30)
+    resp.raise_for_status()
+    tables = build_subway_tables_from_osm(resp.json().get("elements", []))
+    if not tables["lines.csv"]:
+        print("[subway] no subway routes found in OSM, skipped")
+        return None
+    path = save_subway_tables(tables, data_dir)
+    print(f"[subway] saved subway data: {path} "
+          f"(stations={len(tables['stations.csv']):,}, lines={len(tables['lines.csv']):,}, "
+          f"transfers={len(tables['transfers.csv']):,})")
+    return path
+
+def save_station_access_table(outdir=OUTDIR):
+    """drive 스냅샷 아래 station_access/ 에 노드별 가까운 역 K개 테이블 저장"""
+    network = get_transit_network()
+    if network is None:
+        print(f"[station] no subway data at {SUBWAY_DATA_DIR}, skipped")
+        return None
+    drive_dir = os.path.join(outdir, "drive_csr")
+    walk_dir = os.path.join(outdir, "walk_csr")
+    if not snapshot_exists(drive_dir):
+        print(f"[station] drive snapshot not found: {drive_dir}, skipped")
+        return None
+
+    drive = load_snapshot(drive_dir, mmap=False)
+    walk = load_snapshot(walk_dir, mmap=False) if snapshot_exists(walk_dir) else None
+
+    def _progress(done, total):
+        print(f"[station] {done:,}/{total:,} stations")
+
+    table = build_station_access(drive, network, walk_graph=walk, progress=_progress)
+    path = save_station_access(table, drive_dir)
+    print(f"[station] saved station access: {path} "
+          f"(k={table.k}, nodes near a station={table.meta['nodes_with_station']:,}, "
+          f"walk graph={'yes' if walk is not None else 'no'}, {table.meta['build_seconds']}s)")
+    return path
+
+def save_poi_index_file(directory=POI_INDEX_DIR):
+    """OSM POI(음식점/카페/상점/문화시설/역)를 받아 번화가 점수용 POI 인덱스 저장"""
+    if SMALL_TEST:
+        gdf = ox.features_from_point(CENTER, tags=OSM_POI_TAGS, dist=DIST_M)
+    else:
+        gdf = ox.features_from_place(PLACE_NAME, tags=OSM_POI_TAGS)
+    # 건물(폴리곤)로 그려진 POI 는 내부 대표점 사용
+    points = gdf.geometry.representative_point()
+    records = (
+        (pt.y, pt.x, osm_tags_to_google_types(tags))
+        for pt, tags in zip(points, gdf.drop(columns="geometry").to_dict("records"))
+    )
+    index = build_poi_index(records, source="osm")
+    path = save_poi_index(index, directory)
+    print(f"[poi] saved POI index: {path} "
+          f"(features={len(gdf):,}, pois={index.n_pois:,}, "
+          f"stations={index.meta['n_stations']:,}, version={index.version})")
+    return path
+
+def save_busy_score_table(outdir=OUTDIR, poi_dir=POI_INDEX_DIR):
+    """drive 스냅샷 아래 busy_score/ 에 노드별 번화가 점수 저장"""
+    index = load_poi_index(poi_dir)
+    if index is None:
+        print(f"[busy] POI index not found: {poi_dir}, skipped")
+        return None
+    drive_dir = os.path.join(outdir, "drive_csr")
+    if not snapshot_exists(drive_dir):
+        print(f"[busy] drive snapshot not found: {drive_dir}, skipped")
+        return None
+
+    drive = load_snapshot(drive_dir, mmap=False)
+
+    def _progress(done, total):
+        print(f"[busy] {done:,}/{total:,} nodes")
+
+    table = build_busy_scores(drive, index, progress=_progress)
+    path = save_busy_scores(table, drive_dir)
+    print(f"[busy] saved busy scores: {path} "
+          f"(radius={table.radius_m:.0f}m, station-area nodes={table.meta['nodes_station_area']:,}, "
+          f"max score={table.meta['score_max']:.1f}, {table.meta['build_seconds']}s)")
+    return path
+
+def prune_spt_cache(outdir=OUTDIR):
+    """디스크 SPT 캐시에서 현재 drive 스냅샷 버전 외의 디렉토리 정리"""
+    drive_dir = os.path.join(outdir, "drive_csr")
+    if not snapshot_exists(drive_dir):
+        print(f"[spt] drive snapshot not found: {drive_dir}, skipped")
+        return []
+    version = load_snapshot(drive_dir, mmap=True).graph_version
+    removed = SPT_DISK_STORE.prune_versions(keep=[version])
+    print(f"[spt] kept {version}, removed {len(removed)} old version(s) from {SPT_DISK_STORE.root}")
+    return removed
+
 def shortest_routes_and_plots(G, mode, outdir=OUTDIR):
     """시청→남산타워 경로(거리/시간) 계산 + PNG 저장 (경로 없으면 안내)"""
     origin = CENTER
@@ -167,6 +361,18 @@ def main():
     print(f"Cache folder: {ox.settings.cache_folder}")
 
     for mode in MODES:
+        if SNAPSHOT_ONLY:
+            graphml = os.path.join(OUTDIR, f"{mode}.graphml")
+            print(f"\n=== Snapshot from {graphml} ===")
+            G = ox.load_graphml(graphml)
+            snap_dir, csr = save_csr_snapshot(G, mode)
+            print(f"[{mode}] saved snapshot: {snap_dir} "
+                  f"(nodes={csr.n_nodes:,}, edges={csr.n_edges:,}, "
+                  f"version={csr.graph_version})")
+            if mode in CH_MODES:
+                save_ch(csr, snap_dir, mode)
+            continue
+
         print(f"\n=== Building {mode} graph ===")
         G = build_graph(mode)
         print(f"[{mode}] nodes={G.number_of_nodes():,}, edges={G.number_of_edges():,}")
@@ -177,6 +383,24 @@ def main():
 
         shortest_routes_and_plots(G, mode)
 
+        snap_dir, csr = save_csr_snapshot(G, mode)
+        print(f"[{mode}] saved snapshot: {snap_dir} "
+              f"(nodes={csr.n_nodes:,}, edges={csr.n_edges:,}, "
+              f"version={csr.graph_version})")
+        if mode in CH_MODES:
+            save_ch(csr, snap_dir, mode)
+
+    if SUBWAY_DATA:
+        save_subway_data()
+    if STATION_ACCESS:
+        save_station_access_table()
+    if POI_INDEX:
+        save_poi_index_file()
+    if BUSY_SCORE:
+        save_busy_score_table()
+    if SPT_CACHE_PRUNE:
+        prune_spt_cache()
+
     print("\nAll done. Saved to:", os.path.abspath(OUTDIR))
 
 if __name__ == "__main__":